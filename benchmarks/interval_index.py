@@ -0,0 +1,107 @@
+"""
+Benchmarks IntervalIndex against a linear scan on a 50k-event calendar.
+
+    python -m benchmarks.interval_index
+"""
+from __future__ import annotations
+
+import random
+import timeit
+from typing import Callable
+
+import arrow
+
+from secretary.interval_index import IntervalIndex
+
+
+EVENT_COUNT = 50_000
+YEARS = 5
+QUERIES = 200
+
+
+def make_calendar(count: int, seed: int = 42) -> list[tuple[float, float, int]]:
+    """
+    Mostly short timed events, some all-day and multi-day events, and a few long ones.
+    """
+    rng = random.Random(seed)
+    start = arrow.get('2022-01-01T00:00:00-05:00').timestamp()
+    span = YEARS * 365 * 86400
+
+    intervals = []
+    for i in range(count):
+        kind = rng.random()
+        if kind < 0.8:
+            begin = start + rng.randrange(0, span, 15 * 60)
+            length = rng.choice([30, 60, 90, 120]) * 60
+        elif kind < 0.97:
+            begin = start + rng.randrange(0, span, 86400)
+            length = rng.choice([1, 1, 1, 2, 3]) * 86400
+        else:
+            begin = start + rng.randrange(0, span, 86400)
+            length = rng.randint(7, 90) * 86400
+        intervals += [(float(begin), float(begin + length), i)]
+
+    return intervals
+
+
+def linear_overlapping(intervals: list[tuple[float, float, int]], start: float, end: float) -> list[int]:
+    return [item for s, e, item in intervals if s < end and e > start]
+
+
+def report(name: str, func: Callable[[], object], number: int, operations: int = 1) -> float:
+    """
+    Prints and returns the best time per operation, where each call of func does operations of them.
+    """
+    seconds = min(timeit.repeat(func, number=number, repeat=3)) / number / operations
+    print(f'{name:<44} {seconds * 1e6:>12.1f} µs')
+    return seconds
+
+
+def main() -> None:
+    intervals = make_calendar(EVENT_COUNT)
+    ordered = sorted(intervals)
+    rng = random.Random(1)
+
+    windows = {
+        '2 hour window': 2 * 3600,
+        '1 day window': 86400,
+        '1 month window': 31 * 86400,
+    }
+
+    print(f'{EVENT_COUNT} events over {YEARS} years\n')
+    report('build index', lambda: IntervalIndex(intervals), number=3)
+    index = IntervalIndex(intervals)
+
+    for name, width in windows.items():
+        starts = [ordered[rng.randrange(len(ordered))][0] for _ in range(QUERIES)]
+        queries = [(s, s + width) for s in starts]
+
+        for s, e in queries[:10]:
+            assert index.overlapping(s, e) == linear_overlapping(ordered, s, e)
+
+        indexed = report(
+            f'overlapping, {name} (index)',
+            lambda: [index.overlapping(s, e) for s, e in queries],
+            number=1,
+            operations=QUERIES,
+        )
+        linear = report(
+            f'overlapping, {name} (linear scan)',
+            lambda: [linear_overlapping(ordered, s, e) for s, e in queries],
+            number=1,
+            operations=QUERIES,
+        )
+        print(f'{"":<44} {linear / indexed:>11.0f}x faster\n')
+
+    times = [ordered[rng.randrange(len(ordered))][0] for _ in range(QUERIES)]
+    report('next_after (index)', lambda: [index.next_after(t) for t in times], number=10, operations=QUERIES)
+    report(
+        'next_after (linear scan)',
+        lambda: [next((item for s, _, item in ordered if s >= t), None) for t in times],
+        number=1,
+        operations=QUERIES,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmarks building Event and Todo models from Google payloads and dumping them for tool output on
+a 2,500-event calendar: one model at a time, model_construct, and one list-level pydantic-core call.
+
+    python -m benchmarks.model_construction
+"""
+from __future__ import annotations
+
+import random
+from typing import Any
+
+import arrow
+
+from benchmarks.interval_index import report
+from secretary.data_models.event import Event
+from secretary.data_models.todo import Todo
+
+
+EVENT_COUNT = 2500
+
+
+def make_payloads(count: int, seed: int = 42) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """
+    Timed events and all-day todos shaped like the mirror's partial responses.
+    """
+    rng = random.Random(seed)
+    start = arrow.get('2025-01-01T08:00:00-08:00')
+
+    events = []
+    todos = []
+    for i in range(count):
+        begin = start.shift(minutes=rng.randrange(0, 365 * 24 * 60, 15))
+        events += [{
+            'id': f'event{i}',
+            'summary': f'Meeting {i}',
+            'start': {'dateTime': begin.isoformat(), 'timeZone': 'America/Los_Angeles'},
+            'end': {'dateTime': begin.shift(hours=1).isoformat(), 'timeZone': 'America/Los_Angeles'},
+            'description': 'Agenda:\n- status\n- blockers' if i % 3 else None,
+            'location': 'Room 4' if i % 2 else None,
+            'recurrence': ['RRULE:FREQ=WEEKLY'] if i % 10 == 0 else None,
+        }]
+        todos += [{
+            'id': f'todo{i}',
+            'summary': f'📝 Task {i}',
+            'start': {'date': begin.format('YYYY-MM-DD')},
+            'end': {'date': begin.format('YYYY-MM-DD')},
+            'description': 'Follow up' if i % 4 else None,
+            'extendedProperties': {'shared': {'sb_type': 'todo', 'sb_is_resolved': str(i % 5 == 0)}},
+        }]
+
+    return events, todos
+
+
+def main() -> None:
+    events, todos = make_payloads(EVENT_COUNT)
+    print(f'{EVENT_COUNT} events and {EVENT_COUNT} todos\n')
+
+    for name, model, payloads in [('Event', Event, events), ('Todo', Todo, todos)]:
+        assert model.from_gcal_events(payloads) == [model.from_gcal_event(p) for p in payloads]
+
+        each = report(f'{name} build (one at a time)', lambda: [model.from_gcal_event(p) for p in payloads], number=5)
+        report(
+            f'{name} build (model_construct)',
+            lambda: [model.model_construct(**model.gcal_event_fields(p)) for p in payloads],
+            number=5,
+        )
+        batched = report(f'{name} build (from_gcal_events)', lambda: model.from_gcal_events(payloads), number=5)
+        print(f'{"":<44} {each / batched:>11.1f}x faster\n')
+
+        built = model.from_gcal_events(payloads)
+        each = report(f'{name} dump (one at a time)', lambda: [m.model_dump() for m in built], number=5)
+        batched = report(f'{name} dump (dump_many)', lambda: model.dump_many(built), number=5)
+        print(f'{"":<44} {each / batched:>11.1f}x faster\n')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,9 +1,24 @@
+from secretary.agents.main_agent import SecretaryAgent
+from secretary.calendar_mirror import delete_mirror
 from secretary.data_models.channel import Channel
 from secretary.data_models.oauth import SecretaryOAuth
 from secretary.data_models.user import User
+from secretary.google_apis import forget_user
+
+
+def forget_cached_user(user_id: str) -> None:
+    """
+    Drops everything this process caches for the user's accounts and credentials. Call it whenever
+    they re-authorize Google or link another account.
+    """
+    SecretaryAgent.invalidate_user_context(user_id)
+    SecretaryAgent.invalidate_cached(user_id)
+    forget_user(user_id)
 
 
 def remove_account(user_id: str) -> None:
     Channel.delete(user_id)
     User.delete(user_id)
     SecretaryOAuth.delete(user_id)
+    delete_mirror(user_id)
+    forget_cached_user(user_id)
@@ -1,7 +1,19 @@
+import threading
+
 from sb_service_util.account_links import AccountLinkManager
 
 from secretary.service_config import cfg
 
 
+_thread_local = threading.local()
+
+
 def get_account_link_manager() -> AccountLinkManager:
-    return AccountLinkManager(cfg().account_links.shared_secret, 'secretary')
+    """
+    Returns an AccountLinkManager owned by the calling thread, so it is built once per thread
+    instead of on every call without being shared between threads.
+    """
+    manager = getattr(_thread_local, 'manager', None)
+    if manager is None:
+        manager = _thread_local.manager = AccountLinkManager(cfg().account_links.shared_secret, 'secretary')
+    return manager
@@ -2,6 +2,7 @@ from typing import cast
 
 import textwrap
 
+from agents import Agent as OpenAIAgent
 from agents import function_tool
 from agents import ModelSettings
 
@@ -10,6 +11,8 @@ from secretary.account_linking import get_account_link_manager
 from secretary.agents.base import BaseSecretaryAgent
 from secretary.agents.base import UserContext
 from secretary.agents.base import UserContextWrapper
+from secretary.agents.instructions import assemble_instructions
+from secretary.agents.model_router import RoutedModel
 
 
 class AccountAdministrationAgent(BaseSecretaryAgent):
@@ -30,7 +33,7 @@ class AccountAdministrationAgent(BaseSecretaryAgent):
 
         super().__init__(
             name=self.__class__.__name__,
-            model='gpt-4.1',
+            model=RoutedModel(self.__class__.__name__, 'administration'),
             output_type=str,
             model_settings=ModelSettings(tool_choice='required'),
             tool_use_behavior='stop_on_first_tool',
@@ -40,7 +43,12 @@ class AccountAdministrationAgent(BaseSecretaryAgent):
                 Handle requests relating to subscriptions, payments, account links, and account removal.
                 ''',
             ),
-            instructions=self.agent_app_context() + textwrap.dedent(
+            instructions=self.render_instructions,
+        )
+
+    def render_instructions(self, ctx: UserContextWrapper, agent: OpenAIAgent) -> str:
+        return assemble_instructions(
+            self.agent_app_context() + textwrap.dedent(
                 '''\
                 # Role
 
@@ -51,6 +59,7 @@ class AccountAdministrationAgent(BaseSecretaryAgent):
                 Use one of the tools provided to fulfill the user's request.
                 '''
             ),
+            self.volatile_app_context(),
         )
 
 
@@ -1,4 +1,6 @@
+import asyncio
 import textwrap
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
 import arrow
@@ -7,30 +9,64 @@ from agents import RunContextWrapper
 from agents.extensions.handoff_prompt import RECOMMENDED_PROMPT_PREFIX
 
 from secretary.account_linking import get_account_link_manager
+from secretary.cache import TTLCache
+from secretary.data_models.user import User
 
 
-@dataclass
+USER_CONTEXT_TTL_SECONDS = 60
+
+
+@dataclass(frozen=True)
 class UserContext:
     user_id: str
     tesla_user_id: str | None = None
     house_user_id: str | None = None
+    todo_calendar_id: str | None = None
 
 
 UserContextWrapper = RunContextWrapper[UserContext]  # type: ignore
 
 
+_user_context_cache: TTLCache[str, UserContext] = TTLCache(ttl_seconds=USER_CONTEXT_TTL_SECONDS)
+_lookup_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='user-context')
+
+
 class BaseSecretaryAgent(OpenAIAgent):
     @classmethod
     def get_user_context(cls, user_id: str) -> UserContext:
-        tesla_user_id = get_account_link_manager().get_linked_user_id(user_id, 'tesla')
-        house_user_id = get_account_link_manager().get_linked_user_id(user_id, 'house')
+        return _user_context_cache.get_or_set(user_id, lambda: cls.resolve_user_context(user_id))
+
+    @classmethod
+    async def get_user_context_async(cls, user_id: str) -> UserContext:
+        """
+        get_user_context in a worker thread, so a cold resolve doesn't block the event loop on its
+        account link and user lookups.
+        """
+        return await asyncio.get_running_loop().run_in_executor(None, cls.get_user_context, user_id)
+
+    @classmethod
+    def resolve_user_context(cls, user_id: str) -> UserContext:
+        tesla_lookup = _lookup_executor.submit(
+            lambda: get_account_link_manager().get_linked_user_id(user_id, 'tesla')
+        )
+        house_lookup = _lookup_executor.submit(
+            lambda: get_account_link_manager().get_linked_user_id(user_id, 'house')
+        )
+        user_lookup = _lookup_executor.submit(lambda: User.get(user_id))
+
+        user = user_lookup.result()
 
         return UserContext(
             user_id=user_id,
-            tesla_user_id=tesla_user_id,
-            house_user_id=house_user_id,
+            tesla_user_id=tesla_lookup.result(),
+            house_user_id=house_lookup.result(),
+            todo_calendar_id=user.todo_calendar_id if user else None,
         )
 
+    @classmethod
+    def invalidate_user_context(cls, user_id: str) -> None:
+        _user_context_cache.invalidate(user_id)
+
     def agent_app_context(self):
         return textwrap.dedent(
             f'''\
@@ -41,9 +77,10 @@ class BaseSecretaryAgent(OpenAIAgent):
             Scooterbot AI's Secretary Agent is a virtual personal assistant with access to various
             tools linked to the user's personal data and assets.
 
-            # Current Time
-
-            {arrow.now().format()}
-
             '''
         )
+
+    def volatile_app_context(self) -> dict[str, str]:
+        return {
+            'Current Time': arrow.now().format(),
+        }
@@ -1,47 +1,88 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import cast
 
+import asyncio
 import arrow
-import googlemaps
+import logging
 import textwrap
 import yaml
+from datetime import timedelta
 from agents import Agent as OpenAIAgent
 from agents import function_tool
+from agents import Model
 from agents.extensions.handoff_prompt import RECOMMENDED_PROMPT_PREFIX
 from pydantic import BaseModel
 
 from secretary.agents.base import UserContext
 from secretary.agents.base import UserContextWrapper
+from secretary.agents.instructions import assemble_instructions
+from secretary.agents.model_router import RoutedModel
+from secretary.availability import free_slots
+from secretary.availability import query_busy
+from secretary.calendar_metadata import get_user_timezone
+from secretary.calendar_metadata import get_user_timezone_async
+from secretary.calendar_mirror import MAX_LOADED_EVENTS
+from secretary.calendar_mirror import list_mirrored_events
+from secretary.calendar_mirror import list_mirrored_recurring_masters
+from secretary.calendar_mirror import mark_calendar_changed
+from secretary.calendar_metadata import list_calendars
 from secretary.data_models.event import Event
+from secretary.event_patch import patch_event
+from secretary.event_patch import patch_events
+from secretary.google_apis import execute_async
+from secretary.google_apis import execute_batch_async
 from secretary.google_apis import get_calendar_service
-from secretary.service_config import cfg
+from secretary.places import lookup_address
+from secretary.tool_output import batch_report
+from secretary.tool_output import encode_table
+from secretary.tool_output import fit_to_budget
 
 
 class CalendarAgent(OpenAIAgent):
     def __init__(
         self,
         user_ctx: UserContext,
-        model: str = 'gpt-4.1',
+        model: str | Model | None = None,
     ) -> None:
-        calsvc = get_calendar_service(user_ctx.user_id)
-        tz = calsvc.settings().get(setting='timezone').execute().get('value')
+        self.tz = get_user_timezone(user_ctx.user_id)
 
-        calendar_names_and_ids = yaml.dump(
+        self.calendar_names_and_ids = yaml.dump(
             [
                 '[id: {id}] {name}{primary}'.format(
                     id=cal['id'],
                     name=cal.get('summaryOverride') or cal['summary'],
                     primary=' (primary)' if cal.get('primary', False) else '',
                 )
-                for cal in calsvc.calendarList().list().execute().get('items', [])
+                for cal in list_calendars(user_ctx.user_id)
+                # Todos are handled by TodoAgent
+                if cal['id'] != user_ctx.todo_calendar_id
             ]
         )
 
         super().__init__(
             name=self.__class__.__name__,
-            model=model,
-            instructions=RECOMMENDED_PROMPT_PREFIX + '\n\n' + textwrap.dedent(
+            model=model or RoutedModel(self.__class__.__name__, 'tool_agent'),
+            instructions=self.render_instructions,
+            output_type=str,
+            tools=[
+                list_events,
+                list_events_across_calendars,
+                list_master_instances_for_recurring_events,
+                find_availability,
+                create_event,
+                create_events,
+                update_event,
+                update_events,
+                delete_event,
+                delete_events,
+            ],
+        )
+
+    def render_instructions(self, ctx: UserContextWrapper, agent: OpenAIAgent) -> str:
+        return assemble_instructions(
+            RECOMMENDED_PROMPT_PREFIX + '\n\n' + textwrap.dedent(
                 '''\
                 # Instructions
 
@@ -53,6 +94,9 @@ class CalendarAgent(OpenAIAgent):
                 2. Identify the relevant time range
                 3. List only within the relevant calendars and time range
 
+                When more than one calendar is relevant, list them all with a single
+                list_events_across_calendars call instead of calling list_events once per calendar.
+
                 ### Identifying Relevant Calendars
 
                 Use the names of the calendars to determine relevance the user's request.
@@ -81,97 +125,112 @@ class CalendarAgent(OpenAIAgent):
                 year for any particular search. If needed break larger time ranges into multiple
                 searches util result is found.
 
+                ## Checking Availability
+
+                For questions like "am I free Thursday afternoon" or "when can I fit in a 1 hour
+                meeting", use find_availability over the relevant calendars instead of listing
+                events. It returns busy times and free slots directly.
+
                 ## Creating Events
 
                 - by default, create all events in the primary calendar only
                 - only create events in other calendars if the user explicitly specifies it
 
-                # Current Time & Time Zone
-
-                {current_time}
+                ## Changing Several Events
 
-                ## Available Calendars
-
-                {calendar_names_and_ids}
+                To create, update or delete more than one event, make a single create_events,
+                update_events or delete_events call with all of them instead of one call per event.
                 '''
-            ).format(
-                current_time=arrow.now(tz).isoformat(),
-                calendar_names_and_ids=calendar_names_and_ids,
             ),
-            output_type=str,
-            tools=[
-                list_events,
-                list_master_instances_for_recurring_events,
-                create_event,
-                update_event,
-                delete_event,
-            ],
+            {
+                'Available Calendars': self.calendar_names_and_ids,
+                'Current Time & Time Zone': arrow.now(self.tz).isoformat(),
+            },
         )
 
 
 class EventsResult(BaseModel):
     events: list[Event]
+    total: int | None = None
     hide_recurrence_properties: bool = True
     error_message: str | None = None
+    token_budget: int = 6000
+
+    def __str__(self) -> str:
+        columns = ['id', 'calendar_id', 'start', 'end', 'summary', 'location', 'description']
+        if not self.hide_recurrence_properties:
+            columns += ['recurrence']
+
+        header, lines = encode_table(columns, Event.dump_many(self.events))
+
+        return fit_to_budget(
+            header,
+            lines,
+            self.token_budget,
+            'events',
+            notes=[self.error_message or ''],
+            total=self.total,
+        )
 
 
-def events_per_day(
-    events: list[dict],
-) -> float:
-    first_event_start = events[0]['start'].get('dateTime') or events[0]['start']['date']
-    last_event_start = events[-1]['start'].get('dateTime') or events[-1]['start']['date']
+@function_tool
+async def list_events(
+    ctx: UserContextWrapper,
+    calendar_id: str,
+    time_min: str,
+    time_max: str,
+) -> EventsResult:
+    """
+    time_min, time_max: format should be RFC3339 (YYYY-MM-DDTHH:mm:ssZZ)
+    """
+    user_id = cast(UserContext, ctx.context).user_id
 
-    days = (
-        arrow.get(last_event_start).date() - arrow.get(first_event_start).date()
-    ).days
+    mirrored = await list_mirrored_events(
+        user_id, calendar_id, time_min, time_max, todos=False, limit=MAX_LOADED_EVENTS,
+    )
+    events = Event.from_gcal_events(mirrored.events)
 
-    return len(events) / (days + 1) if days > 0 else len(events)
+    return EventsResult(events=events, total=mirrored.total, error_message=None)
 
 
 @function_tool
-async def list_events(
+async def list_events_across_calendars(
     ctx: UserContextWrapper,
-    calendar_id: str,
+    calendar_ids: list[str],
     time_min: str,
     time_max: str,
 ) -> EventsResult:
     """
+    Lists events from several calendars at once, merged by start time.
+
     time_min, time_max: format should be RFC3339 (YYYY-MM-DDTHH:mm:ssZZ)
     """
-    calsvc = get_calendar_service(cast(UserContext, ctx.context).user_id)
-
-    max_results = 1001
-
-    event_dicts = calsvc.events().list(
-        calendarId=calendar_id,
-        timeMin=time_min,
-        timeMax=time_max,
-        maxResults=max_results,
-        singleEvents=True,
-        orderBy='startTime',
-    ).execute().get('items', [])
-
-    if len(event_dicts) >= max_results:
-        days = min(
-            max_results * 0.8 // events_per_day(event_dicts),
-            90,
-        )
-        new_time_min = arrow.get(time_max).shift(days=-days).isoformat()
+    user_id = cast(UserContext, ctx.context).user_id
+    tz = await get_user_timezone_async(user_id)
+
+    results = await asyncio.gather(
+        *(
+            list_mirrored_events(user_id, calendar_id, time_min, time_max, todos=False, limit=MAX_LOADED_EVENTS)
+            for calendar_id in calendar_ids
+        ),
+        return_exceptions=True,
+    )
 
-        return EventsResult(
-            events=[],
-            error_message=(
-                f'Time range was too wide to query. Try again with time_min={new_time_min} and time_max={time_max}.'
-            )
-        )
+    events = []
+    total = 0
+    errors = []
+    for calendar_id, result in zip(calendar_ids, results):
+        if isinstance(result, BaseException):
+            logging.warning(f'Failed to list events of calendar {calendar_id}: {result}')
+            errors += [f'Could not list events of calendar {calendar_id}: {result}']
+        else:
+            events += Event.from_gcal_events(result.events, calendar_id=calendar_id)
+            total += result.total
 
-    events = [
-        Event.from_gcal_event(d)
-        for d in event_dicts
-        if d.get('extendedProperties', {}).get('shared', {}).get('sb_type') != 'todo'
-    ]
+    # Each calendar's first events cover the first events of the merged list
+    events.sort(key=lambda event: event.start_time(tz))
 
-    return EventsResult(events=events, error_message=None)
+    return EventsResult(events=events[:MAX_LOADED_EVENTS], total=total, error_message='\n'.join(errors) or None)
 
 
 @function_tool
@@ -182,24 +241,11 @@ async def list_master_instances_for_recurring_events(
     """
     time_min, time_max: format should be RFC3339 (YYYY-MM-DDTHH:mm:ssZZ)
     """
-    calsvc = get_calendar_service(cast(UserContext, ctx.context).user_id)
-    tz = calsvc.settings().get(setting='timezone').execute().get('value')
-
-    event_dicts = calsvc.events().list(
-        calendarId=calendar_id,
-        timeMin=arrow.now(tz).isoformat(),
-        timeMax=arrow.now(tz).shift(months=12 + 1).isoformat(),
-        maxResults=2500,  # Google API hard max
-        singleEvents=False,
-    ).execute().get('items', [])
-
-    events = [
-        Event.from_gcal_event(d)
-        for d in event_dicts
-        if (
-            d.get('extendedProperties', {}).get('shared', {}).get('sb_type') != 'todo' and d.get('recurrence')
-        )
-    ]
+    user_id = cast(UserContext, ctx.context).user_id
+
+    event_dicts = await list_mirrored_recurring_masters(user_id, calendar_id, todos=False)
+
+    events = Event.from_gcal_events(event_dicts)
 
     return EventsResult(
         events=events,
@@ -208,6 +254,145 @@ async def list_master_instances_for_recurring_events(
     )
 
 
+class AvailabilityResult(BaseModel):
+    busy: list[tuple[str, str]]
+    free: list[tuple[str, str]]
+    min_slot_minutes: int
+    error_message: str | None = None
+
+    def __str__(self) -> str:
+        lines = [self.error_message] if self.error_message else []
+
+        lines += ['Busy:'] + [f'- {start} to {end}' for start, end in self.busy] if self.busy else ['Busy: none']
+        lines += [f'Free slots of at least {self.min_slot_minutes} minutes:']
+        lines += [f'- {start} to {end}' for start, end in self.free] if self.free else ['- none']
+
+        return '\n'.join(lines)
+
+
+@function_tool
+async def find_availability(
+    ctx: UserContextWrapper,
+    calendar_ids: list[str],
+    time_min: str,
+    time_max: str,
+    min_slot_minutes: int = 30,
+) -> AvailabilityResult:
+    """
+    Busy times merged across the calendars, and the free slots between them that are at least
+    min_slot_minutes long.
+
+    time_min, time_max: format should be RFC3339 (YYYY-MM-DDTHH:mm:ssZZ)
+    """
+    user_id = cast(UserContext, ctx.context).user_id
+    calsvc = get_calendar_service(user_id)
+    tz = await get_user_timezone_async(user_id)
+
+    start = arrow.get(time_min)
+    end = arrow.get(time_max)
+
+    busy, errors = await query_busy(calsvc, calendar_ids, start.isoformat(), end.isoformat())
+    free = free_slots(busy, start, end, timedelta(minutes=min_slot_minutes))
+
+    return AvailabilityResult(
+        busy=[(s.to(tz).isoformat(), e.to(tz).isoformat()) for s, e in busy],
+        free=[(s.to(tz).isoformat(), e.to(tz).isoformat()) for s, e in free],
+        min_slot_minutes=min_slot_minutes,
+        error_message='\n'.join(f'Could not check calendar {cal}: {reason}' for cal, reason in errors.items()) or None,
+    )
+
+
+class NewEvent(BaseModel):
+    summary: str
+    start: str
+    end: str
+    location: str | None = None
+    is_all_day_event: bool = False
+    rfc5545_recurrence_properties: list[str] | None = None
+    notes: str | None = None
+
+
+class EventChanges(BaseModel):
+    event_id: str
+    summary: str | None = None
+    start: str | None = None
+    end: str | None = None
+    location: str | None = None
+    is_all_day_event: bool = False
+    rfc5545_recurrence_properties: list[str] | None = None
+    notes: str | None = None
+
+
+async def make_event(new: NewEvent) -> Event:
+    location = new.location
+    if location:
+        address = await lookup_address(location)
+        if address:
+            location += ' ' + address
+
+    if new.is_all_day_event:
+        start = arrow.get(new.start).format('YYYY-MM-DD')
+        end = arrow.get(new.end).format('YYYY-MM-DD')
+    else:
+        start = arrow.get(new.start).isoformat()
+        end = arrow.get(new.end).isoformat()
+
+    event = Event(
+        summary=new.summary,
+        start=start,
+        end=end,
+        location=location,
+        recurrence=new.rfc5545_recurrence_properties,
+    )
+
+    if new.notes:
+        event.log_to_description(new.notes)
+
+    return event
+
+
+async def with_address(changes: EventChanges) -> EventChanges:
+    """
+    changes with the looked up address appended to the new location, so apply_event_changes
+    doesn't wait on lookups, including when an update is reapplied after a conflict.
+    """
+    if not changes.location:
+        return changes
+
+    address = await lookup_address(changes.location)
+    if not address:
+        return changes
+
+    return changes.model_copy(update={'location': changes.location + ' ' + address})
+
+
+def apply_event_changes(event: Event, changes: EventChanges) -> None:
+    if changes.summary:
+        event.log_to_description(f'Summary: {event.summary} → {changes.summary}')
+        event.summary = changes.summary
+
+    if changes.start:
+        event.log_to_description(f'Start: {event.start} → {changes.start}')
+        start = arrow.get(changes.start)
+        event.start = start.format('YYYY-MM-DD') if changes.is_all_day_event else start.isoformat()
+
+    if changes.end:
+        event.log_to_description(f'End: {event.end} → {changes.end}')
+        end = arrow.get(changes.end)
+        event.end = end.format('YYYY-MM-DD') if changes.is_all_day_event else end.isoformat()
+
+    if changes.location:
+        event.log_to_description(f'Location: {event.location} → {changes.location}')
+        event.location = changes.location
+
+    if changes.rfc5545_recurrence_properties is not None:
+        event.log_to_description('Changed recurrence properties')
+        event.recurrence = changes.rfc5545_recurrence_properties
+
+    if changes.notes:
+        event.log_to_description(changes.notes)
+
+
 @function_tool
 async def create_event(
     ctx: UserContextWrapper,
@@ -227,39 +412,61 @@ async def create_event(
     - if start and end are both not provided, assume all day event
     - if start is provided and end is not, assume 1 hour duration
     """
-    calsvc = get_calendar_service(cast(UserContext, ctx.context).user_id)
-    tz = calsvc.settings().get(setting='timezone').execute().get('value')
-
-    if location:
-        gmaps = googlemaps.Client(key=cfg().google_apis.api_key)
-        places = gmaps.places(query=location)['results']
-        if len(places) == 1:
-            location += ' ' + places[0]['formatted_address']
-
-    if is_all_day_event:
-        start = arrow.get(start).format('YYYY-MM-DD')
-        end = arrow.get(end).format('YYYY-MM-DD')
-    else:
-        start = arrow.get(start).isoformat()
-        end = arrow.get(end).isoformat()
+    user_id = cast(UserContext, ctx.context).user_id
+    calsvc = get_calendar_service(user_id)
+    tz = await get_user_timezone_async(user_id)
+
+    event = await make_event(
+        NewEvent(
+            summary=summary,
+            start=start,
+            end=end,
+            location=location,
+            is_all_day_event=is_all_day_event,
+            rfc5545_recurrence_properties=rfc5545_recurrence_properties,
+            notes=notes,
+        )
+    )
 
-    event = Event(
-        summary=summary,
-        start=start,
-        end=end,
-        location=location,
-        recurrence=rfc5545_recurrence_properties,
+    await execute_async(
+        calsvc.events().insert(
+            calendarId=calendar_id,
+            body=event.to_gcal_event(calendar_tz=tz),
+        )
     )
+    await mark_calendar_changed(user_id, calendar_id)
 
-    if notes:
-        event.log_to_description(notes)
+    return 'Successfully created event'
 
-    calsvc.events().insert(
-        calendarId=calendar_id,
-        body=event.to_gcal_event(calendar_tz=tz),
-    ).execute()
 
-    return 'Successfully created event'
+@function_tool
+async def create_events(
+    ctx: UserContextWrapper,
+    calendar_id: str,
+    events: list[NewEvent],
+) -> str:
+    """
+    Creates several events at once. Prefer this over repeated create_event calls.
+
+    start, end: format should be RFC3339 (YYYY-MM-DDTHH:mm:ssZZ)
+    location: look up and append address to location
+    """
+    user_id = cast(UserContext, ctx.context).user_id
+    calsvc = get_calendar_service(user_id)
+    tz = await get_user_timezone_async(user_id)
+
+    made = await asyncio.gather(*(make_event(new) for new in events))
+
+    results = await execute_batch_async(
+        calsvc,
+        [
+            calsvc.events().insert(calendarId=calendar_id, body=event.to_gcal_event(calendar_tz=tz))
+            for event in made
+        ],
+    )
+    await mark_calendar_changed(user_id, calendar_id)
+
+    return batch_report('Created', 'events', [f'{new.summary} ({new.start})' for new in events], results)
 
 
 @function_tool
@@ -278,46 +485,59 @@ async def update_event(
     """
     start, end: format should be RFC3339 (YYYY-MM-DDTHH:mm:ssZZ)
     """
-    calsvc = get_calendar_service(cast(UserContext, ctx.context).user_id)
-    tz = calsvc.settings().get(setting='timezone').execute().get('value')
+    user_id = cast(UserContext, ctx.context).user_id
+    tz = await get_user_timezone_async(user_id)
+    changes = await with_address(
+        EventChanges(
+            event_id=event_id,
+            summary=summary,
+            start=start,
+            end=end,
+            location=location,
+            is_all_day_event=is_all_day_event,
+            rfc5545_recurrence_properties=rfc5545_recurrence_properties,
+            notes=notes,
+        )
+    )
 
-    event = Event.get(calsvc, calendar_id, event_id)
+    async def update(current: dict[str, Any]) -> dict[str, Any]:
+        event = Event.from_gcal_event(current)
+        apply_event_changes(event, changes)
+        return event.to_gcal_event(calendar_tz=tz)
 
-    if summary:
-        event.log_to_description(f'Summary: {event.summary} → {summary}')
-        event.summary = summary
+    await patch_event(user_id, calendar_id, event_id, update)
 
-    if start:
-        event.log_to_description(f'Start: {event.start} → {start}')
-        event.start = arrow.get(start).format('YYYY-MM-DD') if is_all_day_event else arrow.get(start).isoformat()
+    return 'Successfully updated event'
 
-    if end:
-        event.log_to_description(f'End: {event.end} → {end}')
-        event.end = arrow.get(end).format('YYYY-MM-DD') if is_all_day_event else arrow.get(end).isoformat()
 
-    if location:
-        gmaps = googlemaps.Client(key=cfg().google_apis.api_key)
-        places = gmaps.places(query=location)['results']
-        if len(places) == 1:
-            location += ' ' + places[0]['formatted_address']
+@function_tool
+async def update_events(
+    ctx: UserContextWrapper,
+    calendar_id: str,
+    updates: list[EventChanges],
+) -> str:
+    """
+    Updates several events at once. Prefer this over repeated update_event calls. In each update,
+    only supply the attributes that should change.
 
-        event.log_to_description(f'Location: {event.location} → {location}')
-        event.location = location
+    start, end: format should be RFC3339 (YYYY-MM-DDTHH:mm:ssZZ)
+    """
+    user_id = cast(UserContext, ctx.context).user_id
+    tz = await get_user_timezone_async(user_id)
 
-    if rfc5545_recurrence_properties is not None:
-        event.log_to_description('Changed recurrence properties')
-        event.recurrence = rfc5545_recurrence_properties
+    # patch_events refuses repeated ids, so only the first update of each event applies
+    changes_by_id: dict[str, EventChanges] = {}
+    for changes in await asyncio.gather(*(with_address(changes) for changes in updates)):
+        changes_by_id.setdefault(changes.event_id, changes)
 
-    if notes:
-        event.log_to_description(notes)
+    async def update(current: dict[str, Any]) -> dict[str, Any]:
+        event = Event.from_gcal_event(current)
+        apply_event_changes(event, changes_by_id[current['id']])
+        return event.to_gcal_event(calendar_tz=tz)
 
-    calsvc.events().patch(
-        calendarId=calendar_id,
-        eventId=event_id,
-        body=event.to_gcal_event(calendar_tz=tz),
-    ).execute()
+    results = await patch_events(user_id, calendar_id, [changes.event_id for changes in updates], update)
 
-    return 'Successfully updated event'
+    return batch_report('Updated', 'events', [changes.event_id for changes in updates], results)
 
 
 @function_tool
@@ -329,11 +549,37 @@ async def delete_event(
     """
     Deletes an event from the specified calendar.
     """
-    calsvc = get_calendar_service(cast(UserContext, ctx.context).user_id)
+    user_id = cast(UserContext, ctx.context).user_id
+    calsvc = get_calendar_service(user_id)
 
-    calsvc.events().delete(
-        calendarId=calendar_id,
-        eventId=event_id,
-    ).execute()
+    await execute_async(
+        calsvc.events().delete(
+            calendarId=calendar_id,
+            eventId=event_id,
+        )
+    )
+    await mark_calendar_changed(user_id, calendar_id)
 
     return 'Successfully deleted event'
+
+
+@function_tool
+async def delete_events(
+    ctx: UserContextWrapper,
+    calendar_id: str,
+    event_ids: list[str],
+) -> str:
+    """
+    Deletes several events from the specified calendar at once. Prefer this over repeated
+    delete_event calls.
+    """
+    user_id = cast(UserContext, ctx.context).user_id
+    calsvc = get_calendar_service(user_id)
+
+    results = await execute_batch_async(
+        calsvc,
+        [calsvc.events().delete(calendarId=calendar_id, eventId=event_id) for event_id in event_ids],
+    )
+    await mark_calendar_changed(user_id, calendar_id)
+
+    return batch_report('Deleted', 'events', event_ids, results)
@@ -7,13 +7,16 @@ import arrow
 import textwrap
 from agents import Agent as OpenAIAgent
 from agents import function_tool
+from agents import Model
 from agents.extensions.handoff_prompt import RECOMMENDED_PROMPT_PREFIX
 from pydantic import BaseModel
 
 from secretary.agents.base import UserContext
 from secretary.agents.base import UserContextWrapper
+from secretary.agents.instructions import assemble_instructions
+from secretary.agents.model_router import RoutedModel
+from secretary.calendar_metadata import get_user_timezone
 from secretary.data_models.gmail_thread import GmailThread, GmailThreadsResult
-from secretary.google_apis import get_calendar_service
 
 
 QueryType = Literal['recent_or_current_events', 'records_lookup']
@@ -44,14 +47,22 @@ class GmailAgent(OpenAIAgent):
     def __init__(
         self,
         user_ctx: UserContext,
-        model: str = 'gpt-4.1',
+        model: str | Model | None = None,
     ) -> None:
-        calsvc = get_calendar_service(user_ctx.user_id)
-        user_tz = calsvc.settings().get(setting='timezone').execute().get('value')
+        self.user_tz = get_user_timezone(user_ctx.user_id)
         super().__init__(
             name=self.__class__.__name__,
-            model=model,
-            instructions=RECOMMENDED_PROMPT_PREFIX + '\n\n' + textwrap.dedent(
+            model=model or RoutedModel(self.__class__.__name__, 'tool_agent'),
+            instructions=self.render_instructions,
+            output_type=str,
+            tools=[
+                search_message_threads,
+            ],
+        )
+
+    def render_instructions(self, ctx: UserContextWrapper, agent: OpenAIAgent) -> str:
+        return assemble_instructions(
+            RECOMMENDED_PROMPT_PREFIX + '\n\n' + textwrap.dedent(
                 '''\
                 # Instructions
 
@@ -67,7 +78,7 @@ class GmailAgent(OpenAIAgent):
                 (ordered).
 
                 A keyword phrase is an unordered set of keywords that must all occur together, such
-                as {{"dentist", "arlington"}} or {{"honda", "license plate"}}.
+                as {"dentist", "arlington"} or {"honda", "license plate"}.
                 thread only if all terms are present.
 
                 #### Choose Keyword Phrases that Balance Recall and Precision
@@ -106,19 +117,11 @@ class GmailAgent(OpenAIAgent):
                 - Bob Jones
                 - jim@abc.com
                 - amazon.com
-
-                # Current Time & Time Zone
-
-                {current_time}
-
                 ''',
-            ).format(
-                current_time=arrow.now(user_tz).isoformat(),
             ),
-            output_type=str,
-            tools=[
-                search_message_threads,
-            ],
+            {
+                'Current Time & Time Zone': arrow.now(self.user_tz).isoformat(),
+            },
         )
 
 
@@ -133,7 +136,7 @@ async def search_message_threads(
     """
     user_id = cast(UserContext, ctx.context).user_id
 
-    return GmailThread.search(
+    return await GmailThread.search(
         user_id=user_id,
         query=str(query),
         label_ids=[],
@@ -0,0 +1,14 @@
+def assemble_instructions(static: str, volatile_sections: dict[str, str]) -> str:
+    """
+    Builds a system prompt from static text and volatile sections (current time, per-user data).
+
+    The static text always comes first and must not interpolate anything that changes between runs,
+    so that it stays a byte-stable prefix and the provider's prompt cache can be reused. Volatile
+    sections are appended after it as top-level headings, in the order given.
+    """
+    prompt = static.rstrip('\n') + '\n\n'
+
+    for title, body in volatile_sections.items():
+        prompt += f'# {title}\n\n{body.strip()}\n\n'
+
+    return prompt
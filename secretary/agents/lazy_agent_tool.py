@@ -0,0 +1,43 @@
+import asyncio
+from typing import Callable
+
+from agents import Agent as OpenAIAgent
+from agents import ItemHelpers
+from agents import RunContextWrapper
+from agents import Runner
+from agents import Tool
+from agents import function_tool
+
+from secretary.agents.run_metrics import log_run_metrics
+
+
+def lazy_agent_tool(
+    make_agent: Callable[[], OpenAIAgent],
+    tool_name: str,
+    tool_description: str,
+) -> Tool:
+    """
+    Equivalent to make_agent().as_tool(tool_name, tool_description), except the agent is not built
+    until the tool is first invoked. Once built, the agent is reused for later invocations.
+    """
+    agent: OpenAIAgent | None = None
+
+    @function_tool(
+        name_override=tool_name,
+        description_override=tool_description,
+    )
+    async def run_agent(context: RunContextWrapper, input: str) -> str:
+        nonlocal agent
+        if agent is None:
+            agent = await asyncio.to_thread(make_agent)
+
+        output = await Runner.run(
+            starting_agent=agent,
+            input=input,
+            context=context.context,
+        )
+        log_run_metrics(output)
+
+        return ItemHelpers.text_message_outputs(output.new_items)
+
+    return run_agent
@@ -1,7 +1,10 @@
+from __future__ import annotations
+
 from typing import cast
 
 import textwrap
 
+from agents import Agent as OpenAIAgent
 from agents import function_tool
 
 from secretary.agents.account_administration_agent import AccountAdministrationAgent
@@ -11,22 +14,32 @@ from secretary.agents.base import UserContextWrapper
 from secretary.agents.calendar_agent import CalendarAgent
 from secretary.agents.gmail_agent import GmailAgent
 from secretary.agents.house_agent import HouseAgent
+from secretary.agents.instructions import assemble_instructions
+from secretary.agents.model_router import RoutedModel
+from secretary.agents.lazy_agent_tool import lazy_agent_tool
 from secretary.agents.tesla_agent import TeslaAgent
 from secretary.agents.todo_agent import TodoAgent
+from secretary.cache import TTLCache
+
+
+AGENT_CACHE_TTL_SECONDS = 10 * 60
 
 
 class SecretaryAgent(BaseSecretaryAgent):
     def __init__(self, user_ctx: UserContext) -> None:
         tools = [
-            CalendarAgent(user_ctx).as_tool(
+            lazy_agent_tool(
+                lambda: CalendarAgent(user_ctx),
                 tool_name='read_and_manage_calendars',
                 tool_description="Search and create events across the user's Google Calendars.",
             ),
-            GmailAgent(user_ctx).as_tool(
+            lazy_agent_tool(
+                lambda: GmailAgent(user_ctx),
                 tool_name='answer_questions_using_info_from_gmail',
                 tool_description="Answer questions using info from the user's Gmail messages and threads.",
             ),
-            TodoAgent(user_ctx).as_tool(
+            lazy_agent_tool(
+                lambda: TodoAgent(user_ctx),
                 tool_name='read_and_manage_todos',
                 tool_description="Search, create, and resolve tasks on the user's todo list.",
             ),
@@ -44,8 +57,30 @@ class SecretaryAgent(BaseSecretaryAgent):
 
         super().__init__(
             name=self.__class__.__name__,
-            model='gpt-4.1',
-            instructions=self.agent_app_context() + textwrap.dedent(
+            model=RoutedModel(self.__class__.__name__, 'conversation'),
+            instructions=self.render_instructions,
+            output_type=str,
+            tools=tools,
+            handoffs=[
+                AccountAdministrationAgent(user_ctx),
+            ],
+        )
+
+    @classmethod
+    def for_user(cls, user_ctx: UserContext) -> SecretaryAgent:
+        """
+        Returns the cached agent graph for this user context, building it if needed. Instructions
+        are rendered on every run, so a cached graph still sees the current time.
+        """
+        return _agent_cache.get_or_set(user_ctx, lambda: cls(user_ctx))
+
+    @classmethod
+    def invalidate_cached(cls, user_id: str) -> None:
+        _agent_cache.invalidate_where(lambda user_ctx: user_ctx.user_id == user_id)
+
+    def render_instructions(self, ctx: UserContextWrapper, agent: OpenAIAgent) -> str:
+        return assemble_instructions(
+            self.agent_app_context() + textwrap.dedent(
                 '''\
                 # Role
 
@@ -78,14 +113,13 @@ class SecretaryAgent(BaseSecretaryAgent):
                   tools.
                 '''
             ),
-            output_type=str,
-            tools=tools,
-            handoffs=[
-                AccountAdministrationAgent(user_ctx),
-            ],
+            self.volatile_app_context(),
         )
 
 
+_agent_cache: TTLCache[UserContext, SecretaryAgent] = TTLCache(ttl_seconds=AGENT_CACHE_TTL_SECONDS)
+
+
 @function_tool
 async def make_request_to_tesla_agent(ctx: UserContextWrapper, request_in_natural_language: str) -> str:
     """The Tesla Agent can respond to requests about the locations of the user's Tesla vehicles,
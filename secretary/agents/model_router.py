@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from typing import Literal
+
+import openai
+from agents import Handoff
+from agents import Model
+from agents import ModelResponse
+from agents import ModelSettings
+from agents import ModelTracing
+from agents import OpenAIProvider
+from agents import Tool
+from agents.agent_output import AgentOutputSchemaBase
+from agents.items import TResponseInputItem
+from agents.items import TResponseStreamEvent
+from openai.types.responses.response_prompt_param import ResponsePromptParam
+
+from secretary.service_config import cfg
+
+
+TaskClass = Literal['conversation', 'tool_agent', 'administration']
+
+FALLBACK_ERRORS = (
+    openai.APIConnectionError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+LATENCY_SMOOTHING = 0.2
+
+
+@dataclass
+class ModelStats:
+    requests: int = 0
+    errors: int = 0
+    consecutive_errors: int = 0
+    latency_seconds: float | None = None
+    last_error_at: float = 0.0
+    last_success_at: float = 0.0
+
+
+class ModelRouter:
+    """
+    Picks models for agents according to cfg().model_routing and tracks observed latency and errors
+    per model. Models that keep failing, or whose smoothed latency is above max_latency_seconds, are
+    moved behind the healthy fallbacks until error_cooldown_seconds have passed.
+    """
+
+    def __init__(self) -> None:
+        self.stats: dict[str, ModelStats] = {}
+        self._lock = threading.Lock()
+
+    def candidates(self, agent_name: str, task_class: TaskClass) -> list[str]:
+        routing = cfg().model_routing
+
+        primary = routing.agents.get(agent_name) or routing.task_classes.get(task_class) or routing.default_model
+        models = [primary] + [m for m in routing.fallback_models if m != primary]
+
+        healthy = [m for m in models if self.is_healthy(m)]
+        return healthy + [m for m in models if m not in healthy]
+
+    def is_healthy(self, model: str) -> bool:
+        routing = cfg().model_routing
+        stats = self.stats.get(model)
+        now = time.monotonic()
+
+        if stats is None:
+            return True
+
+        failing = stats.consecutive_errors >= routing.max_consecutive_errors
+        if failing and now - stats.last_error_at < routing.error_cooldown_seconds:
+            return False
+
+        max_latency = routing.max_latency_seconds
+        slow = max_latency is not None and stats.latency_seconds is not None and stats.latency_seconds > max_latency
+        if slow and now - stats.last_success_at < routing.error_cooldown_seconds:
+            return False
+
+        return True
+
+    def record_success(self, model: str, latency_seconds: float) -> None:
+        with self._lock:
+            stats = self.stats.setdefault(model, ModelStats())
+            stats.requests += 1
+            stats.consecutive_errors = 0
+            stats.last_success_at = time.monotonic()
+            if stats.latency_seconds is None:
+                stats.latency_seconds = latency_seconds
+            else:
+                stats.latency_seconds += LATENCY_SMOOTHING * (latency_seconds - stats.latency_seconds)
+
+    def record_error(self, model: str) -> None:
+        with self._lock:
+            stats = self.stats.setdefault(model, ModelStats())
+            stats.requests += 1
+            stats.errors += 1
+            stats.consecutive_errors += 1
+            stats.last_error_at = time.monotonic()
+
+
+model_router = ModelRouter()
+_provider = OpenAIProvider()
+
+
+class RoutedModel(Model):
+    """
+    A Model that resolves to a concrete model through the ModelRouter on every request, and falls
+    back to the next candidate on connection, rate limit and server errors.
+    """
+
+    def __init__(self, agent_name: str, task_class: TaskClass, router: ModelRouter = model_router) -> None:
+        self.agent_name = agent_name
+        self.task_class = task_class
+        self.router = router
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+        prompt: ResponsePromptParam | None,
+    ) -> ModelResponse:
+        candidates = self.router.candidates(self.agent_name, self.task_class)
+
+        for i, model_name in enumerate(candidates):
+            start = time.monotonic()
+            try:
+                response = await _provider.get_model(model_name).get_response(
+                    system_instructions,
+                    input,
+                    model_settings,
+                    tools,
+                    output_schema,
+                    handoffs,
+                    tracing,
+                    previous_response_id=previous_response_id,
+                    prompt=prompt,
+                )
+            except FALLBACK_ERRORS:
+                self.router.record_error(model_name)
+                if i == len(candidates) - 1:
+                    raise
+                logging.warning(f'{self.agent_name}: {model_name} failed, falling back to {candidates[i + 1]}')
+                continue
+
+            self.router.record_success(model_name, time.monotonic() - start)
+            return response
+
+        raise AssertionError('No model candidates')
+
+    async def stream_response(  # type: ignore[override]
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *,
+        previous_response_id: str | None,
+        prompt: ResponsePromptParam | None,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        candidates = self.router.candidates(self.agent_name, self.task_class)
+
+        for i, model_name in enumerate(candidates):
+            start = time.monotonic()
+            started = False
+            try:
+                async for event in _provider.get_model(model_name).stream_response(
+                    system_instructions,
+                    input,
+                    model_settings,
+                    tools,
+                    output_schema,
+                    handoffs,
+                    tracing,
+                    previous_response_id=previous_response_id,
+                    prompt=prompt,
+                ):
+                    if not started:
+                        # Latency of a streamed response is measured to the first event
+                        self.router.record_success(model_name, time.monotonic() - start)
+                        started = True
+                    yield event
+            except FALLBACK_ERRORS:
+                self.router.record_error(model_name)
+                # Events already sent to the caller can't be taken back
+                if started or i == len(candidates) - 1:
+                    raise
+                logging.warning(f'{self.agent_name}: {model_name} failed, falling back to {candidates[i + 1]}')
+                continue
+
+            return
@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import logging
+
+from agents.result import RunResultBase
+from pydantic import BaseModel
+
+
+class RunMetrics(BaseModel):
+    agent_name: str
+    requests: int
+    input_tokens: int
+    cached_input_tokens: int
+    output_tokens: int
+
+    @property
+    def uncached_input_tokens(self) -> int:
+        return self.input_tokens - self.cached_input_tokens
+
+    @classmethod
+    def from_result(cls, result: RunResultBase) -> RunMetrics:
+        usage = result.context_wrapper.usage
+        return cls(
+            agent_name=result.last_agent.name,
+            requests=usage.requests,
+            input_tokens=usage.input_tokens,
+            cached_input_tokens=usage.input_tokens_details.cached_tokens,
+            output_tokens=usage.output_tokens,
+        )
+
+
+def log_run_metrics(result: RunResultBase) -> RunMetrics:
+    metrics = RunMetrics.from_result(result)
+
+    logging.info(
+        f'Agent run {metrics.agent_name}: requests={metrics.requests} '
+        f'input_tokens={metrics.input_tokens} cached_input_tokens={metrics.cached_input_tokens} '
+        f'uncached_input_tokens={metrics.uncached_input_tokens} output_tokens={metrics.output_tokens}'
+    )
+
+    return metrics
@@ -1,34 +1,73 @@
 from __future__ import annotations
 
+from typing import Any
 from typing import cast
 
 import arrow
-import googlemaps
+import asyncio
 import textwrap
 from agents import Agent as OpenAIAgent
 from agents import function_tool
+from agents import Model
 from agents.extensions.handoff_prompt import RECOMMENDED_PROMPT_PREFIX
 from pydantic import BaseModel
 
 from secretary.agents.base import UserContext
 from secretary.agents.base import UserContextWrapper
+from secretary.agents.instructions import assemble_instructions
+from secretary.agents.model_router import RoutedModel
+from secretary.calendar_metadata import get_user_timezone
+from secretary.calendar_metadata import get_user_timezone_async
+from secretary.calendar_mirror import MAX_LOADED_EVENTS
+from secretary.calendar_mirror import list_mirrored_events
+from secretary.calendar_mirror import list_mirrored_overdue_todos
+from secretary.calendar_mirror import list_mirrored_recurring_masters
+from secretary.calendar_mirror import mark_calendar_changed
 from secretary.data_models.todo import Todo
+from secretary.event_patch import patch_event
+from secretary.event_patch import patch_events
+from secretary.google_apis import execute_async
+from secretary.google_apis import execute_batch_async
 from secretary.google_apis import get_calendar_service
-from secretary.service_config import cfg
+from secretary.places import lookup_address
+from secretary.tool_output import batch_report
+from secretary.tool_output import encode_table
+from secretary.tool_output import fit_to_budget
 
 
 class TodoAgent(OpenAIAgent):
     def __init__(
         self,
         user_ctx: UserContext,
-        model: str = 'gpt-4.1',
+        model: str | Model | None = None,
     ) -> None:
-        tz = get_calendar_service(user_ctx.user_id).settings().get(setting='timezone').execute().get('value')
+        self.tz = get_user_timezone(user_ctx.user_id)
 
         super().__init__(
             name=self.__class__.__name__,
-            model=model,
-            instructions=RECOMMENDED_PROMPT_PREFIX + '\n\n' + textwrap.dedent(
+            model=model or RoutedModel(self.__class__.__name__, 'tool_agent'),
+            instructions=self.render_instructions,
+            output_type=str,
+            tools=[
+                list_todos,
+                list_overdue_todos,
+                list_master_instances_for_recurring_todos,
+                create_todo,
+                create_todos,
+                update_todo,
+                update_todos,
+                delete_todo,
+                delete_todos,
+                resolve_todo,
+                resolve_todos,
+                unresolve_todo,
+                reschedule_todos,
+            ],
+        )
+
+    def render_instructions(self, ctx: UserContextWrapper, agent: OpenAIAgent) -> str:
+        return assemble_instructions(
+            RECOMMENDED_PROMPT_PREFIX + '\n\n' + textwrap.dedent(
                 '''\
                 # Instructions
 
@@ -41,31 +80,56 @@ class TodoAgent(OpenAIAgent):
                 - when searching for todos in an unspecified time range, default to -6 months to +6 months
                 - When listing todos to mark as resolved, default to -1 month to +1 month
                 - When resolving a todo, make the resolved date today if not specified
-
-                # Current Time & Time Zone
-
-                {current_time}
+                - When only open or only resolved todos are wanted, pass resolved=false or
+                  resolved=true instead of listing both
+                - For overdue or "still open from before" todos, use list_overdue_todos; it needs
+                  no date range
+                - To create, update or delete more than one todo, make a single create_todos,
+                  update_todos or delete_todos call with all of them instead of one call per todo
+                - To resolve or move the due date of several todos, e.g. "mark everything from last
+                  week as done" or "push my open todos to Monday", make a single resolve_todos or
+                  reschedule_todos call with a due date range, overdue=true or the todo ids
                 '''
-            ).format(
-                current_time=arrow.now(tz).isoformat()
             ),
-            output_type=str,
-            tools=[
-                list_todos,
-                list_master_instances_for_recurring_todos,
-                create_todo,
-                update_todo,
-                delete_todo,
-                resolve_todo,
-                unresolve_todo,
-            ],
+            {
+                'Current Time & Time Zone': arrow.now(self.tz).isoformat(),
+            },
         )
 
 
+def get_todo_calendar_id(ctx: UserContextWrapper) -> str:
+    """
+    The user's dedicated todo calendar, or the primary calendar for users who keep todos there.
+    """
+    return cast(UserContext, ctx.context).todo_calendar_id or 'primary'
+
+
+# Todos changed per resolve_todos or reschedule_todos call, keeping the per-todo report readable
+MAX_BULK_TODOS = 100
+
+
 class TodosResult(BaseModel):
     todos: list[Todo]
+    total: int | None = None
     hide_recurrence_properties: bool = True
     error_message: str | None = None
+    token_budget: int = 6000
+
+    def __str__(self) -> str:
+        columns = ['id', 'due_date', 'summary', 'is_resolved', 'location', 'description']
+        if not self.hide_recurrence_properties:
+            columns += ['recurrence', 'is_recurrence_master_event']
+
+        header, lines = encode_table(columns, Todo.dump_many(self.todos))
+
+        return fit_to_budget(
+            header,
+            lines,
+            self.token_budget,
+            'todos',
+            notes=[self.error_message or ''],
+            total=self.total,
+        )
 
 
 @function_tool
@@ -73,37 +137,45 @@ async def list_todos(
     ctx: UserContextWrapper,
     due_date_min: str,
     due_date_max: str,
+    resolved: bool | None = None,
 ) -> TodosResult:
     """
     due_date_min, due_date_max: format should be YYYY-MM-DD
+    resolved: true for only resolved todos, false for only open ones, null for both
     """
-    calsvc = get_calendar_service(cast(UserContext, ctx.context).user_id)
-    tz = calsvc.settings().get(setting='timezone').execute().get('value')
+    user_id = cast(UserContext, ctx.context).user_id
+    calendar_id = get_todo_calendar_id(ctx)
+    tz = await get_user_timezone_async(user_id)
 
     time_min = arrow.get(due_date_min).floor('day').replace(tzinfo=tz).isoformat()
     time_max = arrow.get(due_date_max).ceil('day').replace(tzinfo=tz).isoformat()
 
-    max_results = 1001
+    mirrored = await list_mirrored_events(
+        user_id, calendar_id, time_min, time_max, todos=True, limit=MAX_LOADED_EVENTS, resolved=resolved
+    )
+
+    todos = Todo.from_gcal_events(mirrored.events)
+
+    return TodosResult(todos=todos, total=mirrored.total, error_message=None)
+
+
+@function_tool
+async def list_overdue_todos(ctx: UserContextWrapper) -> TodosResult:
+    """
+    Open todos due before today, however long ago, oldest first. A recurring todo is listed once,
+    with its oldest open occurrence.
+    """
+    user_id = cast(UserContext, ctx.context).user_id
+    calendar_id = get_todo_calendar_id(ctx)
+    tz = await get_user_timezone_async(user_id)
 
-    event_dicts = calsvc.events().list(
-        calendarId='primary',
-        timeMin=time_min,
-        timeMax=time_max,
-        maxResults=max_results,
-        singleEvents=True,
-        orderBy='startTime',
-        sharedExtendedProperty='sb_type=todo',
-    ).execute().get('items', [])
+    today = arrow.now(tz).floor('day').isoformat()
 
-    if len(event_dicts) >= max_results:
-        return TodosResult(todos=[], error_message='Too many todos found. Narrow the time range and try again.')
+    mirrored = await list_mirrored_overdue_todos(user_id, calendar_id, today, limit=MAX_LOADED_EVENTS)
 
-    todos = [
-        Todo.from_gcal_event(d)
-        for d in event_dicts
-    ]
+    todos = Todo.from_gcal_events(mirrored.events)
 
-    return TodosResult(todos=todos, error_message=None)
+    return TodosResult(todos=todos, total=mirrored.total, error_message=None)
 
 
 @function_tool
@@ -111,27 +183,18 @@ async def list_master_instances_for_recurring_todos(
     ctx: UserContextWrapper,
     due_date_min: str,
     due_date_max: str,
+    resolved: bool | None = None,
 ) -> TodosResult:
     """
     due_date_min, due_date_max: format should be YYYY-MM-DD
+    resolved: true for only resolved todos, false for only open ones, null for both
     """
-    calsvc = get_calendar_service(cast(UserContext, ctx.context).user_id)
-    tz = calsvc.settings().get(setting='timezone').execute().get('value')
-
-    event_dicts = calsvc.events().list(
-        calendarId='primary',
-        timeMin=arrow.now(tz).isoformat(),
-        timeMax=arrow.now(tz).shift(months=12 + 1).isoformat(),
-        maxResults=2500,  # Google API hard max
-        singleEvents=False,
-        sharedExtendedProperty='sb_type=todo',
-    ).execute().get('items', [])
-
-    todos = [
-        Todo.from_gcal_event(d)
-        for d in event_dicts
-        if d.get('recurrence')
-    ]
+    user_id = cast(UserContext, ctx.context).user_id
+    calendar_id = get_todo_calendar_id(ctx)
+
+    event_dicts = await list_mirrored_recurring_masters(user_id, calendar_id, todos=True, resolved=resolved)
+
+    todos = Todo.from_gcal_events(event_dicts)
 
     return TodosResult(
         todos=todos,
@@ -140,6 +203,59 @@ async def list_master_instances_for_recurring_todos(
     )
 
 
+class NewTodo(BaseModel):
+    summary: str
+    due_date: str
+    location: str | None = None
+    rfc5545_recurrence_properties: list[str] | None = None
+    notes: str | None = None
+
+
+class TodoChanges(BaseModel):
+    todo_id: str
+    due_date: str | None = None
+    summary: str | None = None
+    rfc5545_recurrence_properties: list[str] | None = None
+    notes: str | None = None
+
+
+async def make_todo(new: NewTodo) -> Todo:
+    location = new.location
+    if location:
+        address = await lookup_address(location)
+        if address:
+            location += ' ' + address
+
+    todo = Todo(
+        summary='📝 ' + new.summary,
+        due_date=new.due_date,
+        location=location,
+        recurrence=new.rfc5545_recurrence_properties,
+    )
+
+    if new.notes:
+        todo.log_to_description(new.notes)
+
+    return todo
+
+
+def apply_todo_changes(todo: Todo, changes: TodoChanges) -> None:
+    if changes.due_date:
+        todo.log_to_description(f'Due date: {todo.due_date} → {changes.due_date}')
+        todo.due_date = changes.due_date
+
+    if changes.summary:
+        todo.log_to_description(f'Summary: "{todo.summary}" → "{changes.summary}"')
+        todo.summary = '📝 ' + changes.summary
+
+    if changes.rfc5545_recurrence_properties is not None:
+        todo.log_to_description('Changed recurrence properties')
+        todo.recurrence = changes.rfc5545_recurrence_properties
+
+    if changes.notes:
+        todo.log_to_description(changes.notes)
+
+
 @function_tool
 async def create_todo(
     ctx: UserContextWrapper,
@@ -153,74 +269,224 @@ async def create_todo(
     due_date: format should be YYYY-MM-DD
     location: look up and append address to location
     """
-    calsvc = get_calendar_service(cast(UserContext, ctx.context).user_id)
-
-    if location:
-        gmaps = googlemaps.Client(key=cfg().google_apis.api_key)
-        places = gmaps.places(query=location)['results']
-        if len(places) == 1:
-            location += ' ' + places[0]['formatted_address']
+    user_id = cast(UserContext, ctx.context).user_id
+    calendar_id = get_todo_calendar_id(ctx)
+    calsvc = get_calendar_service(user_id)
+
+    todo = await make_todo(
+        NewTodo(
+            summary=summary,
+            due_date=due_date,
+            location=location,
+            rfc5545_recurrence_properties=rfc5545_recurrence_properties,
+            notes=notes,
+        )
+    )
 
-    todo = Todo(
-        summary='📝 ' + summary,
-        due_date=due_date,
-        location=location,
-        recurrence=rfc5545_recurrence_properties,
+    await execute_async(
+        calsvc.events().insert(
+            calendarId=calendar_id,
+            body=todo.to_gcal_event(),
+        )
     )
+    await mark_calendar_changed(user_id, calendar_id)
 
-    if notes:
-        todo.log_to_description(notes)
+    return 'Successfully created todo'
 
-    calsvc.events().insert(
-        calendarId='primary',
-        body=todo.to_gcal_event(),
-    ).execute()
 
-    return 'Successfully created todo'
+@function_tool
+async def create_todos(ctx: UserContextWrapper, todos: list[NewTodo]) -> str:
+    """
+    Creates several todos at once. Prefer this over repeated create_todo calls.
+
+    due_date: format should be YYYY-MM-DD
+    location: look up and append address to location
+    """
+    user_id = cast(UserContext, ctx.context).user_id
+    calendar_id = get_todo_calendar_id(ctx)
+    calsvc = get_calendar_service(user_id)
+
+    made = await asyncio.gather(*(make_todo(new) for new in todos))
+
+    results = await execute_batch_async(
+        calsvc,
+        [calsvc.events().insert(calendarId=calendar_id, body=todo.to_gcal_event()) for todo in made],
+    )
+    await mark_calendar_changed(user_id, calendar_id)
+
+    return batch_report('Created', 'todos', [f'{new.summary} ({new.due_date})' for new in todos], results)
 
 
 @function_tool
 async def resolve_todo(ctx: UserContextWrapper, todo_id: str) -> str:
-    calsvc = get_calendar_service(cast(UserContext, ctx.context).user_id)
-    todo = Todo.get(calsvc, todo_id)
+    user_id = cast(UserContext, ctx.context).user_id
+    calendar_id = get_todo_calendar_id(ctx)
+
+    async def resolve(event: dict[str, Any]) -> dict[str, Any]:
+        todo = Todo.from_todo_event(event)
 
-    if todo.is_recurrence_master_event:
-        return 'This todo is a recurrence master event. Resolve individual occurrences instead.'
+        if todo.is_recurrence_master_event:
+            raise ValueError('This todo is a recurrence master event. Resolve individual occurrences instead.')
 
-    if todo.is_resolved:
-        return 'This todo is already resolved.'
+        if todo.is_resolved:
+            raise ValueError('This todo is already resolved.')
 
-    todo.resolve()
-    todo.log_to_description('Resolved ✅️')
+        todo.resolve()
+        todo.log_to_description('Resolved ✅️')
+        return todo.to_gcal_event()
 
-    calsvc.events().patch(
-        calendarId='primary',
-        eventId=todo_id,
-        body=todo.to_gcal_event(),
-    ).execute()
+    try:
+        await patch_event(user_id, calendar_id, todo_id, resolve)
+    except ValueError as e:
+        return str(e)
 
     return 'Marked todo as resolved.'
 
 
+async def select_open_todos(
+    ctx: UserContextWrapper,
+    todo_ids: list[str] | None,
+    due_date_min: str | None,
+    due_date_max: str | None,
+    overdue: bool,
+) -> tuple[list[str], list[str], int]:
+    """
+    Ids and report labels of the todos a bulk tool should change, and how many matched in total:
+    todo_ids as given, or the open todos due in the date range or overdue.
+    """
+    if todo_ids:
+        return todo_ids, todo_ids, len(todo_ids)
+
+    user_id = cast(UserContext, ctx.context).user_id
+    calendar_id = get_todo_calendar_id(ctx)
+    tz = await get_user_timezone_async(user_id)
+
+    if overdue:
+        today = arrow.now(tz).floor('day').isoformat()
+        mirrored = await list_mirrored_overdue_todos(user_id, calendar_id, today, limit=MAX_BULK_TODOS)
+    elif due_date_min and due_date_max:
+        time_min = arrow.get(due_date_min).floor('day').replace(tzinfo=tz).isoformat()
+        time_max = arrow.get(due_date_max).ceil('day').replace(tzinfo=tz).isoformat()
+        mirrored = await list_mirrored_events(
+            user_id, calendar_id, time_min, time_max, todos=True, limit=MAX_BULK_TODOS, resolved=False
+        )
+    else:
+        raise ValueError('Supply todo_ids, both due_date_min and due_date_max, or overdue=true.')
+
+    ids = [event['id'] for event in mirrored.events]
+    todos = Todo.from_gcal_events(mirrored.events)
+    return ids, [f'{todo_id} {todo.summary} ({todo.due_date})' for todo_id, todo in zip(ids, todos)], mirrored.total
+
+
+def bulk_report(verb: str, labels: list[str], results: list[Any], total: int) -> str:
+    report = batch_report(verb, 'todos', labels, results)
+    if total > len(labels):
+        report += f'\n{total - len(labels)} more todos matched; call again to continue.'
+    return report
+
+
+@function_tool
+async def resolve_todos(
+    ctx: UserContextWrapper,
+    todo_ids: list[str] | None = None,
+    due_date_min: str | None = None,
+    due_date_max: str | None = None,
+    overdue: bool = False,
+) -> str:
+    """
+    Resolves several todos at once: the given todo_ids, or every open todo due between
+    due_date_min and due_date_max, or every overdue open todo. With overdue, a recurring todo
+    counts once, with its oldest open occurrence. Prefer this over repeated resolve_todo calls.
+
+    due_date_min, due_date_max: format should be YYYY-MM-DD
+    """
+    user_id = cast(UserContext, ctx.context).user_id
+    calendar_id = get_todo_calendar_id(ctx)
+
+    try:
+        ids, labels, total = await select_open_todos(ctx, todo_ids, due_date_min, due_date_max, overdue)
+    except ValueError as e:
+        return str(e)
+
+    async def resolve(event: dict[str, Any]) -> dict[str, Any]:
+        todo = Todo.from_todo_event(event)
+
+        if todo.is_recurrence_master_event:
+            raise ValueError('recurrence master event; resolve individual occurrences instead')
+
+        if todo.is_resolved:
+            raise ValueError('already resolved')
+
+        todo.resolve()
+        todo.log_to_description('Resolved ✅️')
+        return todo.to_gcal_event()
+
+    results = await patch_events(user_id, calendar_id, ids, resolve)
+
+    return bulk_report('Resolved', labels, results, total)
+
+
+@function_tool
+async def reschedule_todos(
+    ctx: UserContextWrapper,
+    new_due_date: str,
+    todo_ids: list[str] | None = None,
+    due_date_min: str | None = None,
+    due_date_max: str | None = None,
+    overdue: bool = False,
+) -> str:
+    """
+    Moves several todos to new_due_date at once: the given todo_ids, or every open todo due
+    between due_date_min and due_date_max, or every overdue open todo. With overdue, a recurring
+    todo counts once, with its oldest open occurrence. Prefer this over repeated update_todo calls.
+
+    new_due_date, due_date_min, due_date_max: format should be YYYY-MM-DD
+    """
+    user_id = cast(UserContext, ctx.context).user_id
+    calendar_id = get_todo_calendar_id(ctx)
+
+    try:
+        ids, labels, total = await select_open_todos(ctx, todo_ids, due_date_min, due_date_max, overdue)
+    except ValueError as e:
+        return str(e)
+
+    async def reschedule(event: dict[str, Any]) -> dict[str, Any]:
+        todo = Todo.from_todo_event(event)
+
+        if todo.is_recurrence_master_event:
+            raise ValueError('recurrence master event; reschedule individual occurrences instead')
+
+        if todo.due_date != new_due_date:
+            apply_todo_changes(todo, TodoChanges(todo_id=event['id'], due_date=new_due_date))
+        return todo.to_gcal_event()
+
+    results = await patch_events(user_id, calendar_id, ids, reschedule)
+
+    return bulk_report('Rescheduled', labels, results, total)
+
+
 @function_tool
 async def unresolve_todo(ctx: UserContextWrapper, todo_id: str) -> str:
-    calsvc = get_calendar_service(cast(UserContext, ctx.context).user_id)
-    todo = Todo.get(calsvc, todo_id)
+    user_id = cast(UserContext, ctx.context).user_id
+    calendar_id = get_todo_calendar_id(ctx)
 
-    if todo.is_recurrence_master_event:
-        return 'This todo is a recurrence master event. Unresolve individual occurrences instead.'
+    async def unresolve(event: dict[str, Any]) -> dict[str, Any]:
+        todo = Todo.from_todo_event(event)
 
-    if not todo.is_resolved:
-        return 'This todo was not resolved to begin with.'
+        if todo.is_recurrence_master_event:
+            raise ValueError('This todo is a recurrence master event. Unresolve individual occurrences instead.')
 
-    todo.unresolve()
-    todo.log_to_description('Unresolved 📝')
+        if not todo.is_resolved:
+            raise ValueError('This todo was not resolved to begin with.')
 
-    calsvc.events().patch(
-        calendarId='primary',
-        eventId=todo_id,
-        body=todo.to_gcal_event(),
-    ).execute()
+        todo.unresolve()
+        todo.log_to_description('Unresolved 📝')
+        return todo.to_gcal_event()
+
+    try:
+        await patch_event(user_id, calendar_id, todo_id, unresolve)
+    except ValueError as e:
+        return str(e)
 
     return 'Marked todo as unresolved.'
 
@@ -239,40 +505,84 @@ async def update_todo(
 
     new_due_date: format should be YYYY-MM-DD
     """
-    calsvc = get_calendar_service(cast(UserContext, ctx.context).user_id)
-    todo = Todo.get(calsvc, todo_id)
+    user_id = cast(UserContext, ctx.context).user_id
+    calendar_id = get_todo_calendar_id(ctx)
+    changes = TodoChanges(
+        todo_id=todo_id,
+        due_date=due_date,
+        summary=summary,
+        rfc5545_recurrence_properties=rfc5545_recurrence_properties,
+        notes=notes,
+    )
 
-    if due_date:
-        todo.log_to_description(f'Due date: {todo.due_date} → {due_date}')
-        todo.due_date = due_date
+    async def update(event: dict[str, Any]) -> dict[str, Any]:
+        todo = Todo.from_todo_event(event)
+        apply_todo_changes(todo, changes)
+        return todo.to_gcal_event()
 
-    if summary:
-        todo.log_to_description(f'Summary: "{todo.summary}" → "{summary}"')
-        todo.summary = '📝 ' + summary
+    try:
+        await patch_event(user_id, calendar_id, todo_id, update)
+    except ValueError as e:
+        return str(e)
+
+    return 'Todo updated successfully.'
 
-    if rfc5545_recurrence_properties is not None:
-        todo.log_to_description('Changed recurrence properties')
-        todo.recurrence = rfc5545_recurrence_properties
 
-    if notes:
-        todo.log_to_description(notes)
+@function_tool
+async def update_todos(ctx: UserContextWrapper, updates: list[TodoChanges]) -> str:
+    """
+    Updates several todos at once. Prefer this over repeated update_todo calls. In each update,
+    only supply the attributes that should change.
 
-    calsvc.events().patch(
-        calendarId='primary',
-        eventId=todo_id,
-        body=todo.to_gcal_event(),
-    ).execute()
+    due_date: format should be YYYY-MM-DD
+    """
+    user_id = cast(UserContext, ctx.context).user_id
+    calendar_id = get_todo_calendar_id(ctx)
+    # patch_events refuses repeated ids, so only the first update of each todo applies
+    changes_by_id: dict[str, TodoChanges] = {}
+    for changes in updates:
+        changes_by_id.setdefault(changes.todo_id, changes)
 
-    return 'Todo updated successfully.'
+    async def update(event: dict[str, Any]) -> dict[str, Any]:
+        todo = Todo.from_todo_event(event)
+        apply_todo_changes(todo, changes_by_id[event['id']])
+        return todo.to_gcal_event()
+
+    results = await patch_events(user_id, calendar_id, [changes.todo_id for changes in updates], update)
+
+    return batch_report('Updated', 'todos', [changes.todo_id for changes in updates], results)
 
 
 @function_tool
 async def delete_todo(ctx: UserContextWrapper, todo_id: str) -> str:
-    calsvc = get_calendar_service(cast(UserContext, ctx.context).user_id)
-
-    calsvc.events().delete(
-        calendarId='primary',
-        eventId=todo_id,
-    ).execute()
+    user_id = cast(UserContext, ctx.context).user_id
+    calendar_id = get_todo_calendar_id(ctx)
+    calsvc = get_calendar_service(user_id)
+
+    await execute_async(
+        calsvc.events().delete(
+            calendarId=calendar_id,
+            eventId=todo_id,
+        )
+    )
+    await mark_calendar_changed(user_id, calendar_id)
 
     return 'Todo deleted successfully.'
+
+
+@function_tool
+async def delete_todos(ctx: UserContextWrapper, todo_ids: list[str]) -> str:
+    """
+    Deletes several todos at once. Prefer this over repeated delete_todo calls.
+    """
+    user_id = cast(UserContext, ctx.context).user_id
+    calendar_id = get_todo_calendar_id(ctx)
+    calsvc = get_calendar_service(user_id)
+
+    results = await execute_batch_async(
+        calsvc,
+        [calsvc.events().delete(calendarId=calendar_id, eventId=todo_id) for todo_id in todo_ids],
+    )
+    await mark_calendar_changed(user_id, calendar_id)
+
+    return batch_report('Deleted', 'todos', todo_ids, results)
@@ -17,6 +17,7 @@ from ask_sdk_core.utils import is_intent_name
 from ask_sdk_core.utils import is_request_type
 
 from secretary.agents.main_agent import SecretaryAgent
+from secretary.agents.run_metrics import log_run_metrics
 from secretary.data_models.channel import Channel
 
 
@@ -35,11 +36,12 @@ class IssuePromptHandler(AbstractRequestHandler):
 
         result = asyncio.run(
             Runner().run(
-                SecretaryAgent(user_ctx),
+                SecretaryAgent.for_user(user_ctx),
                 f"{user_prompt} (reply in natural spoken language)",
                 context=user_ctx,
             )
         )
+        log_run_metrics(result)
 
         reply = result.final_output
 
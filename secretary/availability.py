@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+from typing import Iterable
+
+import arrow
+from googleapiclient.discovery import Resource
+
+from secretary.google_apis import execute_async
+
+
+FREEBUSY_MAX_CALENDARS = 50  # Google API hard max per query
+
+Interval = tuple[arrow.Arrow, arrow.Arrow]
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> list[Interval]:
+    """
+    Sorted union of the intervals, with overlapping and touching intervals joined.
+    """
+    merged: list[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged += [(start, end)]
+    return merged
+
+
+def free_slots(busy: list[Interval], start: arrow.Arrow, end: arrow.Arrow, min_length: timedelta) -> list[Interval]:
+    """
+    Gaps of at least min_length between the merged busy intervals, within [start, end).
+    """
+    slots = []
+    cursor = start
+    for busy_start, busy_end in busy + [(end, end)]:
+        slot_end = min(busy_start, end)
+        if slot_end - cursor >= min_length:
+            slots += [(cursor, slot_end)]
+        cursor = max(cursor, busy_end)
+    return slots
+
+
+async def query_busy(
+    calsvc: Resource,
+    calendar_ids: list[str],
+    time_min: str,
+    time_max: str,
+) -> tuple[list[Interval], dict[str, str]]:
+    """
+    Busy intervals merged across the calendars, and an error message for each calendar the
+    freebusy API couldn't read.
+    """
+    busy: list[Interval] = []
+    errors: dict[str, str] = {}
+
+    for i in range(0, len(calendar_ids), FREEBUSY_MAX_CALENDARS):
+        resp = await execute_async(
+            calsvc.freebusy().query(
+                body={
+                    'timeMin': time_min,
+                    'timeMax': time_max,
+                    'items': [{'id': calendar_id} for calendar_id in calendar_ids[i:i + FREEBUSY_MAX_CALENDARS]],
+                },
+            )
+        )
+
+        calendars: dict[str, Any] = resp.get('calendars', {})
+        for calendar_id, calendar in calendars.items():
+            if calendar.get('errors'):
+                errors[calendar_id] = ', '.join(error.get('reason', 'unknown') for error in calendar['errors'])
+            busy += [(arrow.get(period['start']), arrow.get(period['end'])) for period in calendar.get('busy', [])]
+
+    return merge_intervals(busy), errors
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+from typing import Callable
+
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
+
+from secretary.google_apis import execute
+from secretary.google_apis import get_calendar_service
+from secretary.google_apis import run_in_executor
+
+
+METADATA_TTL_SECONDS = 15 * 60
+
+# Partial response field masks; etag is kept so stale entries can still be revalidated
+TIMEZONE_FIELDS = 'etag,value'
+CALENDAR_LIST_FIELDS = 'etag,items(id,summary,summaryOverride,primary)'
+
+
+@dataclass
+class _Entry:
+    value: Any
+    etag: str | None
+    expires_at: float
+
+
+class CalendarMetadataCache:
+    """
+    Per-user cache of slow-changing Google Calendar metadata (time zone setting, calendar list).
+
+    Fresh entries are served without a round trip. Once an entry is older than ttl_seconds it is
+    revalidated with its ETag, so an unchanged resource costs a 304 instead of a full download.
+    """
+
+    def __init__(self, ttl_seconds: float = METADATA_TTL_SECONDS) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._entries: dict[tuple[str, str], _Entry] = {}
+        self._lock = threading.Lock()
+
+    def get_timezone(self, user_id: str) -> str:
+        return self._get(
+            user_id,
+            'timezone',
+            lambda: get_calendar_service(user_id).settings().get(setting='timezone', fields=TIMEZONE_FIELDS),
+            lambda resp: resp.get('value'),
+        )
+
+    def list_calendars(self, user_id: str) -> list[dict[str, Any]]:
+        return self._get(
+            user_id,
+            'calendars',
+            lambda: get_calendar_service(user_id).calendarList().list(fields=CALENDAR_LIST_FIELDS),
+            lambda resp: resp.get('items', []),
+        )
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == user_id]:
+                del self._entries[key]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidations': self.revalidations,
+        }
+
+    def _get(
+        self,
+        user_id: str,
+        name: str,
+        make_request: Callable[[], HttpRequest],
+        extract: Callable[[dict[str, Any]], Any],
+    ) -> Any:
+        key = (user_id, name)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry.expires_at > time.monotonic():
+                self.hits += 1
+                return entry.value
+
+        request = make_request()
+        if entry and entry.etag:
+            request.headers['If-None-Match'] = entry.etag
+
+        try:
+            resp = execute(request)
+        except HttpError as e:
+            if entry and e.resp.status == 304:
+                with self._lock:
+                    self.revalidations += 1
+                    entry.expires_at = time.monotonic() + self.ttl_seconds
+                return entry.value
+            raise
+
+        value = extract(resp)
+
+        with self._lock:
+            self.misses += 1
+            self._entries[key] = _Entry(
+                value=value,
+                etag=resp.get('etag'),
+                expires_at=time.monotonic() + self.ttl_seconds,
+            )
+
+        return value
+
+
+calendar_metadata_cache = CalendarMetadataCache()
+
+
+def get_user_timezone(user_id: str) -> str:
+    return calendar_metadata_cache.get_timezone(user_id)
+
+
+def list_calendars(user_id: str) -> list[dict[str, Any]]:
+    return calendar_metadata_cache.list_calendars(user_id)
+
+
+async def get_user_timezone_async(user_id: str) -> str:
+    """
+    get_user_timezone on the Google API executor, so a cold or expired entry doesn't block the
+    event loop for a round trip.
+    """
+    return await run_in_executor(get_user_timezone, user_id)
+
+
+async def list_calendars_async(user_id: str) -> list[dict[str, Any]]:
+    return await run_in_executor(list_calendars, user_id)
@@ -0,0 +1,545 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import defaultdict
+from contextlib import closing
+from contextlib import suppress
+from typing import Any
+from typing import NamedTuple
+
+import arrow
+from googleapiclient.errors import HttpError
+
+from secretary.cache import TTLCache
+from secretary.calendar_metadata import list_calendars_async
+from secretary.google_apis import execute
+from secretary.google_apis import get_calendar_service
+from secretary.google_apis import run_in_executor
+from secretary.interval_index import IntervalIndex
+from secretary.recurrence import RecurringSeries
+from secretary.recurrence import event_length
+from secretary.recurrence import event_timestamp
+from secretary.service_config import cfg
+from secretary.service_config import create_private_file
+
+
+SYNC_PAGE_SIZE = 2500  # Google API hard max
+LOAD_BATCH_SIZE = 500
+
+# Events or todos loaded per list tool call. Far more than fit in the tools' token budget, so the
+# omitted count stays exact without loading them all.
+MAX_LOADED_EVENTS = 1000
+
+# Partial response field mask: what event_row, the recurrence engine and the Event and Todo parsers
+# read, plus status to recognize deletions in incremental syncs and etag for conditional writes
+SYNC_EVENT_FIELDS = (
+    'id,etag,status,start,end,summary,description,location,recurrence,recurringEventId,originalStartTime,'
+    'extendedProperties/shared'
+)
+SYNC_FIELDS = f'items({SYNC_EVENT_FIELDS}),timeZone,nextPageToken,nextSyncToken'
+
+# Bump when SCHEMA changes. The mirror is only a cache, so older databases are dropped and resynced.
+SCHEMA_VERSION = 5
+
+SCHEMA = '''
+DROP TABLE IF EXISTS sync_state;
+DROP TABLE IF EXISTS events;
+
+CREATE TABLE sync_state (
+    calendar_id TEXT PRIMARY KEY,
+    sync_token TEXT,
+    time_zone TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    revision INTEGER NOT NULL,
+    stale_generation INTEGER NOT NULL
+);
+
+CREATE TABLE events (
+    calendar_id TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    start_at REAL NOT NULL,
+    end_at REAL NOT NULL,
+    sb_type TEXT,
+    is_resolved INTEGER NOT NULL,
+    is_recurring INTEGER NOT NULL,
+    recurring_event_id TEXT,
+    is_cancelled INTEGER NOT NULL,
+    body TEXT NOT NULL,
+    PRIMARY KEY (calendar_id, event_id)
+);
+'''
+
+SNAPSHOT_TTL_SECONDS = 30 * 60
+
+EventIndex = IntervalIndex[tuple[float, float, str]]
+
+# Snapshot partitions, so open todo queries never walk years of resolved ones
+EVENT = 'event'
+OPEN_TODO = 'open_todo'
+RESOLVED_TODO = 'resolved_todo'
+
+_initialized_paths: set[str] = set()
+_snapshots: TTLCache[tuple[str, str], tuple[int, CalendarSnapshot]] = TTLCache(
+    ttl_seconds=SNAPSHOT_TTL_SECONDS,
+    max_size=200,
+)
+_sync_locks: dict[tuple[str, str], threading.Lock] = {}
+_sync_locks_lock = threading.Lock()
+
+
+class MirroredEvents(NamedTuple):
+    events: list[dict[str, Any]]
+    total: int
+
+
+class CalendarSnapshot(NamedTuple):
+    event_indexes: dict[str, EventIndex]
+    series: list[tuple[str, RecurringSeries]]
+
+
+def event_kind(sb_type: str | None, is_resolved: bool) -> str:
+    if sb_type != 'todo':
+        return EVENT
+    return RESOLVED_TODO if is_resolved else OPEN_TODO
+
+
+def select_kinds(todos: bool | None, resolved: bool | None) -> set[str]:
+    """
+    Snapshot partitions matching the filters. resolved only applies to todos.
+    """
+    kinds = {EVENT, OPEN_TODO, RESOLVED_TODO}
+    if todos is True:
+        kinds.discard(EVENT)
+    elif todos is False:
+        kinds = {EVENT}
+
+    if resolved is True:
+        kinds.discard(OPEN_TODO)
+    elif resolved is False:
+        kinds.discard(RESOLVED_TODO)
+
+    return kinds
+
+
+def event_row(calendar_id: str, event: dict[str, Any], tz: str) -> tuple[Any, ...]:
+    is_cancelled = event.get('status') == 'cancelled'
+    start = event['originalStartTime'] if is_cancelled else event['start']
+    end = event['originalStartTime'] if is_cancelled else event['end']
+
+    shared = event.get('extendedProperties', {}).get('shared', {})
+    start_at = event_timestamp(start, tz)
+    end_at = start_at + event_length(event_timestamp(end, tz) - start_at, 'date' in start)
+
+    return (
+        calendar_id,
+        event['id'],
+        start_at,
+        end_at,
+        shared.get('sb_type'),
+        shared.get('sb_is_resolved') == 'True',
+        bool(event.get('recurrence')),
+        event.get('recurringEventId'),
+        is_cancelled,
+        json.dumps(event),
+    )
+
+
+class CalendarMirror:
+    """
+    Local SQLite copy of a user's calendars, kept current with incremental events.list syncs.
+
+    Each calendar is mirrored unexpanded (singleEvents=False): single events, recurrence masters,
+    and exception events for instances that were moved, edited or cancelled. Time range queries
+    expand the masters locally with RecurringSeries instead of downloading every instance. A
+    calendar is synced on first use and then incrementally with its nextSyncToken whenever it is
+    older than max_staleness_seconds or has been marked stale after a mutation. The database is
+    shared by all worker processes on the host.
+    """
+
+    def __init__(self, user_id: str, directory: str | None = None, max_staleness_seconds: float | None = None) -> None:
+        mirror_cfg = cfg().calendar_mirror
+        self.user_id = user_id
+        self.directory = directory or mirror_cfg.directory
+        self.max_staleness_seconds = (
+            max_staleness_seconds if max_staleness_seconds is not None else mirror_cfg.max_staleness_seconds
+        )
+        self.path = os.path.join(self.directory, f'{user_id}.sqlite3')
+
+    def connect(self) -> sqlite3.Connection:
+        # Rechecks the file in case delete_mirror ran in another process
+        if self.path not in _initialized_paths or not os.path.exists(self.path):
+            # Mirrors hold users' whole calendar history
+            create_private_file(self.path)
+            with closing(sqlite3.connect(self.path, timeout=30)) as conn:
+                conn.execute('PRAGMA journal_mode=WAL')
+                if conn.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+                    conn.executescript(SCHEMA + f'PRAGMA user_version = {SCHEMA_VERSION};')
+            _initialized_paths.add(self.path)
+
+        return sqlite3.connect(self.path, timeout=30)
+
+    def query_events(
+        self,
+        calendar_id: str,
+        time_min: str,
+        time_max: str,
+        todos: bool | None = None,
+        limit: int | None = None,
+        resolved: bool | None = None,
+    ) -> MirroredEvents:
+        """
+        Events and recurring event instances overlapping [time_min, time_max), ordered by start
+        time. todos=True returns only todos, todos=False excludes them; resolved=True or False
+        further keeps only resolved or open todos. Only the first limit events are loaded, but total
+        counts all matches.
+        """
+        self.ensure_fresh(calendar_id)
+
+        return self._query(
+            calendar_id,
+            arrow.get(time_min).timestamp(),
+            arrow.get(time_max).timestamp(),
+            select_kinds(todos, resolved),
+            limit,
+        )
+
+    def query_overdue_todos(self, calendar_id: str, before: str, limit: int | None = None) -> MirroredEvents:
+        """
+        Open todos due before the given time, however long ago, ordered by due date. An open
+        recurring todo counts once, with its oldest open instance, so a daily series that has been
+        ignored for years doesn't crowd out everything else.
+        """
+        self.ensure_fresh(calendar_id)
+
+        return self._query(calendar_id, 0, arrow.get(before).timestamp(), {OPEN_TODO}, limit, first_instances=True)
+
+    def _query(
+        self,
+        calendar_id: str,
+        start: float,
+        end: float,
+        kinds: set[str],
+        limit: int | None,
+        first_instances: bool = False,
+    ) -> MirroredEvents:
+        """
+        first_instances=True keeps only the earliest matching instance of each recurring series.
+        """
+        snapshot = self.snapshot(calendar_id)
+
+        matches: list[tuple[float, float, str | dict[str, Any]]] = []
+        for kind in kinds:
+            matches += snapshot.event_indexes[kind].overlapping(start, end)
+        for kind, series in snapshot.series:
+            if kind not in kinds:
+                continue
+            elif first_instances:
+                first = series.first_instance(start, end)
+                matches += [first] if first else []
+            else:
+                matches += series.instances(start, end)
+
+        matches.sort(key=lambda match: (match[0], match[1]))
+        shown = [event for _, _, event in matches[:limit]]
+        bodies = self._load(calendar_id, [event for event in shown if isinstance(event, str)])
+
+        return MirroredEvents(
+            events=[bodies[event] if isinstance(event, str) else event for event in shown],
+            total=len(matches),
+        )
+
+    def snapshot(self, calendar_id: str) -> CalendarSnapshot:
+        """
+        Interval index over the calendar's single events and the expandable recurring series,
+        rebuilt only when a sync changed them.
+        """
+        key = (self.path, calendar_id)
+
+        with closing(self.connect()) as conn:
+            row = conn.execute(
+                'SELECT revision, time_zone FROM sync_state WHERE calendar_id = ?',
+                (calendar_id,),
+            ).fetchone()
+            revision, tz = row if row else (0, 'UTC')
+
+            cached = _snapshots.get(key)
+            if cached and cached[0] == revision:
+                return cached[1]
+
+            rows = list(conn.execute(
+                'SELECT start_at, end_at, event_id, sb_type, is_resolved FROM events '
+                'WHERE calendar_id = ? AND is_recurring = 0 AND is_cancelled = 0',
+                (calendar_id,),
+            ))
+
+            exception_starts: dict[str, list[float]] = defaultdict(list)
+            for master_id, body in conn.execute(
+                'SELECT recurring_event_id, body FROM events WHERE calendar_id = ? AND recurring_event_id IS NOT NULL',
+                (calendar_id,),
+            ):
+                exception_starts[master_id] += [event_timestamp(json.loads(body)['originalStartTime'], tz)]
+
+            series = []
+            for start_at, end_at, event_id, sb_type, is_resolved, body in conn.execute(
+                'SELECT start_at, end_at, event_id, sb_type, is_resolved, body FROM events '
+                'WHERE calendar_id = ? AND is_recurring = 1 AND is_cancelled = 0 ORDER BY start_at, event_id',
+                (calendar_id,),
+            ):
+                try:
+                    series += [(
+                        event_kind(sb_type, is_resolved),
+                        RecurringSeries(json.loads(body), tz, exception_starts[event_id]),
+                    )]
+                except ValueError as e:
+                    # Still show the first instance rather than dropping the event
+                    logging.warning(f'Failed to expand recurring event {event_id}: {e}')
+                    rows += [(start_at, end_at, event_id, sb_type, is_resolved)]
+
+        partitions: dict[str, list[tuple[float, float, str]]] = {EVENT: [], OPEN_TODO: [], RESOLVED_TODO: []}
+        for start_at, end_at, event_id, sb_type, is_resolved in rows:
+            partitions[event_kind(sb_type, is_resolved)] += [(start_at, end_at, event_id)]
+
+        snapshot = CalendarSnapshot(
+            event_indexes={
+                kind: IntervalIndex((item[0], item[1], item) for item in items)
+                for kind, items in partitions.items()
+            },
+            series=series,
+        )
+        _snapshots.set(key, (revision, snapshot))
+        return snapshot
+
+    def query_recurring_masters(
+        self,
+        calendar_id: str,
+        todos: bool | None = None,
+        resolved: bool | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Recurring series that haven't ended, i.e. still have an instance from now on, ordered by
+        their first start. Filters as in query_events.
+        """
+        self.ensure_fresh(calendar_id)
+
+        kinds = select_kinds(todos, resolved)
+        now = time.time()
+
+        return [
+            series.master
+            for kind, series in self.snapshot(calendar_id).series
+            if kind in kinds and series.has_instance_after(now)
+        ]
+
+    def get_events(self, calendar_id: str, event_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Mirrored bodies of the single, master and exception events among event_ids, as of the last
+        sync. Not synced first: callers writing with If-Match find out from Google if an event has
+        changed since.
+        """
+        return {
+            event_id: body
+            for event_id, body in self._load(calendar_id, event_ids).items()
+            if body.get('status') != 'cancelled'
+        }
+
+    def ensure_fresh(self, calendar_id: str) -> None:
+        if self._is_fresh(calendar_id):
+            return
+
+        with self._sync_lock(calendar_id):
+            # Another thread may have synced while we waited
+            if not self._is_fresh(calendar_id):
+                self.sync(calendar_id)
+
+    def mark_stale(self, calendar_id: str) -> None:
+        """
+        Forces a sync before the next read. Bumping stale_generation also keeps a sync that was
+        already in flight, and so may have fetched before our change, from marking the mirror fresh.
+        """
+        with closing(self.connect()) as conn, conn:
+            conn.execute(
+                "INSERT INTO sync_state VALUES (?, NULL, 'UTC', 0, 0, 1) "
+                'ON CONFLICT (calendar_id) DO UPDATE SET synced_at = 0, stale_generation = stale_generation + 1',
+                (calendar_id,),
+            )
+
+    def sync(self, calendar_id: str) -> None:
+        with closing(self.connect()) as conn:
+            row = conn.execute(
+                'SELECT sync_token, stale_generation FROM sync_state WHERE calendar_id = ?',
+                (calendar_id,),
+            ).fetchone()
+        sync_token, stale_generation = row if row else (None, 0)
+
+        try:
+            items, tz, next_sync_token = self._fetch(calendar_id, sync_token)
+        except HttpError as e:
+            if sync_token and e.resp.status == 410:
+                # Sync token expired; start over with a full sync
+                sync_token = None
+                items, tz, next_sync_token = self._fetch(calendar_id, None)
+            else:
+                raise
+
+        # Cancelled instances of a recurring event are kept so expansion skips them; other
+        # cancellations are deletions
+        deleted = {
+            e['id'] for e in items
+            if e.get('status') == 'cancelled' and 'originalStartTime' not in e
+        }
+
+        with closing(self.connect()) as conn, conn:
+            if sync_token is None:
+                conn.execute('DELETE FROM events WHERE calendar_id = ?', (calendar_id,))
+
+            conn.executemany(
+                'DELETE FROM events WHERE calendar_id = ? AND (event_id = ? OR recurring_event_id = ?)',
+                [(calendar_id, event_id, event_id) for event_id in deleted],
+            )
+            conn.executemany(
+                'INSERT OR REPLACE INTO events VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [event_row(calendar_id, e, tz) for e in items if e['id'] not in deleted],
+            )
+            # Revisions are unique rather than counters, so a snapshot cached in another process
+            # can't match a mirror that was deleted and synced again
+            # If the mirror was marked stale since we started, what we fetched may predate that
+            # change: keep the new sync token but leave the mirror stale
+            conn.execute(
+                'INSERT INTO sync_state VALUES (?, ?, ?, ?, ?, 0) '
+                'ON CONFLICT (calendar_id) DO UPDATE SET sync_token = excluded.sync_token, '
+                'time_zone = excluded.time_zone, '
+                'synced_at = CASE WHEN stale_generation = ? THEN excluded.synced_at ELSE 0 END, '
+                'revision = CASE WHEN ? THEN excluded.revision ELSE revision END',
+                (
+                    calendar_id,
+                    next_sync_token,
+                    tz,
+                    time.time(),
+                    time.time_ns(),
+                    stale_generation,
+                    bool(items) or sync_token is None,
+                ),
+            )
+
+    def _fetch(self, calendar_id: str, sync_token: str | None) -> tuple[list[dict[str, Any]], str, str | None]:
+        calsvc = get_calendar_service(self.user_id)
+
+        items: list[dict[str, Any]] = []
+        tz = 'UTC'
+        page_token = None
+        while True:
+            resp = execute(
+                calsvc.events().list(
+                    calendarId=calendar_id,
+                    singleEvents=False,
+                    maxResults=SYNC_PAGE_SIZE,
+                    syncToken=sync_token,
+                    pageToken=page_token,
+                    fields=SYNC_FIELDS,
+                )
+            )
+            items += resp.get('items', [])
+            tz = resp.get('timeZone', tz)
+
+            page_token = resp.get('nextPageToken')
+            if not page_token:
+                return items, tz, resp.get('nextSyncToken')
+
+    def _is_fresh(self, calendar_id: str) -> bool:
+        with closing(self.connect()) as conn:
+            row = conn.execute('SELECT synced_at FROM sync_state WHERE calendar_id = ?', (calendar_id,)).fetchone()
+        return row is not None and time.time() - row[0] < self.max_staleness_seconds
+
+    def _sync_lock(self, calendar_id: str) -> threading.Lock:
+        with _sync_locks_lock:
+            return _sync_locks.setdefault((self.user_id, calendar_id), threading.Lock())
+
+    def _load(self, calendar_id: str, event_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Bodies of the given events by id.
+        """
+        bodies: dict[str, str] = {}
+
+        with closing(self.connect()) as conn:
+            for i in range(0, len(event_ids), LOAD_BATCH_SIZE):
+                batch = event_ids[i:i + LOAD_BATCH_SIZE]
+                bodies.update(conn.execute(
+                    'SELECT event_id, body FROM events WHERE calendar_id = ? '
+                    f'AND event_id IN ({", ".join("?" * len(batch))})',
+                    [calendar_id, *batch],
+                ))
+
+        return {event_id: json.loads(body) for event_id, body in bodies.items()}
+
+
+async def resolve_calendar_id(user_id: str, calendar_id: str) -> str:
+    """
+    Maps the 'primary' alias to the primary calendar's id, so both share one mirror.
+    """
+    if calendar_id != 'primary':
+        return calendar_id
+
+    calendars = await list_calendars_async(user_id)
+    return next((cal['id'] for cal in calendars if cal.get('primary')), calendar_id)
+
+
+async def list_mirrored_events(
+    user_id: str,
+    calendar_id: str,
+    time_min: str,
+    time_max: str,
+    todos: bool | None = None,
+    limit: int | None = None,
+    resolved: bool | None = None,
+) -> MirroredEvents:
+    calendar_id = await resolve_calendar_id(user_id, calendar_id)
+    return await run_in_executor(
+        CalendarMirror(user_id).query_events, calendar_id, time_min, time_max, todos, limit, resolved
+    )
+
+
+async def list_mirrored_overdue_todos(
+    user_id: str,
+    calendar_id: str,
+    before: str,
+    limit: int | None = None,
+) -> MirroredEvents:
+    calendar_id = await resolve_calendar_id(user_id, calendar_id)
+    return await run_in_executor(CalendarMirror(user_id).query_overdue_todos, calendar_id, before, limit)
+
+
+async def list_mirrored_recurring_masters(
+    user_id: str,
+    calendar_id: str,
+    todos: bool | None = None,
+    resolved: bool | None = None,
+) -> list[dict[str, Any]]:
+    calendar_id = await resolve_calendar_id(user_id, calendar_id)
+    return await run_in_executor(CalendarMirror(user_id).query_recurring_masters, calendar_id, todos, resolved)
+
+
+async def get_mirrored_events(user_id: str, calendar_id: str, event_ids: list[str]) -> dict[str, dict[str, Any]]:
+    calendar_id = await resolve_calendar_id(user_id, calendar_id)
+    return await run_in_executor(CalendarMirror(user_id).get_events, calendar_id, event_ids)
+
+
+async def mark_calendar_changed(user_id: str, calendar_id: str) -> None:
+    """
+    Called after a mutation so the next read picks the change up with an incremental sync.
+    """
+    calendar_id = await resolve_calendar_id(user_id, calendar_id)
+    await run_in_executor(CalendarMirror(user_id).mark_stale, calendar_id)
+
+
+def delete_mirror(user_id: str) -> None:
+    mirror = CalendarMirror(user_id)
+    for suffix in ['', '-wal', '-shm']:
+        with suppress(FileNotFoundError):
+            os.remove(mirror.path + suffix)
+    _initialized_paths.discard(mirror.path)
+    _snapshots.invalidate_where(lambda key: key[0] == mirror.path)
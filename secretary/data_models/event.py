@@ -1,13 +1,21 @@
 from __future__ import annotations
 
 from typing import Any
+from typing import ClassVar
 
 import arrow
 from googleapiclient.discovery import Resource
+from googleapiclient.http import HttpRequest
 from pydantic import BaseModel
+from pydantic import TypeAdapter
+
+from secretary.google_apis import execute_async
 
 
 class Event(BaseModel):
+    # Partial response field mask covering everything from_gcal_event reads
+    GCAL_FIELDS: ClassVar[str] = 'id,summary,start,end,description,location,recurrence'
+
     id: str | None = None
     start: str
     end: str
@@ -15,6 +23,13 @@ class Event(BaseModel):
     description: str | None = None
     location: str | None = None
     recurrence: list[str] | None = None
+    calendar_id: str | None = None
+
+    def start_time(self, tz: str) -> arrow.Arrow:
+        """
+        Start as a point in time. All-day events start at midnight in the given time zone.
+        """
+        return arrow.get(self.start) if 'T' in self.start else arrow.get(self.start).replace(tzinfo=tz)
 
     def to_gcal_event(self, calendar_tz: str | None = None) -> dict[str, Any]:
         event: dict[str, Any] = {
@@ -41,24 +56,52 @@ class Event(BaseModel):
 
     @classmethod
     def from_gcal_event(cls, event: dict[str, Any]) -> Event:
+        return cls.model_validate(cls.gcal_event_fields(event))
+
+    @classmethod
+    def from_gcal_events(cls, events: list[dict[str, Any]], calendar_id: str | None = None) -> list[Event]:
+        """
+        from_gcal_event for many events, validated in one pydantic-core call. On thousands of events
+        this is faster than building models one at a time, and faster than model_construct.
+        """
+        fields = [cls.gcal_event_fields(event) for event in events]
+        if calendar_id:
+            for event_fields in fields:
+                event_fields['calendar_id'] = calendar_id
+
+        return EVENT_LIST.validate_python(fields)
+
+    @classmethod
+    def gcal_event_fields(cls, event: dict[str, Any]) -> dict[str, Any]:
         start = event['start'].get('dateTime') or event['start']['date']
         end = event['end'].get('dateTime') or event['end']['date']
 
-        return cls(
-            id=event['id'],
-            summary=event.get('summary', ''),
-            start=start,
-            end=end,
-            description=event.get('description'),
-            location=event.get('location'),
-            recurrence=event.get('recurrence'),
-        )
+        return {
+            'id': event['id'],
+            'summary': event.get('summary', ''),
+            'start': start,
+            'end': end,
+            'description': event.get('description'),
+            'location': event.get('location'),
+            'recurrence': event.get('recurrence'),
+        }
+
+    @classmethod
+    def dump_many(cls, events: list[Event]) -> list[dict[str, Any]]:
+        """
+        model_dump for many events in one pydantic-core call.
+        """
+        return EVENT_LIST.dump_python(events)
 
     @classmethod
-    def get(cls, cal: Resource, calendar_id: str, event_id: str) -> Event:
-        event = cal.events().get(calendarId=calendar_id, eventId=event_id).execute()
+    async def get(cls, cal: Resource, calendar_id: str, event_id: str) -> Event:
+        event = await execute_async(cls.get_request(cal, calendar_id, event_id))
         return cls.from_gcal_event(event)
 
+    @classmethod
+    def get_request(cls, cal: Resource, calendar_id: str, event_id: str) -> HttpRequest:
+        return cal.events().get(calendarId=calendar_id, eventId=event_id, fields=cls.GCAL_FIELDS)
+
     def log_to_description(self, log_message: str) -> None:
         if self.description:
             self.description += '\n\n'
@@ -66,3 +109,6 @@ class Event(BaseModel):
             self.description = ''
 
         self.description += f'[{arrow.now().format("MMM D, YYYY")}] sb: {log_message}'
+
+
+EVENT_LIST = TypeAdapter(list[Event])
@@ -3,15 +3,33 @@ from __future__ import annotations
 import base64
 from collections import defaultdict
 from email.utils import parsedate_to_datetime
+from typing import ClassVar
 
 from bs4 import BeautifulSoup
 from email_reply_parser import EmailReplyParser
+from googleapiclient.errors import HttpError
 from pydantic import BaseModel
 
+from secretary.google_apis import execute_async
+from secretary.google_apis import execute_batch_async
 from secretary.google_apis import get_gmail_service
+from secretary.tool_output import fit_to_budget
+from secretary.tool_output import truncate_to_tokens
+
+
+# Deepest MIME nesting find_body will see. Real mail rarely goes past mixed > related > alternative.
+MAX_MIME_DEPTH = 5
+
+
+def _part_fields(depth: int) -> str:
+    return 'mimeType,body/data' + (f',parts({_part_fields(depth - 1)})' if depth else '')
 
 
 class GmailMessage(BaseModel):
+    # Partial response field mask covering everything from_msg_dict reads. Attachment metadata and
+    # per-part headers are left out.
+    GMAIL_FIELDS: ClassVar[str] = f'payload(headers(name,value),{_part_fields(MAX_MIME_DEPTH)})'
+
     date: str
     sender: str
     recipient: str
@@ -55,6 +73,9 @@ class GmailMessage(BaseModel):
 
 
 class GmailThread(BaseModel):
+    GMAIL_FIELDS: ClassVar[str] = f'id,messages({GmailMessage.GMAIL_FIELDS})'
+    SEARCH_FIELDS: ClassVar[str] = 'messages/threadId,nextPageToken'
+
     id: str
     subject: str
     messages: list[GmailMessage]
@@ -81,7 +102,7 @@ class GmailThread(BaseModel):
         return cls(id=thread_id, subject=subject, messages=messages)
 
     @classmethod
-    def search(
+    async def search(
         cls,
         user_id: str,
         query: str,
@@ -91,35 +112,82 @@ class GmailThread(BaseModel):
     ) -> GmailThreadsResult:
         gmailsvc = get_gmail_service(user_id)
 
-        resp = gmailsvc.users().messages().list(
-            userId='me',
-            q=query,
-            labelIds=label_ids,
-            maxResults=max_results_per_page,
-            pageToken=page_token,
-        ).execute()
+        resp = await execute_async(
+            gmailsvc.users().messages().list(
+                userId='me',
+                q=query,
+                labelIds=label_ids,
+                maxResults=max_results_per_page,
+                pageToken=page_token,
+                fields=cls.SEARCH_FIELDS,
+            )
+        )
 
-        thread_ids = {m['threadId'] for m in resp.get('messages', [])}
+        # Distinct threads in search order, i.e. most recent first
+        thread_ids = list(dict.fromkeys(m['threadId'] for m in resp.get('messages', [])))
+
+        # Fetched as Google batch requests, one round trip per BATCH_MAX_REQUESTS threads instead
+        # of one per thread. A thread that fails to load doesn't fail the search.
+        thread_dicts = await execute_batch_async(
+            gmailsvc,
+            [
+                gmailsvc.users().threads().get(
+                    userId='me',
+                    id=thread_id,
+                    format='full',
+                    fields=cls.GMAIL_FIELDS,
+                )
+                for thread_id in thread_ids
+            ],
+        )
 
         threads: list[GmailThread] = []
-        for thread_id in thread_ids:
-            thread_dict = gmailsvc.users().threads().get(
-                userId='me',
-                id=thread_id,
-                format='full'
-            ).execute()
+        errors: dict[str, str] = {}
+        for thread_id, thread_dict in zip(thread_ids, thread_dicts):
+            if isinstance(thread_dict, HttpError):
+                errors[thread_id] = thread_dict.reason or str(thread_dict)
+                continue
 
-            threads += [cls.from_thread_dict(thread_dict)]
+            try:
+                threads += [cls.from_thread_dict(thread_dict)]
+            except ValueError as e:
+                errors[thread_id] = str(e)
 
         return GmailThreadsResult(
             threads=threads,
-            next_page_token=resp.get('nextPageToken')
+            next_page_token=resp.get('nextPageToken'),
+            errors=errors,
         )
 
 
 class GmailThreadsResult(BaseModel):
     threads: list[GmailThread]
     next_page_token: str | None = None
+    errors: dict[str, str] = {}
+    token_budget: int = 8000
+    max_tokens_per_message: int = 1000
+
+    def __str__(self) -> str:
+        blocks = [
+            '\n'.join(
+                [f'## Thread {thread.id}: {thread.subject}'] + [
+                    f'- {message.date} | from: {message.sender} | to: {message.recipient}\n'
+                    f'{truncate_to_tokens(message.body, self.max_tokens_per_message)}'
+                    for message in thread.messages
+                ]
+            )
+            for thread in self.threads
+        ]
+
+        return fit_to_budget(
+            None,
+            blocks,
+            self.token_budget,
+            'threads',
+            notes=[f'next_page_token: {self.next_page_token}' if self.next_page_token else ''] + [
+                f'Could not load thread {thread_id}: {error}' for thread_id, error in self.errors.items()
+            ],
+        )
 
 
 class MessageBodyCleaner:
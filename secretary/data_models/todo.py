@@ -1,14 +1,24 @@
 from __future__ import annotations
 
 from typing import Any
+from typing import ClassVar
 from typing import Literal
 
 import arrow
 from googleapiclient.discovery import Resource
+from googleapiclient.http import HttpRequest
 from pydantic import BaseModel
+from pydantic import TypeAdapter
+
+from secretary.google_apis import execute_async
 
 
 class Todo(BaseModel):
+    # Partial response field mask covering everything from_gcal_event and get read
+    GCAL_FIELDS: ClassVar[str] = (
+        'id,summary,start/date,description,location,recurrence,recurringEventId,extendedProperties/shared'
+    )
+
     id: str | None = None
     due_date: str
     summary: str
@@ -31,6 +41,9 @@ class Todo(BaseModel):
             'summary': self.summary,
             'start': {'date': self.due_date},
             'end': {'date': self.due_date},
+            # Todos are reminders, not commitments; opaque all-day todos would make freebusy
+            # report the whole day as busy
+            'transparency': 'transparent',
             'extendedProperties': {
                 'shared': {
                     'sb_type': 'todo',
@@ -52,24 +65,52 @@ class Todo(BaseModel):
 
     @classmethod
     def from_gcal_event(cls, event: dict[str, Any]) -> Todo:
+        return cls.model_validate(cls.gcal_event_fields(event))
+
+    @classmethod
+    def from_gcal_events(cls, events: list[dict[str, Any]]) -> list[Todo]:
+        """
+        from_gcal_event for many events, validated in one pydantic-core call.
+        """
+        return TODO_LIST.validate_python([cls.gcal_event_fields(event) for event in events])
+
+    @classmethod
+    def gcal_event_fields(cls, event: dict[str, Any]) -> dict[str, Any]:
         is_resolved = cls.get_extended_property(event, 'sb_is_resolved') == str(True)
 
-        return cls(
-            id=event['id'],
-            summary=event['summary'],
-            due_date=event['start']['date'],
-            description=event.get('description'),
-            location=event.get('location'),
-            recurrence=event.get('recurrence'),
-            is_recurrence_master_event=bool(event.get('recurrenceId') and not event.get('recurringEventId')),
-            is_resolved=is_resolved,
-        )
+        return {
+            'id': event['id'],
+            'summary': event['summary'],
+            'due_date': event['start']['date'],
+            'description': event.get('description'),
+            'location': event.get('location'),
+            'recurrence': event.get('recurrence'),
+            'is_recurrence_master_event': bool(event.get('recurrence') and not event.get('recurringEventId')),
+            'is_resolved': is_resolved,
+        }
 
     @classmethod
-    def get(cls, calsvc: Resource, todo_id: str) -> Todo:
-        event = calsvc.events().get(calendarId='primary', eventId=todo_id).execute()
+    def dump_many(cls, todos: list[Todo]) -> list[dict[str, Any]]:
+        """
+        model_dump for many todos in one pydantic-core call.
+        """
+        return TODO_LIST.dump_python(todos)
+
+    @classmethod
+    async def get(cls, calsvc: Resource, calendar_id: str, todo_id: str) -> Todo:
+        return cls.from_todo_event(await execute_async(cls.get_request(calsvc, calendar_id, todo_id)))
+
+    @classmethod
+    def get_request(cls, calsvc: Resource, calendar_id: str, todo_id: str) -> HttpRequest:
+        return calsvc.events().get(calendarId=calendar_id, eventId=todo_id, fields=cls.GCAL_FIELDS)
+
+    @classmethod
+    def from_todo_event(cls, event: dict[str, Any]) -> Todo:
+        """
+        Like from_gcal_event, but rejects events that aren't todos.
+        """
         if cls.get_extended_property(event, 'sb_type') != 'todo':
-            raise ValueError(f"Event with ID {todo_id} is not a todo.")
+            raise ValueError(f"Event with ID {event['id']} is not a todo.")
         return cls.from_gcal_event(event)
 
     @classmethod
@@ -83,3 +124,6 @@ class Todo(BaseModel):
             self.description = ''
 
         self.description += f'[{arrow.now().format("MMM D, YYYY")}] sb: {log_message}'
+
+
+TODO_LIST = TypeAdapter(list[Todo])
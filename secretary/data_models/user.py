@@ -4,15 +4,23 @@ from pydantic import BaseModel
 
 import boto3
 from boto3.resources.base import ServiceResource
+from botocore.exceptions import ClientError
 
 
 class User(BaseModel):
     user_id: str
+    # Calendar holding the user's todos, or None to keep them on the primary calendar
+    todo_calendar_id: str | None = None
 
     @classmethod
     def table(cls) -> ServiceResource:
         return boto3.resource('dynamodb', 'us-west-2').Table('secretary_user')
 
+    @classmethod
+    def get(cls, user_id: str) -> User | None:
+        item = cls.table().get_item(Key={'user_id': user_id}).get('Item')
+        return User(**item) if item else None
+
     @classmethod
     def list(cls) -> list[User]:
         resp = cls.table().scan()
@@ -28,6 +36,25 @@ class User(BaseModel):
     def upsert(cls, user: User) -> None:
         cls.table().put_item(Item=user.model_dump())
 
+    @classmethod
+    def create_if_missing(cls, user_id: str) -> None:
+        """
+        Unlike upsert, leaves the settings of an existing user alone.
+        """
+        try:
+            cls.table().put_item(Item={'user_id': user_id}, ConditionExpression='attribute_not_exists(user_id)')
+        except ClientError as e:
+            if e.response['Error']['Code'] != 'ConditionalCheckFailedException':
+                raise
+
+    @classmethod
+    def set_todo_calendar_id(cls, user_id: str, todo_calendar_id: str) -> None:
+        cls.table().update_item(
+            Key={'user_id': user_id},
+            UpdateExpression='SET todo_calendar_id = :todo_calendar_id',
+            ExpressionAttributeValues={':todo_calendar_id': todo_calendar_id},
+        )
+
     @classmethod
     def delete(cls, user_id: str) -> None:
         cls.table().delete_item(Key={'user_id': user_id})
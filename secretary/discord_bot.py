@@ -8,7 +8,10 @@ from discord import Message
 from sb_service_util.errors import UserDataNotFoundError
 
 import secretary
+from secretary.agents.base import UserContext
 from secretary.agents.main_agent import SecretaryAgent
+from secretary.agents.run_metrics import log_run_metrics
+from secretary.discord_streaming import ProgressiveReply
 from secretary.service_config import cfg
 from secretary.data_models.channel import Channel
 
@@ -18,12 +21,67 @@ class SecretaryDiscordBot(discord.Client):
         if not self.should_reply_to_message(message):
             return
 
+        if cfg().discord.stream_replies:
+            await self.stream_reply(message)
+            return
+
         async with message.channel.typing():
             reply = await self.reply(message)
         if reply:
             await message.channel.send(reply)
 
     async def reply(self, message: Message) -> str | None:
+        run_input = await self.prepare_run(message)
+        if run_input is None:
+            return self.signup_message(message)
+        messages, user_ctx = run_input
+
+        result = await Runner().run(
+            SecretaryAgent.for_user(user_ctx),
+            input=messages,  # type: ignore
+            context=user_ctx,
+        )
+        log_run_metrics(result)
+
+        return result.final_output
+
+    async def stream_reply(self, message: Message) -> None:
+        """
+        Like reply, but posts a placeholder right away and edits it as the agent's output and tool
+        progress stream in.
+        """
+        run_input = await self.prepare_run(message)
+        if run_input is None:
+            await message.channel.send(self.signup_message(message))
+            return
+        messages, user_ctx = run_input
+
+        progress = ProgressiveReply(message.channel, cfg().discord.stream_edit_interval_seconds)
+        await progress.start()
+
+        result = Runner.run_streamed(
+            SecretaryAgent.for_user(user_ctx),
+            input=messages,  # type: ignore
+            context=user_ctx,
+        )
+        try:
+            async for event in result.stream_events():
+                progress.handle_event(event)
+        except Exception:
+            await progress.finish('Sorry, something went wrong while working on that.')
+            raise
+        log_run_metrics(result)
+
+        if result.final_output:
+            await progress.finish(str(result.final_output))
+        else:
+            await progress.discard()
+
+    async def prepare_run(self, message: Message) -> tuple[list[dict[str, str]], UserContext] | None:
+        """
+        The agent input and user context for replying to message, or None if its author hasn't
+        signed up yet.
+        """
         messages = await self.get_convo_history_for_openai(message.channel)
 
         messages += [
@@ -33,17 +91,9 @@ class SecretaryDiscordBot(discord.Client):
         try:
             sb_user_id = Channel.get('discord', str(message.author.id)).user_id
         except UserDataNotFoundError:
-            return self.signup_message(message)
+            return None
 
-        user_ctx = SecretaryAgent.get_user_context(sb_user_id)
-
-        result = await Runner().run(
-            SecretaryAgent(user_ctx),
-            input=messages,  # type: ignore
-            context=user_ctx,
-        )
-
-        return result.final_output
+        return messages, await SecretaryAgent.get_user_context_async(sb_user_id)
 
     def monitored_channels(self) -> list[int]:
         return []
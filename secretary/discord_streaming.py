@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+from typing import Any
+
+from agents import RunItemStreamEvent
+from agents import StreamEvent
+
+
+DISCORD_MESSAGE_LIMIT = 2000
+PLACEHOLDER = '…'
+
+
+def split_message(text: str, limit: int = DISCORD_MESSAGE_LIMIT) -> list[str]:
+    """
+    Splits text into chunks no longer than limit, preferring to break at newlines, then at spaces.
+    """
+    chunks = []
+    while len(text) > limit:
+        cut = text.rfind('\n', 0, limit + 1)
+        if cut <= 0:
+            cut = text.rfind(' ', 0, limit + 1)
+
+        if cut > 0:
+            # Drop the separator we broke at
+            chunks += [text[:cut]]
+            text = text[cut + 1:]
+        else:
+            chunks += [text[:limit]]
+            text = text[limit:]
+
+    if text or not chunks:
+        chunks += [text]
+
+    return chunks
+
+
+def tool_progress_label(event: RunItemStreamEvent) -> str:
+    name = getattr(event.item.raw_item, 'name', None) or 'tool'
+    return f'Working on it: {name.replace("_", " ")}…'
+
+
+class ProgressiveReply:
+    """
+    A reply that is posted as a placeholder message and then edited as the agent's output arrives.
+    Edits are batched so that at most one happens per edit_interval_seconds, and content longer than
+    Discord's message limit is spread over follow-up messages.
+    """
+
+    def __init__(self, channel: Any, edit_interval_seconds: float = 1.0) -> None:
+        self.channel = channel
+        self.edit_interval_seconds = edit_interval_seconds
+
+        self.text = ''
+        self.status: str | None = None
+
+        self._messages: list[Any] = []
+        self._rendered: list[str] = []
+        self._dirty = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._task: asyncio.Task[None] | None = None
+
+    async def start(self) -> None:
+        self._messages = [await self.channel.send(PLACEHOLDER)]
+        self._rendered = [PLACEHOLDER]
+        self._task = asyncio.create_task(self._edit_loop())
+
+    def handle_event(self, event: StreamEvent) -> None:
+        if event.type == 'raw_response_event':
+            if event.data.type == 'response.created':
+                # Each model turn produces a fresh message, so only the latest one is shown
+                self.text = ''
+                self._dirty.set()
+            elif event.data.type == 'response.output_text.delta':
+                self.text += event.data.delta
+                self._dirty.set()
+        elif event.type == 'run_item_stream_event':
+            if event.name == 'tool_called':
+                self.status = tool_progress_label(event)
+                self._dirty.set()
+            elif event.name == 'tool_output':
+                self.status = None
+                self._dirty.set()
+
+    async def finish(self, text: str) -> None:
+        await self._stop_editing()
+
+        self.text = text
+        self.status = None
+        await self._render()
+
+    async def discard(self) -> None:
+        """
+        Ends the reply without content, removing the placeholder, like a non-streamed reply that
+        is never sent.
+        """
+        await self._stop_editing()
+
+        for message in self._messages:
+            await message.delete()
+        self._messages = []
+        self._rendered = []
+
+    def content(self) -> str:
+        content = self.text.strip()
+        if self.status:
+            content = f'{content}\n\n_{self.status}_' if content else f'_{self.status}_'
+        return content or PLACEHOLDER
+
+    async def _stop_editing(self) -> None:
+        self._closing.set()
+        self._dirty.set()
+        if self._task:
+            await self._task
+
+    async def _edit_loop(self) -> None:
+        while not self._closing.is_set():
+            await self._dirty.wait()
+            if self._closing.is_set():
+                break
+
+            self._dirty.clear()
+            try:
+                await self._render()
+            except Exception:
+                logging.exception('Failed to update streamed Discord reply')
+
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._closing.wait(), timeout=self.edit_interval_seconds)
+
+    async def _render(self) -> None:
+        chunks = split_message(self.content())
+
+        for i, chunk in enumerate(chunks):
+            if i >= len(self._messages):
+                self._messages += [await self.channel.send(chunk)]
+                self._rendered += [chunk]
+            elif self._rendered[i] != chunk:
+                await self._messages[i].edit(content=chunk)
+                self._rendered[i] = chunk
+
+        for message in self._messages[len(chunks):]:
+            await message.delete()
+        del self._messages[len(chunks):]
+        del self._rendered[len(chunks):]
@@ -0,0 +1,165 @@
+from __future__ import annotations
+
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+
+from googleapiclient.discovery import Resource
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
+
+from secretary.calendar_mirror import SYNC_EVENT_FIELDS
+from secretary.calendar_mirror import get_mirrored_events
+from secretary.calendar_mirror import mark_calendar_changed
+from secretary.google_apis import execute_async
+from secretary.google_apis import execute_batch_async
+from secretary.google_apis import get_calendar_service
+
+
+PATCH_MAX_ATTEMPTS = 3
+
+# Takes the event's current body and returns the full body it should have, e.g. a model's
+# to_gcal_event. Raises ValueError to refuse the change.
+EventUpdate = Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]
+
+
+def changed_fields(current: dict[str, Any], new: dict[str, Any]) -> dict[str, Any]:
+    """
+    The top-level fields of new that differ from current, i.e. a patch body.
+    """
+    return {key: value for key, value in new.items() if current.get(key) != value}
+
+
+def get_request(calsvc: Resource, calendar_id: str, event_id: str) -> HttpRequest:
+    return calsvc.events().get(calendarId=calendar_id, eventId=event_id, fields=SYNC_EVENT_FIELDS)
+
+
+def patch_request(calsvc: Resource, calendar_id: str, event_id: str, body: dict[str, Any], etag: str) -> HttpRequest:
+    request = calsvc.events().patch(calendarId=calendar_id, eventId=event_id, body=body, fields='etag')
+    request.headers['If-Match'] = etag
+    return request
+
+
+def is_conflict(error: Exception) -> bool:
+    return isinstance(error, HttpError) and error.resp.status == 412
+
+
+async def patch_event(user_id: str, calendar_id: str, event_id: str, update: EventUpdate) -> None:
+    """
+    Applies update to the event and patches only the fields it changed, with If-Match on the ETag
+    of the body it was applied to, so a concurrent edit is never silently overwritten.
+
+    The first attempt starts from the calendar mirror's copy, making the common case a single
+    round trip. If the mirror was behind or someone else edited the event in between, Google
+    answers 412 and the update is reapplied to a freshly fetched body. A refusal based on the
+    mirror's copy is likewise rechecked against the live event before it is raised.
+    """
+    calsvc = get_calendar_service(user_id)
+
+    event = (await get_mirrored_events(user_id, calendar_id, [event_id])).get(event_id)
+    is_live = False
+
+    for attempt in range(PATCH_MAX_ATTEMPTS):
+        if event is None or 'etag' not in event:
+            event = await execute_async(get_request(calsvc, calendar_id, event_id))
+            is_live = True
+
+        try:
+            body = changed_fields(event, await update(event))
+        except ValueError:
+            if is_live:
+                raise
+            event = None
+            continue
+
+        if not body:
+            return
+
+        try:
+            await execute_async(patch_request(calsvc, calendar_id, event_id, body, event['etag']))
+        except HttpError as e:
+            if not is_conflict(e) or attempt == PATCH_MAX_ATTEMPTS - 1:
+                raise
+            event = None
+            continue
+
+        await mark_calendar_changed(user_id, calendar_id)
+        return
+
+    raise ValueError(f'Could not update {event_id}; it kept changing. Try again.')
+
+
+async def patch_events(user_id: str, calendar_id: str, event_ids: list[str], update: EventUpdate) -> list[Any]:
+    """
+    patch_event for many events, with each round of fetches and patches sent as Google batch
+    requests. Returns each event's patch response in order, None if update changed nothing, or the
+    exception it failed with; a failed event doesn't fail the others.
+
+    An id listed more than once is only patched for its first occurrence. The repeats fail with a
+    ValueError, because patching one event twice in a batch would conflict with itself.
+    """
+    calsvc = get_calendar_service(user_id)
+
+    results: list[Any] = [None] * len(event_ids)
+    first_indexes: dict[str, int] = {}
+    for i, event_id in enumerate(event_ids):
+        if event_id in first_indexes:
+            results[i] = ValueError(f'{event_id} is listed more than once; combine its changes into one item')
+        else:
+            first_indexes[event_id] = i
+
+    mirrored = await get_mirrored_events(user_id, calendar_id, list(first_indexes))
+    events = {i: mirrored[event_id] for event_id, i in first_indexes.items() if 'etag' in mirrored.get(event_id, {})}
+    is_live: set[int] = set()
+    pending = list(first_indexes.values())
+    patched = False
+
+    for attempt in range(PATCH_MAX_ATTEMPTS):
+        is_last = attempt == PATCH_MAX_ATTEMPTS - 1
+
+        missing = [i for i in pending if i not in events]
+        fetched = await execute_batch_async(calsvc, [get_request(calsvc, calendar_id, event_ids[i]) for i in missing])
+        for i, event in zip(missing, fetched):
+            if isinstance(event, Exception):
+                results[i] = event
+            else:
+                events[i] = event
+                is_live.add(i)
+
+        retry = []
+        patches = []
+        for i in pending:
+            if i not in events:
+                continue
+
+            try:
+                body = changed_fields(events[i], await update(events[i]))
+            except ValueError as e:
+                # Only refuse based on the live event; the mirror may be behind
+                if i in is_live or is_last:
+                    results[i] = e
+                else:
+                    del events[i]
+                    retry += [i]
+                continue
+
+            if body:
+                patches += [(i, patch_request(calsvc, calendar_id, event_ids[i], body, events[i]['etag']))]
+
+        responses = await execute_batch_async(calsvc, [request for _, request in patches])
+        for (i, _), response in zip(patches, responses):
+            if is_conflict(response) and not is_last:
+                del events[i]
+                retry += [i]
+            else:
+                results[i] = response
+                patched = patched or not isinstance(response, Exception)
+
+        pending = sorted(retry)
+        if not pending:
+            break
+
+    if patched:
+        await mark_calendar_changed(user_id, calendar_id)
+
+    return results
@@ -1,10 +1,23 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from functools import lru_cache
+from typing import Any
+from typing import Callable
+from typing import TypeVar
 
+import httplib2
 from googleapiclient import discovery
+from googleapiclient.discovery import Resource
+from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
+from googleapiclient.http import HttpRequest
 from oauth2client.client import OAuth2Credentials
 from oauth_userdb.client import OAuthUserDBClient
 from oauth_userdb.dynamodb_client import DynamoDBOAuthUserDBClient
 
+from secretary.cache import TTLCache
 from secretary.data_models.oauth import SecretaryOAuth
 from secretary.service_config import cfg
 
@@ -13,6 +26,26 @@ AUTH_URL = 'https://accounts.google.com/o/oauth2/v2/auth'
 TOKEN_URL = 'https://oauth2.googleapis.com/token'
 REDIRECT_URL = 'https://secretary.scooterbot.ai/login/step3'
 
+GOOGLE_API_MAX_WORKERS = 16
+BATCH_MAX_REQUESTS = 50  # Google API hard max per batch
+
+T = TypeVar('T')
+
+THREAD_HTTP_TTL_SECONDS = 30 * 60
+THREAD_HTTP_MAX_USERS = 100
+SERVICE_MAX_USERS = 100
+
+_executor = ThreadPoolExecutor(max_workers=GOOGLE_API_MAX_WORKERS, thread_name_prefix='google-api')
+_thread_local = threading.local()
+# Every thread's Http cache, so forget_user can reach them all
+_thread_https: list[TTLCache[str, httplib2.Http]] = []
+_thread_https_lock = threading.Lock()
+# Built services hold the user's credentials, so they expire and are forgotten like the thread Https
+_services: TTLCache[tuple[str, str], Resource] = TTLCache(
+    ttl_seconds=THREAD_HTTP_TTL_SECONDS,
+    max_size=2 * SERVICE_MAX_USERS,
+)
+
 
 @lru_cache(maxsize=1)
 def get_oauth_client(redirect_url: str = REDIRECT_URL) -> OAuthUserDBClient:
@@ -49,11 +82,112 @@ def get_google_apis_creds(user_id: str) -> OAuth2Credentials:
     )
 
 
-@lru_cache(maxsize=100)
+class UserHttpRequest(HttpRequest):
+    """
+    An HttpRequest that remembers which user it was built for, so it can be executed on an Http
+    object owned by the executing thread. httplib2.Http is not thread-safe, so requests must not
+    share the service's Http once they run on the executor.
+    """
+
+    def __init__(self, user_id: str, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.user_id = user_id
+
+
 def get_calendar_service(user_id: str):
-    return discovery.build('calendar', 'v3', credentials=get_google_apis_creds(user_id))
+    return _get_service('calendar', 'v3', user_id)
 
 
-@lru_cache(maxsize=1)
 def get_gmail_service(user_id: str):
-    return discovery.build('gmail', 'v1', credentials=get_google_apis_creds(user_id))
+    return _get_service('gmail', 'v1', user_id)
+
+
+def _get_service(name: str, version: str, user_id: str) -> Resource:
+    return _services.get_or_set(
+        (name, user_id),
+        lambda: discovery.build(
+            name,
+            version,
+            credentials=get_google_apis_creds(user_id),
+            requestBuilder=functools.partial(UserHttpRequest, user_id),
+        ),
+    )
+
+
+def get_thread_http(user_id: str) -> httplib2.Http:
+    """
+    The calling thread's authorized Http for the user. Each thread keeps a bounded cache, and an
+    entry expires after THREAD_HTTP_TTL_SECONDS, so credentials stored by a re-link in another
+    process are picked up within that time.
+    """
+    https: TTLCache[str, httplib2.Http] | None = getattr(_thread_local, 'https', None)
+    if https is None:
+        https = _thread_local.https = TTLCache(ttl_seconds=THREAD_HTTP_TTL_SECONDS, max_size=THREAD_HTTP_MAX_USERS)
+        with _thread_https_lock:
+            _thread_https.append(https)
+
+    return https.get_or_set(user_id, lambda: get_google_apis_creds(user_id).authorize(build_http()))
+
+
+def forget_user(user_id: str) -> None:
+    """
+    Drops the user's services and every thread's authorized Http for the user, e.g. after they
+    re-authorize or remove their Google account, so the old credentials aren't used again.
+    """
+    _services.invalidate_where(lambda key: key[1] == user_id)
+    with _thread_https_lock:
+        for https in _thread_https:
+            https.invalidate(user_id)
+
+
+def execute(request: HttpRequest) -> Any:
+    """
+    Executes a Google API request on the calling thread, using that thread's own Http object.
+    """
+    if isinstance(request, UserHttpRequest):
+        return request.execute(http=get_thread_http(request.user_id))
+    else:
+        return request.execute()
+
+
+async def execute_async(request: HttpRequest) -> Any:
+    """
+    Executes a Google API request on the bounded Google API executor so the event loop is not
+    blocked for the duration of the HTTP round trip.
+    """
+    return await run_in_executor(execute, request)
+
+
+def execute_batch(service: Resource, requests: list[HttpRequest]) -> list[Any]:
+    """
+    Executes requests as Google batch requests of up to BATCH_MAX_REQUESTS each, so N calls cost
+    one round trip per batch. Returns each request's response in order, or the HttpError it
+    failed with; a failed item doesn't fail the others.
+
+    A batch authorizes each part with the credentials of that part's own Http, so parts are moved
+    to the calling thread's Http too instead of sharing the service's credentials across threads.
+    """
+    results: list[Any] = [None] * len(requests)
+
+    def callback(request_id: str, response: Any, exception: HttpError | None) -> None:
+        results[int(request_id)] = exception or response
+
+    for i in range(0, len(requests), BATCH_MAX_REQUESTS):
+        batch = service.new_batch_http_request(callback=callback)
+        for j, request in enumerate(requests[i:i + BATCH_MAX_REQUESTS], start=i):
+            if isinstance(request, UserHttpRequest):
+                request.http = get_thread_http(request.user_id)
+            batch.add(request, request_id=str(j))
+
+        first = requests[i]
+        batch.execute(http=get_thread_http(first.user_id) if isinstance(first, UserHttpRequest) else None)
+
+    return results
+
+
+async def execute_batch_async(service: Resource, requests: list[HttpRequest]) -> list[Any]:
+    return await run_in_executor(execute_batch, service, requests)
+
+
+async def run_in_executor(func: Callable[..., T], *args: Any) -> T:
+    return await asyncio.get_running_loop().run_in_executor(_executor, func, *args)
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Generic
+from typing import Iterable
+from typing import TypeVar
+
+
+T = TypeVar('T')
+
+
+class IntervalIndex(Generic[T]):
+    """
+    Static index over half-open intervals [start, end), built once and queried many times.
+
+    Intervals are kept sorted by start, with a max-end tree over that order. Overlap queries find
+    the intervals starting before the query end with a binary search, then descend the tree and skip
+    every subtree whose latest end is before the query start. Each of the k results costs at most
+    one root-to-leaf path, so a query takes O((k + 1) log n); it never visits subtrees without a
+    result. Results are always returned in start order.
+    """
+
+    def __init__(self, intervals: Iterable[tuple[float, float, T]]) -> None:
+        ordered = sorted(intervals, key=lambda interval: (interval[0], interval[1]))
+
+        self.starts = [interval[0] for interval in ordered]
+        self.ends = [interval[1] for interval in ordered]
+        self.items = [interval[2] for interval in ordered]
+
+        self._size = 1
+        while self._size < len(ordered):
+            self._size *= 2
+
+        self._max_end = [float('-inf')] * (2 * self._size)
+        self._max_end[self._size:self._size + len(ordered)] = self.ends
+        for node in range(self._size - 1, 0, -1):
+            self._max_end[node] = max(self._max_end[2 * node], self._max_end[2 * node + 1])
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def overlapping(self, start: float, end: float) -> list[T]:
+        """
+        Intervals that overlap [start, end), in O((k + 1) log n) for k results.
+        """
+        limit = bisect_left(self.starts, end)
+        results = []
+
+        # Depth-first, left to right, so results come out in start order
+        stack = [(1, 0, self._size)]
+        while stack:
+            node, lo, width = stack.pop()
+            if lo >= limit or self._max_end[node] <= start:
+                continue
+
+            if width == 1:
+                results += [self.items[lo]]
+            else:
+                half = width // 2
+                stack += [(2 * node + 1, lo + half, half), (2 * node, lo, half)]
+
+        return results
+
+    def within(self, start: float, end: float) -> list[T]:
+        """
+        Intervals entirely contained in [start, end]. Scans every interval starting in the window,
+        so it costs O(log n + m) for the m intervals starting there, not just the ones returned.
+        """
+        lo = bisect_left(self.starts, start)
+        hi = bisect_left(self.starts, end)
+        return [self.items[i] for i in range(lo, hi) if self.ends[i] <= end]
+
+    def next_after(self, time: float) -> T | None:
+        """
+        The first interval starting at or after time.
+        """
+        i = bisect_left(self.starts, time)
+        return self.items[i] if i < len(self.items) else None
+
+    def count_starting(self, start: float, end: float) -> int:
+        """
+        Number of intervals starting in [start, end).
+        """
+        return bisect_left(self.starts, end) - bisect_left(self.starts, start)
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import re
+import sqlite3
+import time
+from contextlib import closing
+from functools import lru_cache
+
+import googlemaps
+
+from secretary.google_apis import run_in_executor
+from secretary.service_config import cfg
+from secretary.service_config import create_private_file
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS places (
+    query TEXT PRIMARY KEY,
+    address TEXT,
+    expires_at REAL NOT NULL
+);
+'''
+
+_initialized_paths: set[str] = set()
+
+
+@lru_cache(maxsize=1)
+def get_maps_client() -> googlemaps.Client:
+    return googlemaps.Client(key=cfg().google_apis.api_key)
+
+
+def normalize_query(query: str) -> str:
+    return re.sub(r'\s+', ' ', query).strip(' .,;').lower()
+
+
+class PlaceCache:
+    """
+    Persistent cache of place lookups, keyed on normalized query text and shared by all users and
+    worker processes. Queries that didn't resolve to exactly one place are cached as None for a
+    shorter negative_ttl_seconds.
+    """
+
+    def __init__(
+        self,
+        path: str | None = None,
+        ttl_seconds: float | None = None,
+        negative_ttl_seconds: float | None = None,
+    ) -> None:
+        places_cfg = cfg().places
+        self.path = path or places_cfg.cache_path
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else places_cfg.ttl_seconds
+        self.negative_ttl_seconds = (
+            negative_ttl_seconds if negative_ttl_seconds is not None else places_cfg.negative_ttl_seconds
+        )
+
+    def connect(self) -> sqlite3.Connection:
+        if self.path not in _initialized_paths:
+            # Holds every user's free-text place queries
+            create_private_file(self.path)
+            with closing(sqlite3.connect(self.path, timeout=30)) as conn:
+                conn.execute('PRAGMA journal_mode=WAL')
+                conn.executescript(SCHEMA)
+            _initialized_paths.add(self.path)
+
+        return sqlite3.connect(self.path, timeout=30)
+
+    def lookup_address(self, query: str) -> str | None:
+        """
+        Formatted address of the single place matching query, or None if there isn't exactly one.
+        """
+        key = normalize_query(query)
+
+        with closing(self.connect()) as conn:
+            row = conn.execute(
+                'SELECT address FROM places WHERE query = ? AND expires_at > ?',
+                (key, time.time()),
+            ).fetchone()
+        if row:
+            return row[0]
+
+        places = get_maps_client().places(query=query)['results']
+        address = places[0]['formatted_address'] if len(places) == 1 else None
+        ttl = self.ttl_seconds if address else self.negative_ttl_seconds
+
+        with closing(self.connect()) as conn, conn:
+            conn.execute('INSERT OR REPLACE INTO places VALUES (?, ?, ?)', (key, address, time.time() + ttl))
+
+        return address
+
+
+async def lookup_address(query: str) -> str | None:
+    return await run_in_executor(PlaceCache().lookup_address, query)
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import re
+from datetime import datetime
+from datetime import timezone
+from datetime import tzinfo
+from typing import Any
+from typing import Iterable
+
+import arrow
+from dateutil import tz as dateutil_tz
+from dateutil.rrule import rrulestr
+
+
+UNTIL_PATTERN = re.compile(r'UNTIL=(\d{8})(T\d{6})?(Z?)')
+
+DAY_SECONDS = 86400
+
+
+def event_timestamp(when: dict[str, Any], tz: str) -> float:
+    """
+    Timestamp of an event start, end or originalStartTime. Dates are midnight in the given time zone.
+    """
+    return arrow.get(when.get('dateTime') or arrow.get(when['date']).replace(tzinfo=tz)).timestamp()
+
+
+def event_length(duration: float, is_all_day: bool) -> float:
+    """
+    Length, in seconds, an event with the given duration occupies in time range queries. Todos are
+    written with end == start, so all-day events last at least the whole day like in Google
+    Calendar, and timed events at least a second so they still overlap their own start.
+    """
+    return max(duration, DAY_SECONDS if is_all_day else 1)
+
+
+class RecurringSeries:
+    """
+    Instances of a recurring master event, expanded locally from its RFC 5545 recurrence lines
+    (RRULE, RDATE, EXRULE, EXDATE) the same way Google expands them for singleEvents=True.
+
+    Timed series repeat in the master's own time zone, so a 9am weekly meeting stays at 9am across
+    DST changes, and all-day series repeat on calendar dates. Original start times listed in
+    exception_starts are skipped, because Google keeps a separate exception event for each instance
+    that was moved, edited or cancelled.
+    """
+
+    def __init__(self, master: dict[str, Any], tz: str, exception_starts: Iterable[float] = ()) -> None:
+        self.master = master
+        self.is_all_day = 'date' in master['start']
+        self.exception_starts = set(exception_starts)
+
+        if self.is_all_day:
+            self.tzinfo: tzinfo = dateutil_tz.gettz(tz) or timezone.utc
+            dtstart = datetime.fromisoformat(master['start']['date'])
+            dtend = datetime.fromisoformat(master['end']['date'])
+        else:
+            self.tzinfo = dateutil_tz.gettz(master['start'].get('timeZone') or tz) or timezone.utc
+            dtstart = datetime.fromisoformat(master['start']['dateTime']).astimezone(self.tzinfo)
+            dtend = datetime.fromisoformat(master['end']['dateTime']).astimezone(self.tzinfo)
+
+        self.duration = dtend - dtstart
+        self.length = event_length(self.duration.total_seconds(), self.is_all_day)
+        self.rules = rrulestr(
+            '\n'.join(self._normalize_until(line, dtstart) for line in master['recurrence']),
+            dtstart=dtstart,
+            forceset=True,
+            cache=True,
+        )
+
+    def instances(self, start: float, end: float) -> list[tuple[float, float, dict[str, Any]]]:
+        """
+        (start, end, event) for each instance overlapping [start, end), in start order.
+        """
+        candidates = self.rules.between(self._datetime(start - self.length), self._datetime(end), inc=True)
+
+        instances = []
+        for original_start in candidates:
+            instance_start = self._timestamp(original_start)
+            instance_end = instance_start + self.length
+            if instance_start < end and instance_end > start and instance_start not in self.exception_starts:
+                instances += [(instance_start, instance_end, self.instance(original_start))]
+
+        return instances
+
+    def first_instance(self, start: float, end: float) -> tuple[float, float, dict[str, Any]] | None:
+        """
+        The earliest of instances(start, end), without expanding the others.
+        """
+        for original_start in self.rules.xafter(self._datetime(start - self.length), inc=True):
+            instance_start = self._timestamp(original_start)
+            if instance_start >= end:
+                break
+            if instance_start + self.length > start and instance_start not in self.exception_starts:
+                return instance_start, instance_start + self.length, self.instance(original_start)
+
+        return None
+
+    def has_instance_after(self, timestamp: float) -> bool:
+        """
+        Whether the series has an instance starting at or after timestamp, i.e. hasn't ended.
+        """
+        return self.rules.after(self._datetime(timestamp), inc=True) is not None
+
+    def instance(self, original_start: datetime) -> dict[str, Any]:
+        """
+        The instance starting at original_start, shaped like the ones events.list returns.
+        """
+        original_end = original_start + self.duration
+
+        if self.is_all_day:
+            suffix = original_start.strftime('%Y%m%d')
+            start = {'date': original_start.date().isoformat()}
+            end = {'date': original_end.date().isoformat()}
+        else:
+            suffix = original_start.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+            start = {**self.master['start'], 'dateTime': original_start.isoformat()}
+            end = {**self.master['end'], 'dateTime': original_end.isoformat()}
+
+        instance = {key: value for key, value in self.master.items() if key != 'recurrence'}
+        instance.update(
+            id=f'{self.master["id"]}_{suffix}',
+            recurringEventId=self.master['id'],
+            originalStartTime=start,
+            start=start,
+            end=end,
+        )
+        return instance
+
+    def _datetime(self, timestamp: float) -> datetime:
+        local = datetime.fromtimestamp(timestamp, self.tzinfo)
+        return local.replace(tzinfo=None) if self.is_all_day else local
+
+    def _timestamp(self, dt: datetime) -> float:
+        return dt.replace(tzinfo=self.tzinfo).timestamp() if self.is_all_day else dt.timestamp()
+
+    def _normalize_until(self, line: str, dtstart: datetime) -> str:
+        """
+        dateutil requires UNTIL in UTC for timed series and floating for all-day ones, but Google
+        passes through whatever the client wrote. Converts UNTIL to the form dateutil expects.
+        """
+        match = UNTIL_PATTERN.search(line)
+        if not match:
+            return line
+
+        date, time, utc = match.groups()
+        if self.is_all_day == (not utc):
+            return line
+
+        if self.is_all_day:
+            until = datetime.strptime(date + (time or 'T000000'), '%Y%m%dT%H%M%S').replace(tzinfo=timezone.utc)
+            value = until.astimezone(self.tzinfo).strftime('%Y%m%dT%H%M%S')
+        else:
+            # A date-only UNTIL includes every instance starting that day
+            until = datetime.strptime(date + (time or 'T235959'), '%Y%m%dT%H%M%S').replace(tzinfo=dtstart.tzinfo)
+            value = until.astimezone(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+        return line[:match.start()] + f'UNTIL={value}' + line[match.end():]
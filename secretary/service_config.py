@@ -3,6 +3,7 @@ from functools import lru_cache
 
 import yaml
 from pydantic import BaseModel
+from pydantic import Field
 
 
 class GoogleApisConfig(BaseModel):
@@ -13,6 +14,8 @@ class GoogleApisConfig(BaseModel):
 
 class DiscordConfig(BaseModel):
     bot_token: str
+    stream_replies: bool = True
+    stream_edit_interval_seconds: float = 1.0
 
 
 class ServiceAccountConfig(BaseModel):
@@ -26,11 +29,57 @@ class AccountLinksConfig(BaseModel):
     house: ServiceAccountConfig
 
 
+class ModelRoutingConfig(BaseModel):
+    default_model: str = 'gpt-4.1'
+    task_classes: dict[str, str] = {
+        'administration': 'gpt-4.1-mini',
+    }
+    agents: dict[str, str] = {}
+    fallback_models: list[str] = ['gpt-4.1', 'gpt-4.1-mini']
+    max_consecutive_errors: int = 3
+    error_cooldown_seconds: float = 60
+    max_latency_seconds: float | None = None
+
+
+def app_data_directory(*parts: str) -> str:
+    """
+    Per-user application data directory ($XDG_DATA_HOME/secretary, by default
+    ~/.local/share/secretary), for data that must not sit in a world-readable /tmp.
+    """
+    data_home = os.environ.get('XDG_DATA_HOME') or os.path.expanduser('~/.local/share')
+    return os.path.join(data_home, 'secretary', *parts)
+
+
+def create_private_file(path: str) -> None:
+    """
+    Creates path if missing, in a directory only the service account can enter, and makes the file
+    readable only by the service account. SQLite gives a database's -wal and -shm files the
+    database file's permissions.
+    """
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o600))
+    os.chmod(path, 0o600)
+
+
+class CalendarMirrorConfig(BaseModel):
+    directory: str = Field(default_factory=lambda: app_data_directory('calendar_mirror'))
+    max_staleness_seconds: float = 30
+
+
+class PlacesConfig(BaseModel):
+    cache_path: str = Field(default_factory=lambda: app_data_directory('places.sqlite3'))
+    ttl_seconds: float = 30 * 24 * 60 * 60
+    negative_ttl_seconds: float = 24 * 60 * 60
+
+
 class SecretaryConfig(BaseModel):
     google_apis: GoogleApisConfig
     openai_api_key: str
     account_links: AccountLinksConfig
     discord: DiscordConfig
+    model_routing: ModelRoutingConfig = ModelRoutingConfig()
+    calendar_mirror: CalendarMirrorConfig = CalendarMirrorConfig()
+    places: PlacesConfig = PlacesConfig()
 
 
 def load_service_config() -> SecretaryConfig:
@@ -33,10 +33,10 @@ async def email_daily_todos() -> None:
 
     logging.info('Email daily todos')
     calendar_tuples = {
-        (row['todo_calendar_id'], row['user_id'])
+        (row.get('todo_calendar_id') or 'primary', row['user_id'])
         for row in User.table().scan(ProjectionExpression='todo_calendar_id, user_id')['Items']
     }
     for (calendar_id, user_id) in calendar_tuples:
-        for event in get_todos_to_remind_today(calendar_id, user_id):
+        for event in await get_todos_to_remind_today(calendar_id, user_id):
             logging.info(f'Sent mail to {user_id}')
             send_email(user_id, event)
@@ -0,0 +1,106 @@
+"""
+Switches a user to dedicated todo calendar mode: creates a calendar for their todos if they don't
+have one yet, moves every todo off the primary calendar into it and records it as the user's
+todo_calendar_id. Safe to rerun; a rerun moves whatever is still left on the primary calendar.
+
+    python -m secretary.todo_calendar <user_id> [--summary Todos]
+"""
+from __future__ import annotations
+
+import argparse
+from typing import Any
+
+import secretary
+from secretary.calendar_metadata import calendar_metadata_cache
+from secretary.calendar_metadata import get_user_timezone
+from secretary.calendar_metadata import list_calendars
+from secretary.calendar_mirror import CalendarMirror
+from secretary.data_models.user import User
+from secretary.google_apis import execute
+from secretary.google_apis import execute_batch
+from secretary.google_apis import get_calendar_service
+from secretary.tool_output import batch_report
+
+
+TODO_CALENDAR_SUMMARY = 'Todos'
+
+
+def list_primary_todos(user_id: str) -> list[dict[str, Any]]:
+    """
+    Todos on the primary calendar that can be moved: single todos and recurring series. Instances
+    of a series move with their master.
+    """
+    calsvc = get_calendar_service(user_id)
+
+    todos: list[dict[str, Any]] = []
+    page_token = None
+    while True:
+        resp = execute(
+            calsvc.events().list(
+                calendarId='primary',
+                sharedExtendedProperty='sb_type=todo',
+                singleEvents=False,
+                maxResults=2500,
+                pageToken=page_token,
+                fields='items(id,summary,recurringEventId),nextPageToken',
+            )
+        )
+        todos += [event for event in resp.get('items', []) if not event.get('recurringEventId')]
+
+        page_token = resp.get('nextPageToken')
+        if not page_token:
+            return todos
+
+
+def migrate_todos(user_id: str, summary: str = TODO_CALENDAR_SUMMARY) -> str:
+    calsvc = get_calendar_service(user_id)
+
+    user = User.get(user_id)
+    todo_calendar_id = user.todo_calendar_id if user else None
+
+    if not todo_calendar_id:
+        calendar = execute(
+            calsvc.calendars().insert(
+                body={'summary': summary, 'timeZone': get_user_timezone(user_id)},
+                fields='id',
+            )
+        )
+        todo_calendar_id = calendar['id']
+        # Recorded before moving, so a rerun after a partial failure reuses the same calendar
+        User.set_todo_calendar_id(user_id, todo_calendar_id)
+
+    todos = list_primary_todos(user_id)
+    results = execute_batch(
+        calsvc,
+        [
+            calsvc.events().move(calendarId='primary', eventId=todo['id'], destination=todo_calendar_id, fields='id')
+            for todo in todos
+        ],
+    )
+
+    from secretary.agents.main_agent import SecretaryAgent
+    calendar_metadata_cache.invalidate(user_id)
+    SecretaryAgent.invalidate_user_context(user_id)
+    SecretaryAgent.invalidate_cached(user_id)
+
+    mirror = CalendarMirror(user_id)
+    for calendar in list_calendars(user_id):
+        if calendar.get('primary') or calendar['id'] == todo_calendar_id:
+            mirror.mark_stale(calendar['id'])
+
+    report = batch_report('Moved', 'todos', [f'{todo["id"]} {todo.get("summary", "")}' for todo in todos], results)
+    return f'Todo calendar: {todo_calendar_id}\n{report}'
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description='Move a user\'s todos to a dedicated todo calendar.')
+    parser.add_argument('user_id')
+    parser.add_argument('--summary', default=TODO_CALENDAR_SUMMARY, help='name of the calendar to create')
+    args = parser.parse_args()
+
+    secretary.init()
+    print(migrate_todos(args.user_id, args.summary))
+
+
+if __name__ == '__main__':
+    run()
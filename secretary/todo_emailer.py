@@ -9,12 +9,16 @@ from functools import lru_cache
 from pytz import timezone  # type: ignore
 
 from secretary.data_models.oauth import SecretaryOAuth
+from secretary.google_apis import execute_async
 from secretary.google_apis import get_calendar_service
 from secretary.google_apis import get_google_apis_creds
 
 
 TZ = timezone('US/Pacific')
 
+# Partial response field mask covering what should_remind_today and send_email read
+REMINDER_FIELDS = 'defaultReminders,items(start,reminders,summary,description,htmlLink)'
+
 
 EMAIL_TEMPLATE = '''
 <!DOCTYPE html>
@@ -191,13 +195,18 @@ def get_gmail_service(user_id: str):
     return discovery.build('gmail', 'v1', credentials=get_google_apis_creds(user_id))
 
 
-def get_todos_to_remind_today(todo_calendar_id: str, user_id: str) -> List[dict]:
-    resp = get_calendar_service(user_id).events().list(
-        calendarId=todo_calendar_id,
-        timeMin=arrow.now().shift(days=-1).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
-        singleEvents=True,
-        orderBy='startTime',
-    ).execute()
+async def get_todos_to_remind_today(todo_calendar_id: str, user_id: str) -> List[dict]:
+    resp = await execute_async(
+        get_calendar_service(user_id).events().list(
+            calendarId=todo_calendar_id,
+            timeMin=arrow.now().shift(days=-1).strftime("%Y-%m-%dT%H:%M:%S.%fZ"),
+            singleEvents=True,
+            orderBy='startTime',
+            # A dedicated todo calendar holds only todos; the primary calendar holds everything
+            sharedExtendedProperty='sb_type=todo' if todo_calendar_id == 'primary' else None,
+            fields=REMINDER_FIELDS,
+        )
+    )
 
     return [
         event for event in
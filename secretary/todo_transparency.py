@@ -0,0 +1,97 @@
+"""
+Marks existing todos as transparent, like Todo.to_gcal_event does for new ones, so all-day todos
+stop showing up as busy days in freebusy and find_availability. Safe to rerun; todos that are
+already transparent are left alone.
+
+    python -m secretary.todo_transparency [user_id ...]
+
+Without user ids, every user is backfilled.
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+from typing import Any
+
+import secretary
+from secretary.calendar_metadata import list_calendars
+from secretary.calendar_mirror import CalendarMirror
+from secretary.data_models.user import User
+from secretary.google_apis import execute
+from secretary.google_apis import execute_batch
+from secretary.google_apis import get_calendar_service
+from secretary.tool_output import batch_report
+
+
+def list_opaque_todos(user_id: str, calendar_id: str) -> list[dict[str, Any]]:
+    """
+    Single todos, recurring todo masters and their exceptions on the calendar that are still opaque.
+    """
+    calsvc = get_calendar_service(user_id)
+
+    todos: list[dict[str, Any]] = []
+    page_token = None
+    while True:
+        resp = execute(
+            calsvc.events().list(
+                calendarId=calendar_id,
+                sharedExtendedProperty='sb_type=todo',
+                singleEvents=False,
+                maxResults=2500,
+                pageToken=page_token,
+                fields='items(id,summary,status,transparency),nextPageToken',
+            )
+        )
+        todos += [
+            event for event in resp.get('items', [])
+            if event.get('transparency') != 'transparent' and event.get('status') != 'cancelled'
+        ]
+
+        page_token = resp.get('nextPageToken')
+        if not page_token:
+            return todos
+
+
+def backfill_transparency(user_id: str) -> str:
+    user = User.get(user_id)
+    calendar_id = (user.todo_calendar_id if user else None) or 'primary'
+    calsvc = get_calendar_service(user_id)
+
+    todos = list_opaque_todos(user_id, calendar_id)
+    results = execute_batch(
+        calsvc,
+        [
+            calsvc.events().patch(
+                calendarId=calendar_id,
+                eventId=todo['id'],
+                body={'transparency': 'transparent'},
+                fields='id',
+            )
+            for todo in todos
+        ],
+    )
+
+    # The patches changed the todos' etags
+    mirror = CalendarMirror(user_id)
+    for calendar in list_calendars(user_id):
+        if calendar['id'] == calendar_id or (calendar_id == 'primary' and calendar.get('primary')):
+            mirror.mark_stale(calendar['id'])
+
+    return batch_report('Made transparent', 'todos', [f'{todo["id"]} {todo.get("summary", "")}' for todo in todos], results)
+
+
+def run() -> None:
+    parser = argparse.ArgumentParser(description='Mark existing todos as transparent in freebusy.')
+    parser.add_argument('user_ids', nargs='*', help='users to backfill; all users if omitted')
+    args = parser.parse_args()
+
+    secretary.init()
+    for user_id in args.user_ids or [user.user_id for user in User.list()]:
+        try:
+            print(f'{user_id}: {backfill_transparency(user_id)}')
+        except Exception:
+            logging.exception(f'Failed to backfill todos of {user_id}')
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any
+
+import tiktoken
+
+
+TOKENIZER_MODEL = 'gpt-4.1'
+
+
+@lru_cache(maxsize=1)
+def get_encoding() -> tiktoken.Encoding:
+    try:
+        return tiktoken.encoding_for_model(TOKENIZER_MODEL)
+    except KeyError:
+        # Older tiktoken releases don't know about newer models
+        return tiktoken.get_encoding('cl100k_base')
+
+
+def count_tokens(text: str) -> int:
+    return len(get_encoding().encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    tokens = get_encoding().encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return get_encoding().decode(tokens[:max_tokens]) + ' …[truncated]'
+
+
+def format_cell(value: Any) -> str:
+    if value is None or value is False:
+        return ''
+    elif value is True:
+        return 'yes'
+    elif isinstance(value, list):
+        value = '; '.join(str(v) for v in value)
+
+    return str(value).replace('\\', '\\\\').replace('|', '\\|').replace('\n', '\\n')
+
+
+def encode_table(columns: list[str], rows: list[dict[str, Any]]) -> tuple[str, list[str]]:
+    """
+    Encodes rows as a pipe-delimited table so field names are sent once instead of once per row.
+    Columns that are empty in every row are dropped. Returns the header line and one line per row.
+    """
+    cells = [[format_cell(row.get(column)) for column in columns] for row in rows]
+
+    kept = [i for i, column in enumerate(columns) if any(row[i] for row in cells)]
+
+    header = ' | '.join(columns[i] for i in kept)
+    lines = [' | '.join(row[i] for i in kept) for row in cells]
+
+    return header, lines
+
+
+def fit_to_budget(
+    header: str | None,
+    blocks: list[str],
+    token_budget: int,
+    item_name: str,
+    notes: list[str] | None = None,
+    total: int | None = None,
+) -> str:
+    """
+    Joins header and blocks, keeping blocks in their original order until the token budget is
+    reached. Anything dropped is reported in a trailing line, so the output is deterministic
+    for the same input and budget. total is the number of matching items when only the first
+    ones were passed as blocks.
+    """
+    notes = [note for note in (notes or []) if note]
+    total = max(total or 0, len(blocks))
+
+    if not blocks:
+        return '\n'.join(notes + [f'No {item_name} found.'])
+
+    output = notes + ([header] if header else [])
+    used = sum(count_tokens(line) + 1 for line in output)
+
+    shown = 0
+    for block in blocks:
+        block_tokens = count_tokens(block) + 1
+        if used + block_tokens > token_budget:
+            break
+
+        output += [block]
+        used += block_tokens
+        shown += 1
+
+    if shown < total:
+        output += [
+            f'[{total - shown} of {total} {item_name} omitted to stay within {token_budget} '
+            'tokens. Narrow the query to see them.]'
+        ]
+
+    return '\n'.join(output)
+
+
+def batch_report(verb: str, item_name: str, labels: list[str], results: list[Any]) -> str:
+    """
+    Per-item outcome of a bulk tool. results holds each item's response, or the exception it
+    failed with.
+    """
+    failed = sum(isinstance(result, Exception) for result in results)
+
+    header, lines = encode_table(
+        ['item', 'result'],
+        [
+            {
+                'item': label,
+                'result': f'failed: {getattr(result, "reason", None) or result}' if isinstance(result, Exception) else 'ok',
+            }
+            for label, result in zip(labels, results)
+        ],
+    )
+
+    return '\n'.join([f'{verb} {len(results) - failed} of {len(results)} {item_name}.', header] + lines)
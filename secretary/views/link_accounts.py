@@ -4,6 +4,7 @@ from django.http import HttpResponseRedirect
 from oauth_userdb.client import OAuthUserDBClient
 from sb_service_util.account_links import AccountLinkRequest
 
+from secretary.account import forget_cached_user
 from secretary.account_linking import get_account_link_manager
 from secretary.google_apis import get_oauth_client
 
@@ -42,6 +43,7 @@ def step2(request: HttpRequest) -> HttpResponse:
 
     try:
         get_account_link_manager().process_link_request(user_id, link_request)
+        forget_cached_user(user_id)
         return HttpResponse('Accounts linked successfully')
     except Exception:
         return HttpResponse('Token is invalid or expired')
@@ -5,6 +5,7 @@ from django.http import HttpRequest
 from django.http import HttpResponse
 
 from secretary.agents.main_agent import SecretaryAgent
+from secretary.agents.run_metrics import log_run_metrics
 
 
 async def send_message_to_agent(request: HttpRequest) -> HttpResponse:
@@ -12,12 +13,13 @@ async def send_message_to_agent(request: HttpRequest) -> HttpResponse:
     user_id = payload["user_id"]
     message = payload["message"]
 
-    user_ctx = SecretaryAgent.get_user_context(user_id)
+    user_ctx = await SecretaryAgent.get_user_context_async(user_id)
 
     result = await Runner().run(
-        SecretaryAgent(user_ctx),
+        SecretaryAgent.for_user(user_ctx),
         message,
         context=user_ctx,
     )
+    log_run_metrics(result)
 
     return HttpResponse(result.final_output)
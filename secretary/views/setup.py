@@ -10,6 +10,7 @@ from oauth_userdb.client import OAuthUserDBClient
 from urllib.parse import quote
 from urllib.parse import unquote
 
+from secretary.account import forget_cached_user
 from secretary.data_models.channel import Channel
 from secretary.data_models.user import User
 from secretary.google_apis import get_oauth_client
@@ -72,8 +73,10 @@ async def step2(request: HttpRequest) -> HttpResponse:
     state = OAuthState.unpack(request.GET['state'])
 
     user_id = oauth_client().save_user_and_credentials(code)
+    # A returning user re-authorized, so anything built from their old credentials is stale
+    forget_cached_user(user_id)
 
-    User.upsert(User(user_id=user_id))
+    User.create_if_missing(user_id)
 
     if state.discord_user_id:
         Channel.upsert(
@@ -55,7 +55,7 @@ def _save_alexa_user_and_redirect(user_id: str, state: str) -> str:
         push_enabled=False,
     )
 
-    User.upsert(User(user_id=user_id))
+    User.create_if_missing(user_id)
     Channel.upsert(channel)
 
     return (
@@ -0,0 +1,76 @@
+import asyncio
+import threading
+from typing import Iterator
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+from secretary.agents import base
+from secretary.agents.base import BaseSecretaryAgent
+from secretary.agents.base import UserContext
+from secretary.cache import TTLCache
+
+
+@pytest.fixture
+def lookups() -> Iterator[MagicMock]:
+    with (
+        patch('secretary.agents.base.get_account_link_manager') as get_account_link_manager,
+        patch('secretary.agents.base.User') as user,
+        patch('secretary.agents.base._user_context_cache', TTLCache(ttl_seconds=base.USER_CONTEXT_TTL_SECONDS)),
+    ):
+        link_manager = get_account_link_manager.return_value
+        link_manager.get_linked_user_id.side_effect = lambda user_id, account_type: f'{account_type}_{user_id}'
+        user.get.return_value.todo_calendar_id = 'todos'
+        yield link_manager
+
+
+EXPECTED = UserContext(
+    user_id='user1',
+    tesla_user_id='tesla_user1',
+    house_user_id='house_user1',
+    todo_calendar_id='todos',
+)
+
+
+def test_resolves_links_and_caches_context(lookups: MagicMock) -> None:
+    assert BaseSecretaryAgent.get_user_context('user1') == EXPECTED
+    assert BaseSecretaryAgent.get_user_context('user1') == EXPECTED
+
+    assert lookups.get_linked_user_id.call_count == 2
+
+
+def test_cached_context_expires(lookups: MagicMock) -> None:
+    with patch('secretary.cache.time.monotonic', return_value=1000):
+        BaseSecretaryAgent.get_user_context('user1')
+
+    with patch('secretary.cache.time.monotonic', return_value=1000 + base.USER_CONTEXT_TTL_SECONDS):
+        BaseSecretaryAgent.get_user_context('user1')
+
+    assert lookups.get_linked_user_id.call_count == 4
+
+
+def test_invalidate_user_context(lookups: MagicMock) -> None:
+    BaseSecretaryAgent.get_user_context('user1')
+    BaseSecretaryAgent.invalidate_user_context('user1')
+    BaseSecretaryAgent.get_user_context('user1')
+
+    assert lookups.get_linked_user_id.call_count == 4
+
+
+def test_async_lookup_runs_off_the_event_loop(lookups: MagicMock) -> None:
+    threads = []
+    get_user_context = BaseSecretaryAgent.get_user_context
+
+    def record_thread(user_id: str) -> UserContext:
+        threads.append(threading.get_ident())
+        return get_user_context(user_id)
+
+    async def get_context() -> tuple[UserContext, int]:
+        return await BaseSecretaryAgent.get_user_context_async('user1'), threading.get_ident()
+
+    with patch.object(BaseSecretaryAgent, 'get_user_context', side_effect=record_thread):
+        user_ctx, loop_thread = asyncio.run(get_context())
+
+    assert user_ctx == EXPECTED
+    assert threads and loop_thread not in threads
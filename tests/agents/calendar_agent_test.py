@@ -42,6 +42,26 @@ async def list_events(
     return EventsResult(events=[])
 
 
+@function_tool
+async def list_events_across_calendars(
+    ctx: UserContextWrapper,
+    calendar_ids: list[str],
+    time_min: str,
+    time_max: str,
+) -> EventsResult:
+    # Recorded as one list_events call per calendar, so expectations don't depend on which tool is used
+    for calendar_id in calendar_ids:
+        TOOL_CALLS.add(
+            call.list_events(
+                sentinel.ctx,
+                calendar_id,
+                time_min,
+                time_max,
+            )
+        )
+    return EventsResult(events=[])
+
+
 @function_tool
 async def create_event(
     ctx: UserContextWrapper,
@@ -76,34 +96,34 @@ async def create_event(
 @pytest.fixture(autouse=True)
 def mock_all_tools(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setattr('secretary.agents.calendar_agent.list_events', list_events)
+    monkeypatch.setattr('secretary.agents.calendar_agent.list_events_across_calendars', list_events_across_calendars)
     monkeypatch.setattr('secretary.agents.calendar_agent.create_event', create_event)
 
 
 @pytest.fixture(autouse=True)
-def mock_calendar_service() -> None:
-    with patch('secretary.agents.calendar_agent.get_calendar_service') as mock_func:
-        mock_func.return_value.settings.return_value.get.return_value.execute.return_value = {
-            'value': TEST_TZ,
-        }
-
-        mock_func.return_value.calendarList.return_value.list.return_value.execute.return_value = {
-            'items': [
-                {
-                    'id': 'primary_calendar_id',
-                    'summary': 'Personal',
-                    'primary': True,
-                },
-                {
-                    'id': 'work_calendar_id',
-                    'summary': 'Work',
-                },
-                {
-                    'id': 'medical_calendar_id',
-                    'summary': 'Medical',
-                },
-            ],
-        }
-        yield mock_func
+def mock_calendar_metadata() -> None:
+    with (
+        patch('secretary.agents.calendar_agent.get_user_timezone') as mock_get_user_timezone,
+        patch('secretary.agents.calendar_agent.list_calendars') as mock_list_calendars,
+    ):
+        mock_get_user_timezone.return_value = TEST_TZ
+
+        mock_list_calendars.return_value = [
+            {
+                'id': 'primary_calendar_id',
+                'summary': 'Personal',
+                'primary': True,
+            },
+            {
+                'id': 'work_calendar_id',
+                'summary': 'Work',
+            },
+            {
+                'id': 'medical_calendar_id',
+                'summary': 'Medical',
+            },
+        ]
+        yield
 
 
 ###################################################################################################
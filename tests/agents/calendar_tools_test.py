@@ -0,0 +1,248 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import httplib2
+import pytest
+from agents import FunctionTool
+from googleapiclient.errors import HttpError
+
+from secretary.agents import calendar_agent
+from secretary.agents.base import UserContext
+from secretary.calendar_mirror import MirroredEvents
+from tests.tool_output_test import WordEncoding
+
+
+TEST_TZ = 'America/New_York'
+
+
+def make_event(event_id: str, start: str, end: str) -> dict[str, Any]:
+    key = 'dateTime' if 'T' in start else 'date'
+    return {'id': event_id, 'summary': event_id, 'start': {key: start}, 'end': {key: end}}
+
+
+def invoke(tool: FunctionTool, **kwargs: Any) -> Any:
+    return asyncio.run(tool.on_invoke_tool(Mock(context=UserContext(user_id='user1')), json.dumps(kwargs)))
+
+
+def not_found() -> HttpError:
+    return HttpError(httplib2.Response({'status': 404}), b'{"error": {"message": "Not Found"}}')
+
+
+class FakeGoogle:
+    """
+    Calendar service whose requests record their method and arguments, and batch execution that
+    answers each request with respond(request).
+    """
+
+    def __init__(self) -> None:
+        self.batches: list[list[SimpleNamespace]] = []
+        self.respond: Callable[[SimpleNamespace], Any] = lambda request: {'etag': '"2"'}
+        self.calsvc = MagicMock()
+        for method in ['insert', 'get', 'patch', 'delete']:
+            getattr(self.calsvc.events.return_value, method).side_effect = (
+                lambda method=method, **kwargs: SimpleNamespace(method=method, kwargs=kwargs, headers={})
+            )
+
+    async def execute_batch_async(self, calsvc: Any, requests: list[SimpleNamespace]) -> list[Any]:
+        if requests:
+            self.batches.append(requests)
+        return [self.respond(request) for request in requests]
+
+
+@pytest.fixture
+def google() -> Iterator[FakeGoogle]:
+    fake = FakeGoogle()
+
+    with (
+        patch('secretary.agents.calendar_agent.get_calendar_service', return_value=fake.calsvc),
+        patch('secretary.agents.calendar_agent.execute_batch_async', fake.execute_batch_async),
+        patch('secretary.agents.calendar_agent.mark_calendar_changed', new_callable=AsyncMock),
+        patch('secretary.agents.calendar_agent.lookup_address', AsyncMock(return_value=None)),
+        patch('secretary.event_patch.get_calendar_service', return_value=fake.calsvc),
+        patch('secretary.event_patch.execute_batch_async', fake.execute_batch_async),
+        patch('secretary.event_patch.mark_calendar_changed', new_callable=AsyncMock),
+    ):
+        yield fake
+
+
+@pytest.fixture(autouse=True)
+def mock_tool_dependencies() -> Iterator[None]:
+    async def get_user_timezone_async(user_id: str) -> str:
+        return TEST_TZ
+
+    with (
+        patch('secretary.agents.calendar_agent.get_user_timezone_async', get_user_timezone_async),
+        # Tool results are rendered for tracing
+        patch('secretary.tool_output.get_encoding', return_value=WordEncoding()),
+    ):
+        yield
+
+
+###################################################################################################
+
+
+MIRRORED = {
+    'work': [
+        make_event('standup', '2025-06-02T09:00:00-04:00', '2025-06-02T09:15:00-04:00'),
+        make_event('review', '2025-06-03T14:00:00-04:00', '2025-06-03T15:00:00-04:00'),
+    ],
+    'family': [
+        make_event('birthday', '2025-06-02', '2025-06-03'),
+        make_event('dinner', '2025-06-02T18:00:00-04:00', '2025-06-02T20:00:00-04:00'),
+    ],
+}
+
+
+@pytest.fixture
+def mirrored_events() -> Iterator[list[str]]:
+    listed: list[str] = []
+
+    async def list_mirrored_events(user_id: str, calendar_id: str, *args: Any, **kwargs: Any) -> MirroredEvents:
+        listed.append(calendar_id)
+        if calendar_id not in MIRRORED:
+            raise RuntimeError('Not Found')
+        return MirroredEvents(events=MIRRORED[calendar_id], total=len(MIRRORED[calendar_id]))
+
+    with patch('secretary.agents.calendar_agent.list_mirrored_events', list_mirrored_events):
+        yield listed
+
+
+def list_across(*calendar_ids: str) -> calendar_agent.EventsResult:
+    return invoke(
+        calendar_agent.list_events_across_calendars,
+        calendar_ids=list(calendar_ids),
+        time_min='2025-06-01T00:00:00-04:00',
+        time_max='2025-06-08T00:00:00-04:00',
+    )
+
+
+def test_merges_calendars_by_start_time(mirrored_events: list[str]) -> None:
+    result = list_across('work', 'family')
+
+    assert [(e.summary, e.calendar_id) for e in result.events] == [
+        ('birthday', 'family'),
+        ('standup', 'work'),
+        ('dinner', 'family'),
+        ('review', 'work'),
+    ]
+    assert result.total == 4
+    assert result.error_message is None
+    assert mirrored_events == ['work', 'family']
+
+
+def test_reports_failed_calendars_alongside_partial_results(mirrored_events: list[str]) -> None:
+    result = list_across('work', 'cancelled_trip')
+
+    assert [e.summary for e in result.events] == ['standup', 'review']
+    assert result.total == 2
+    assert result.error_message == 'Could not list events of calendar cancelled_trip: Not Found'
+
+
+def test_keeps_only_the_first_loaded_events(mirrored_events: list[str]) -> None:
+    with patch('secretary.agents.calendar_agent.MAX_LOADED_EVENTS', 3):
+        result = list_across('work', 'family')
+
+    assert [e.summary for e in result.events] == ['birthday', 'standup', 'dinner']
+    assert result.total == 4
+
+
+def test_resolves_primary_alias_to_the_primary_calendar() -> None:
+    queried: list[str] = []
+
+    async def list_calendars_async(user_id: str) -> list[dict[str, Any]]:
+        return [{'id': 'me@example.com', 'summary': 'Personal', 'primary': True}, {'id': 'work', 'summary': 'Work'}]
+
+    class FakeMirror:
+        def __init__(self, user_id: str) -> None:
+            pass
+
+        def query_events(self, calendar_id: str, *args: Any) -> MirroredEvents:
+            queried.append(calendar_id)
+            events = MIRRORED.get(calendar_id, [make_event('gym', '2025-06-02T07:00:00-04:00', '2025-06-02T08:00:00-04:00')])
+            return MirroredEvents(events=events, total=len(events))
+
+    with (
+        patch('secretary.calendar_mirror.list_calendars_async', list_calendars_async),
+        patch('secretary.calendar_mirror.CalendarMirror', FakeMirror),
+    ):
+        result = list_across('primary', 'work')
+
+    assert sorted(queried) == ['me@example.com', 'work']
+    assert [(e.summary, e.calendar_id) for e in result.events] == [
+        ('gym', 'primary'),
+        ('standup', 'work'),
+        ('review', 'work'),
+    ]
+
+
+###################################################################################################
+
+
+def test_create_events_reports_each_event(google: FakeGoogle) -> None:
+    google.respond = lambda request: not_found() if request.kwargs['body']['summary'] == 'Flight' else {'id': 'new'}
+
+    report = invoke(
+        calendar_agent.create_events,
+        calendar_id='cal',
+        events=[
+            {'summary': 'Lunch', 'start': '2025-06-02T12:00:00-04:00', 'end': '2025-06-02T13:00:00-04:00'},
+            {'summary': 'Flight', 'start': '2025-06-03T08:00:00-04:00', 'end': '2025-06-03T11:00:00-04:00'},
+        ],
+    )
+
+    assert report.splitlines() == [
+        'Created 1 of 2 events.',
+        'item | result',
+        'Lunch (2025-06-02T12:00:00-04:00) | ok',
+        'Flight (2025-06-03T08:00:00-04:00) | failed: Not Found',
+    ]
+    assert [[request.method for request in batch] for batch in google.batches] == [['insert', 'insert']]
+
+
+def test_update_events_refuses_repeated_event_ids(google: FakeGoogle) -> None:
+    mirrored = {event['id']: {**event, 'etag': '"1"'} for event in MIRRORED['work']}
+
+    with patch('secretary.event_patch.get_mirrored_events', AsyncMock(return_value=mirrored)):
+        report = invoke(
+            calendar_agent.update_events,
+            calendar_id='cal',
+            updates=[
+                {'event_id': 'standup', 'summary': 'Daily standup'},
+                {'event_id': 'review', 'location': 'Room 2'},
+                {'event_id': 'standup', 'summary': 'Weekly standup'},
+            ],
+        )
+
+    assert report.splitlines() == [
+        'Updated 2 of 3 events.',
+        'item | result',
+        'standup | ok',
+        'review | ok',
+        'standup | failed: standup is listed more than once; combine its changes into one item',
+    ]
+    [patches] = google.batches
+    assert [(request.kwargs['eventId'], request.kwargs['body'].get('summary')) for request in patches] == [
+        ('standup', 'Daily standup'),
+        ('review', None),
+    ]
+
+
+def test_delete_events_reports_each_event(google: FakeGoogle) -> None:
+    google.respond = lambda request: not_found() if request.kwargs['eventId'] == 'gone' else ''
+
+    report = invoke(calendar_agent.delete_events, calendar_id='cal', event_ids=['standup', 'gone'])
+
+    assert report.splitlines() == [
+        'Deleted 1 of 2 events.',
+        'item | result',
+        'standup | ok',
+        'gone | failed: Not Found',
+    ]
@@ -46,11 +46,9 @@ def mock_all_tools(monkeypatch: pytest.MonkeyPatch) -> None:
 
 
 @pytest.fixture(autouse=True)
-def mock_calendar_service() -> None:
-    with patch('secretary.agents.gmail_agent.get_calendar_service') as mock_func:
-        mock_func.return_value.settings.return_value.get.return_value.execute.return_value = {
-            'value': TEST_TZ,
-        }
+def mock_user_timezone() -> None:
+    with patch('secretary.agents.gmail_agent.get_user_timezone') as mock_func:
+        mock_func.return_value = TEST_TZ
         yield mock_func
 
 
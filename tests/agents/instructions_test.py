@@ -0,0 +1,25 @@
+from secretary.agents.instructions import assemble_instructions
+
+
+def test_volatile_sections_follow_static_prefix() -> None:
+    static = '# Instructions\n\nDo things.\n'
+
+    first = assemble_instructions(static, {'Current Time': '2025-01-01T09:00:00-05:00'})
+    second = assemble_instructions(static, {'Current Time': '2025-01-01T09:05:00-05:00'})
+
+    prefix = '# Instructions\n\nDo things.\n\n'
+    assert first.startswith(prefix)
+    assert second.startswith(prefix)
+    assert first == prefix + '# Current Time\n\n2025-01-01T09:00:00-05:00\n\n'
+
+
+def test_volatile_sections_keep_order() -> None:
+    prompt = assemble_instructions(
+        'static',
+        {
+            'Available Calendars': '- Personal',
+            'Current Time': 'now',
+        },
+    )
+
+    assert prompt.index('# Available Calendars') < prompt.index('# Current Time')
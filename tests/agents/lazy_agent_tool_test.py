@@ -0,0 +1,36 @@
+from unittest.mock import Mock
+
+from agents import FunctionTool
+
+from secretary.agents.lazy_agent_tool import lazy_agent_tool
+from tests.conftest import NoopAgent
+
+
+def test_matches_as_tool_schema() -> None:
+    eager_tool = NoopAgent().as_tool(
+        tool_name='noop',
+        tool_description='Does nothing.',
+    )
+    lazy_tool = lazy_agent_tool(
+        NoopAgent,
+        tool_name='noop',
+        tool_description='Does nothing.',
+    )
+
+    assert isinstance(eager_tool, FunctionTool)
+    assert isinstance(lazy_tool, FunctionTool)
+    assert lazy_tool.name == eager_tool.name
+    assert lazy_tool.description == eager_tool.description
+    assert lazy_tool.params_json_schema == eager_tool.params_json_schema
+
+
+def test_does_not_build_agent_until_invoked() -> None:
+    make_agent = Mock(side_effect=NoopAgent)
+
+    lazy_agent_tool(
+        make_agent,
+        tool_name='noop',
+        tool_description='Does nothing.',
+    )
+
+    make_agent.assert_not_called()
@@ -0,0 +1,77 @@
+import asyncio
+from typing import Any
+from unittest.mock import AsyncMock
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import httpx
+import openai
+
+from secretary.agents.model_router import ModelRouter
+from secretary.agents.model_router import RoutedModel
+
+
+def test_candidates_prefer_agent_override_then_task_class() -> None:
+    router = ModelRouter()
+
+    with patch('secretary.agents.model_router.cfg') as cfg:
+        routing = cfg.return_value.model_routing
+        routing.default_model = 'gpt-4.1'
+        routing.task_classes = {'tool_agent': 'gpt-4.1-mini'}
+        routing.agents = {'TodoAgent': 'gpt-4.1-nano'}
+        routing.fallback_models = ['gpt-4.1', 'gpt-4.1-mini']
+
+        assert router.candidates('TodoAgent', 'tool_agent') == ['gpt-4.1-nano', 'gpt-4.1', 'gpt-4.1-mini']
+        assert router.candidates('CalendarAgent', 'tool_agent') == ['gpt-4.1-mini', 'gpt-4.1']
+        assert router.candidates('SecretaryAgent', 'conversation') == ['gpt-4.1', 'gpt-4.1-mini']
+
+
+def test_failing_and_slow_models_move_behind_fallbacks() -> None:
+    router = ModelRouter()
+
+    with patch('secretary.agents.model_router.cfg') as cfg:
+        routing = cfg.return_value.model_routing
+        routing.default_model = 'gpt-4.1'
+        routing.task_classes = {}
+        routing.agents = {}
+        routing.fallback_models = ['gpt-4.1-mini', 'gpt-4o-mini']
+        routing.max_consecutive_errors = 2
+        routing.error_cooldown_seconds = 60
+        routing.max_latency_seconds = 5
+
+        router.record_error('gpt-4.1')
+        assert router.candidates('SecretaryAgent', 'conversation')[0] == 'gpt-4.1'
+
+        router.record_error('gpt-4.1')
+        router.record_success('gpt-4.1-mini', 30)
+        assert router.candidates('SecretaryAgent', 'conversation') == ['gpt-4o-mini', 'gpt-4.1', 'gpt-4.1-mini']
+
+        routing.error_cooldown_seconds = 0
+        assert router.candidates('SecretaryAgent', 'conversation') == ['gpt-4.1', 'gpt-4.1-mini', 'gpt-4o-mini']
+
+
+def test_get_response_falls_back_on_rate_limit() -> None:
+    router = Mock(spec=ModelRouter)
+    router.candidates.return_value = ['gpt-4.1', 'gpt-4.1-mini']
+
+    rate_limited = openai.RateLimitError(
+        'rate limited',
+        response=httpx.Response(429, request=httpx.Request('POST', 'https://api.openai.com')),
+        body=None,
+    )
+    models = {
+        'gpt-4.1': Mock(get_response=AsyncMock(side_effect=rate_limited)),
+        'gpt-4.1-mini': Mock(get_response=AsyncMock(return_value='response')),
+    }
+
+    args: list[Any] = [None, 'hi', None, [], None, [], None]
+    with patch('secretary.agents.model_router._provider.get_model', side_effect=models.__getitem__):
+        response = asyncio.run(
+            RoutedModel('SecretaryAgent', 'conversation', router).get_response(
+                *args, previous_response_id=None, prompt=None,
+            )
+        )
+
+    assert response == 'response'
+    router.record_error.assert_called_once_with('gpt-4.1')
+    assert router.record_success.call_args.args[0] == 'gpt-4.1-mini'
@@ -0,0 +1,244 @@
+import asyncio
+import json
+from types import SimpleNamespace
+from typing import Any
+from typing import Iterator
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+from unittest.mock import Mock
+from unittest.mock import patch
+
+import httplib2
+import pytest
+from agents import FunctionTool
+from googleapiclient.errors import HttpError
+
+from secretary.agents import todo_agent
+from secretary.agents.base import UserContext
+from secretary.calendar_mirror import MirroredEvents
+from tests.tool_output_test import WordEncoding
+
+
+TEST_TZ = 'America/New_York'
+
+
+def todo_event(todo_id: str, summary: str, due_date: str) -> dict[str, Any]:
+    return {
+        'id': todo_id,
+        'etag': '"1"',
+        'summary': f'📝 {summary}',
+        'start': {'date': due_date},
+        'end': {'date': due_date},
+        'transparency': 'transparent',
+        'extendedProperties': {'shared': {'sb_type': 'todo', 'sb_is_resolved': 'False'}},
+    }
+
+
+MIRRORED = [
+    todo_event('taxes', 'File taxes', '2025-06-02'),
+    todo_event('plants', 'Water plants', '2025-06-03'),
+    todo_event('dentist', 'Book dentist', '2025-06-04'),
+]
+
+
+def ctx() -> Mock:
+    return Mock(context=UserContext(user_id='user1', todo_calendar_id='todos'))
+
+
+def invoke(tool: FunctionTool, **kwargs: Any) -> Any:
+    return asyncio.run(tool.on_invoke_tool(ctx(), json.dumps(kwargs)))
+
+
+def not_found() -> HttpError:
+    return HttpError(httplib2.Response({'status': 404}), b'{"error": {"message": "Not Found"}}')
+
+
+class FakeGoogle:
+    """
+    Calendar service whose requests record their method and arguments, and batch execution that
+    answers each request, or fails it if its event id is in missing.
+    """
+
+    def __init__(self) -> None:
+        self.batches: list[list[SimpleNamespace]] = []
+        self.missing: set[str] = set()
+        self.calsvc = MagicMock()
+        for method in ['insert', 'get', 'patch', 'delete']:
+            getattr(self.calsvc.events.return_value, method).side_effect = (
+                lambda method=method, **kwargs: SimpleNamespace(method=method, kwargs=kwargs, headers={})
+            )
+
+    async def execute_batch_async(self, calsvc: Any, requests: list[SimpleNamespace]) -> list[Any]:
+        if requests:
+            self.batches.append(requests)
+        return [not_found() if request.kwargs.get('eventId') in self.missing else {'etag': '"2"'} for request in requests]
+
+
+@pytest.fixture(autouse=True)
+def mock_tool_dependencies() -> Iterator[None]:
+    async def get_user_timezone_async(user_id: str) -> str:
+        return TEST_TZ
+
+    with (
+        patch('secretary.agents.todo_agent.get_user_timezone_async', get_user_timezone_async),
+        # Tool results are rendered for tracing
+        patch('secretary.tool_output.get_encoding', return_value=WordEncoding()),
+    ):
+        yield
+
+
+@pytest.fixture
+def google() -> Iterator[FakeGoogle]:
+    fake = FakeGoogle()
+    mirrored = {event['id']: event for event in MIRRORED}
+
+    async def get_mirrored_events(user_id: str, calendar_id: str, event_ids: list[str]) -> dict[str, Any]:
+        return {event_id: mirrored[event_id] for event_id in event_ids if event_id in mirrored}
+
+    with (
+        patch('secretary.agents.todo_agent.get_calendar_service', return_value=fake.calsvc),
+        patch('secretary.agents.todo_agent.execute_batch_async', fake.execute_batch_async),
+        patch('secretary.agents.todo_agent.mark_calendar_changed', new_callable=AsyncMock),
+        patch('secretary.agents.todo_agent.lookup_address', AsyncMock(return_value=None)),
+        patch('secretary.event_patch.get_calendar_service', return_value=fake.calsvc),
+        patch('secretary.event_patch.execute_batch_async', fake.execute_batch_async),
+        patch('secretary.event_patch.mark_calendar_changed', new_callable=AsyncMock),
+        patch('secretary.event_patch.get_mirrored_events', get_mirrored_events),
+    ):
+        yield fake
+
+
+@pytest.fixture
+def mirrored_todos() -> Iterator[list[tuple[Any, ...]]]:
+    queries: list[tuple[Any, ...]] = []
+
+    async def list_mirrored_events(*args: Any, limit: int, **kwargs: Any) -> MirroredEvents:
+        queries.append(('range', *args, limit, kwargs))
+        return MirroredEvents(events=MIRRORED[:limit], total=len(MIRRORED))
+
+    async def list_mirrored_overdue_todos(*args: Any, limit: int) -> MirroredEvents:
+        queries.append(('overdue', *args, limit))
+        return MirroredEvents(events=MIRRORED[:1], total=1)
+
+    with (
+        patch('secretary.agents.todo_agent.list_mirrored_events', list_mirrored_events),
+        patch('secretary.agents.todo_agent.list_mirrored_overdue_todos', list_mirrored_overdue_todos),
+    ):
+        yield queries
+
+
+###################################################################################################
+
+
+def test_select_open_todos_by_ids(mirrored_todos: list[tuple[Any, ...]]) -> None:
+    selected = asyncio.run(todo_agent.select_open_todos(ctx(), ['taxes', 'plants'], None, None, False))
+
+    assert selected == (['taxes', 'plants'], ['taxes', 'plants'], 2)
+    assert mirrored_todos == []
+
+
+def test_select_open_todos_by_due_date_range(mirrored_todos: list[tuple[Any, ...]]) -> None:
+    ids, labels, total = asyncio.run(todo_agent.select_open_todos(ctx(), None, '2025-06-01', '2025-06-07', False))
+
+    assert ids == ['taxes', 'plants', 'dentist']
+    assert labels[0] == 'taxes 📝 File taxes (2025-06-02)'
+    assert total == 3
+    assert mirrored_todos == [
+        (
+            'range',
+            'user1',
+            'todos',
+            '2025-06-01T00:00:00-04:00',
+            '2025-06-07T23:59:59.999999-04:00',
+            todo_agent.MAX_BULK_TODOS,
+            {'todos': True, 'resolved': False},
+        ),
+    ]
+
+
+def test_select_open_todos_overdue(mirrored_todos: list[tuple[Any, ...]]) -> None:
+    ids, _, total = asyncio.run(todo_agent.select_open_todos(ctx(), None, None, None, True))
+
+    assert (ids, total) == (['taxes'], 1)
+    assert mirrored_todos[0][0] == 'overdue'
+    assert mirrored_todos[0][-1] == todo_agent.MAX_BULK_TODOS
+
+
+def test_select_open_todos_needs_a_selection(mirrored_todos: list[tuple[Any, ...]]) -> None:
+    with pytest.raises(ValueError, match='Supply todo_ids'):
+        asyncio.run(todo_agent.select_open_todos(ctx(), None, '2025-06-01', None, False))
+
+
+def test_resolve_todos_stops_at_max_bulk_todos(google: FakeGoogle, mirrored_todos: list[tuple[Any, ...]]) -> None:
+    with patch('secretary.agents.todo_agent.MAX_BULK_TODOS', 2):
+        report = invoke(todo_agent.resolve_todos, due_date_min='2025-06-01', due_date_max='2025-06-07')
+
+    assert report.splitlines() == [
+        'Resolved 2 of 2 todos.',
+        'item | result',
+        'taxes 📝 File taxes (2025-06-02) | ok',
+        'plants 📝 Water plants (2025-06-03) | ok',
+        '1 more todos matched; call again to continue.',
+    ]
+    [patches] = google.batches
+    assert [request.kwargs['eventId'] for request in patches] == ['taxes', 'plants']
+
+
+def test_reschedule_todos_reports_each_todo(google: FakeGoogle) -> None:
+    google.missing = {'gone'}
+
+    report = invoke(todo_agent.reschedule_todos, new_due_date='2025-06-09', todo_ids=['taxes', 'gone'])
+
+    assert report.splitlines() == [
+        'Rescheduled 1 of 2 todos.',
+        'item | result',
+        'taxes | ok',
+        'gone | failed: Not Found',
+    ]
+    patch_request = google.batches[-1][0]
+    assert patch_request.kwargs['body']['start'] == {'date': '2025-06-09'}
+
+
+def test_update_todos_refuses_repeated_todo_ids(google: FakeGoogle) -> None:
+    report = invoke(
+        todo_agent.update_todos,
+        updates=[
+            {'todo_id': 'taxes', 'due_date': '2025-06-09'},
+            {'todo_id': 'plants', 'summary': 'Water the plants'},
+            {'todo_id': 'taxes', 'due_date': '2025-06-10'},
+        ],
+    )
+
+    assert report.splitlines() == [
+        'Updated 2 of 3 todos.',
+        'item | result',
+        'taxes | ok',
+        'plants | ok',
+        'taxes | failed: taxes is listed more than once; combine its changes into one item',
+    ]
+    [patches] = google.batches
+    assert patches[0].kwargs['body']['start'] == {'date': '2025-06-09'}
+    assert patches[1].kwargs['body']['summary'] == '📝 Water the plants'
+
+
+def test_create_and_delete_todos_report_each_todo(google: FakeGoogle) -> None:
+    report = invoke(
+        todo_agent.create_todos,
+        todos=[{'summary': 'Call mom', 'due_date': '2025-06-05'}, {'summary': 'Pay rent', 'due_date': '2025-07-01'}],
+    )
+    assert report.splitlines() == [
+        'Created 2 of 2 todos.',
+        'item | result',
+        'Call mom (2025-06-05) | ok',
+        'Pay rent (2025-07-01) | ok',
+    ]
+    assert [request.kwargs['calendarId'] for request in google.batches[0]] == ['todos', 'todos']
+
+    google.missing = {'gone'}
+    report = invoke(todo_agent.delete_todos, todo_ids=['taxes', 'gone'])
+    assert report.splitlines() == [
+        'Deleted 1 of 2 todos.',
+        'item | result',
+        'taxes | ok',
+        'gone | failed: Not Found',
+    ]
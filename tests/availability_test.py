@@ -0,0 +1,57 @@
+import asyncio
+from datetime import timedelta
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import arrow
+
+from secretary.availability import free_slots
+from secretary.availability import merge_intervals
+from secretary.availability import query_busy
+
+
+def at(time: str) -> arrow.Arrow:
+    return arrow.get(f'2025-06-05T{time}:00-07:00')
+
+
+def test_merge_intervals() -> None:
+    merged = merge_intervals([
+        (at('13:00'), at('14:00')),
+        (at('09:00'), at('10:00')),
+        (at('09:30'), at('11:00')),
+        (at('11:00'), at('11:30')),
+    ])
+
+    assert merged == [(at('09:00'), at('11:30')), (at('13:00'), at('14:00'))]
+
+
+def test_free_slots_respect_min_length_and_window() -> None:
+    busy = [(at('08:00'), at('12:15')), (at('12:30'), at('13:00')), (at('16:00'), at('18:00'))]
+
+    slots = free_slots(busy, at('12:00'), at('17:00'), timedelta(minutes=30))
+
+    assert slots == [(at('13:00'), at('16:00'))]
+    assert free_slots([], at('12:00'), at('13:00'), timedelta(minutes=30)) == [(at('12:00'), at('13:00'))]
+
+
+def test_query_busy_merges_calendars_and_reports_errors() -> None:
+    calsvc = MagicMock()
+    resp = {
+        'calendars': {
+            'primary': {'busy': [{'start': '2025-06-05T16:00:00Z', 'end': '2025-06-05T17:00:00Z'}]},
+            'work': {'busy': [{'start': '2025-06-05T16:30:00Z', 'end': '2025-06-05T18:00:00Z'}]},
+            'gone': {'errors': [{'domain': 'global', 'reason': 'notFound'}], 'busy': []},
+        },
+    }
+
+    with patch('secretary.availability.execute_async', return_value=resp) as execute_async:
+        busy, errors = asyncio.run(
+            query_busy(calsvc, ['primary', 'work', 'gone'], '2025-06-05T12:00:00-07:00', '2025-06-05T17:00:00-07:00')
+        )
+
+    assert busy == [(arrow.get('2025-06-05T16:00:00Z'), arrow.get('2025-06-05T18:00:00Z'))]
+    assert errors == {'gone': 'notFound'}
+    assert execute_async.call_count == 1
+    assert calsvc.freebusy.return_value.query.call_args.kwargs['body']['items'] == [
+        {'id': 'primary'}, {'id': 'work'}, {'id': 'gone'},
+    ]
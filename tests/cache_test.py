@@ -0,0 +1,67 @@
+from unittest.mock import patch
+
+from secretary.cache import TTLCache
+
+
+def test_get_and_set() -> None:
+    cache: TTLCache[str, int] = TTLCache(ttl_seconds=60)
+
+    assert cache.get('a') is None
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+
+def test_entries_expire() -> None:
+    cache: TTLCache[str, int] = TTLCache(ttl_seconds=60)
+
+    with patch('secretary.cache.time.monotonic', return_value=1000.0):
+        cache.set('a', 1)
+
+    with patch('secretary.cache.time.monotonic', return_value=1059.0):
+        assert cache.get('a') == 1
+
+    with patch('secretary.cache.time.monotonic', return_value=1061.0):
+        assert cache.get('a') is None
+        assert len(cache) == 0
+
+
+def test_evicts_least_recently_used() -> None:
+    cache: TTLCache[str, int] = TTLCache(ttl_seconds=60, max_size=2)
+
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    assert cache.get('c') == 3
+
+
+def test_get_or_set() -> None:
+    cache: TTLCache[str, list[int]] = TTLCache(ttl_seconds=60)
+    calls = []
+
+    def factory() -> list[int]:
+        calls.append(1)
+        return [len(calls)]
+
+    assert cache.get_or_set('a', factory) == [1]
+    assert cache.get_or_set('a', factory) == [1]
+    assert len(calls) == 1
+
+
+def test_invalidate_where() -> None:
+    cache: TTLCache[tuple[str, str], int] = TTLCache(ttl_seconds=60)
+    cache.set(('user1', 'x'), 1)
+    cache.set(('user1', 'y'), 2)
+    cache.set(('user2', 'x'), 3)
+
+    cache.invalidate_where(lambda key: key[0] == 'user1')
+
+    assert cache.get(('user1', 'x')) is None
+    assert cache.get(('user1', 'y')) is None
+    assert cache.get(('user2', 'x')) == 3
@@ -0,0 +1,66 @@
+import asyncio
+import threading
+from typing import Iterator
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from secretary.calendar_metadata import CalendarMetadataCache
+from secretary.calendar_metadata import get_user_timezone_async
+
+
+@pytest.fixture
+def calsvc() -> Iterator[MagicMock]:
+    with patch('secretary.calendar_metadata.get_calendar_service') as mock_func:
+        request = mock_func.return_value.settings.return_value.get.return_value
+        request.headers = {}
+        request.execute.return_value = {'value': 'America/New_York', 'etag': '"tz-etag"'}
+        yield mock_func.return_value
+
+
+def test_serves_fresh_entries_from_cache(calsvc: MagicMock) -> None:
+    cache = CalendarMetadataCache(ttl_seconds=60)
+
+    assert cache.get_timezone('user1') == 'America/New_York'
+    assert cache.get_timezone('user1') == 'America/New_York'
+
+    assert calsvc.settings.return_value.get.return_value.execute.call_count == 1
+    assert cache.stats() == {'hits': 1, 'misses': 1, 'revalidations': 0}
+
+
+def test_revalidates_stale_entries_with_etag(calsvc: MagicMock) -> None:
+    cache = CalendarMetadataCache(ttl_seconds=0)
+    request = calsvc.settings.return_value.get.return_value
+
+    assert cache.get_timezone('user1') == 'America/New_York'
+
+    request.execute.side_effect = HttpError(httplib2.Response({'status': 304}), b'')
+    assert cache.get_timezone('user1') == 'America/New_York'
+
+    assert request.headers['If-None-Match'] == '"tz-etag"'
+    assert cache.stats() == {'hits': 0, 'misses': 1, 'revalidations': 1}
+
+
+def test_invalidate(calsvc: MagicMock) -> None:
+    cache = CalendarMetadataCache(ttl_seconds=60)
+
+    cache.get_timezone('user1')
+    cache.invalidate('user1')
+    cache.get_timezone('user1')
+
+    assert calsvc.settings.return_value.get.return_value.execute.call_count == 2
+
+
+def test_async_lookup_runs_off_the_event_loop(calsvc: MagicMock) -> None:
+    threads = []
+    calsvc.settings.return_value.get.return_value.execute.side_effect = lambda: (
+        threads.append(threading.get_ident()) or {'value': 'Europe/Paris', 'etag': '"tz-etag"'}
+    )
+
+    with patch('secretary.calendar_metadata.calendar_metadata_cache', CalendarMetadataCache(ttl_seconds=60)):
+        assert asyncio.run(get_user_timezone_async('user1')) == 'Europe/Paris'
+
+    assert threads and threads[0] != threading.get_ident()
@@ -0,0 +1,323 @@
+import os
+import stat
+from contextlib import suppress
+from typing import Any
+from typing import Callable
+from typing import Iterator
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from secretary.calendar_mirror import SYNC_FIELDS
+from secretary.calendar_mirror import CalendarMirror
+
+
+def make_event(event_id: str, start: str, end: str, **kwargs: Any) -> dict[str, Any]:
+    key = 'dateTime' if 'T' in start else 'date'
+    return {'id': event_id, 'start': {key: start}, 'end': {key: end}, **kwargs}
+
+
+TODO = {'extendedProperties': {'shared': {'sb_type': 'todo'}}}
+
+
+class FakeEventsApi:
+    """
+    Serves events.list responses from a queue and records the parameters of each request. A
+    callable in the queue is called to produce the response, e.g. to interleave other work.
+    """
+
+    def __init__(self) -> None:
+        self.responses: list[dict[str, Any] | Exception | Callable[[], dict[str, Any]]] = []
+        self.requests: list[dict[str, Any]] = []
+
+    def list(self, **kwargs: Any) -> dict[str, Any]:
+        return kwargs
+
+    def execute(self, request: dict[str, Any]) -> dict[str, Any]:
+        self.requests += [request]
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response() if callable(response) else response
+
+
+@pytest.fixture
+def events_api() -> Iterator[FakeEventsApi]:
+    api = FakeEventsApi()
+    calsvc = MagicMock()
+    calsvc.events.return_value = api
+
+    with (
+        patch('secretary.calendar_mirror.get_calendar_service', return_value=calsvc),
+        patch('secretary.calendar_mirror.execute', side_effect=api.execute),
+    ):
+        yield api
+
+
+@pytest.fixture
+def mirror(tmp_path: Any) -> CalendarMirror:
+    return CalendarMirror('user1', directory=str(tmp_path), max_staleness_seconds=60)
+
+
+def test_full_sync_then_local_reads(events_api: FakeEventsApi, mirror: CalendarMirror) -> None:
+    events_api.responses = [
+        {
+            'timeZone': 'America/New_York',
+            'items': [make_event('a', '2025-06-02T09:00:00-04:00', '2025-06-02T10:00:00-04:00')],
+            'nextPageToken': 'page2',
+        },
+        {
+            'timeZone': 'America/New_York',
+            'items': [
+                make_event('todo', '2025-06-03', '2025-06-03', **TODO),
+                make_event('b', '2025-06-05T09:00:00-04:00', '2025-06-05T10:00:00-04:00'),
+            ],
+            'nextSyncToken': 'token1',
+        },
+    ]
+
+    events = mirror.query_events('cal', '2025-06-01T00:00:00-04:00', '2025-06-04T00:00:00-04:00', todos=False).events
+    todos = mirror.query_events('cal', '2025-06-03T00:00:00-04:00', '2025-06-04T00:00:00-04:00', todos=True).events
+
+    assert [e['id'] for e in events] == ['a']
+    assert [e['id'] for e in todos] == ['todo']
+    assert len(events_api.requests) == 2
+    assert events_api.requests[1]['pageToken'] == 'page2'
+    assert events_api.requests[0]['syncToken'] is None
+    assert events_api.requests[0]['fields'] == SYNC_FIELDS
+
+
+def test_stale_mirror_syncs_incrementally(events_api: FakeEventsApi, mirror: CalendarMirror) -> None:
+    events_api.responses = [
+        {
+            'items': [
+                make_event('a', '2025-06-02T09:00:00Z', '2025-06-02T10:00:00Z'),
+                make_event('b', '2025-06-02T11:00:00Z', '2025-06-02T12:00:00Z'),
+            ],
+            'nextSyncToken': 'token1',
+        },
+        {
+            'items': [
+                {'id': 'a', 'status': 'cancelled'},
+                make_event('c', '2025-06-02T13:00:00Z', '2025-06-02T14:00:00Z'),
+            ],
+            'nextSyncToken': 'token2',
+        },
+    ]
+
+    mirror.query_events('cal', '2025-06-02T00:00:00Z', '2025-06-03T00:00:00Z')
+    mirror.mark_stale('cal')
+    events = mirror.query_events('cal', '2025-06-02T00:00:00Z', '2025-06-03T00:00:00Z').events
+
+    assert [e['id'] for e in events] == ['b', 'c']
+    assert events_api.requests[1]['syncToken'] == 'token1'
+
+
+def test_expired_sync_token_triggers_full_sync(events_api: FakeEventsApi, mirror: CalendarMirror) -> None:
+    events_api.responses = [
+        {'items': [make_event('a', '2025-06-02T09:00:00Z', '2025-06-02T10:00:00Z')], 'nextSyncToken': 'token1'},
+        HttpError(httplib2.Response({'status': 410}), b''),
+        {'items': [make_event('b', '2025-06-02T11:00:00Z', '2025-06-02T12:00:00Z')], 'nextSyncToken': 'token2'},
+    ]
+
+    mirror.sync('cal')
+    mirror.sync('cal')
+
+    assert [e['id'] for e in mirror.query_events('cal', '2025-06-02T00:00:00Z', '2025-06-03T00:00:00Z').events] == ['b']
+    assert events_api.requests[2]['syncToken'] is None
+
+
+def test_limit_loads_first_events_and_counts_all(events_api: FakeEventsApi, mirror: CalendarMirror) -> None:
+    events_api.responses = [
+        {
+            'items': [make_event(f'e{hour}', f'2025-06-02T{hour:02}:00:00Z', f'2025-06-02T{hour:02}:30:00Z') for hour in range(10)],
+            'nextSyncToken': 'token1',
+        },
+    ]
+
+    result = mirror.query_events('cal', '2025-06-02T00:00:00Z', '2025-06-03T00:00:00Z', limit=3)
+
+    assert [e['id'] for e in result.events] == ['e0', 'e1', 'e2']
+    assert result.total == 10
+
+
+def test_recurring_masters_come_from_unexpanded_stream(events_api: FakeEventsApi, mirror: CalendarMirror) -> None:
+    events_api.responses = [
+        {
+            'items': [
+                make_event('weekly', '2025-06-02T09:00:00Z', '2025-06-02T10:00:00Z', recurrence=['RRULE:FREQ=WEEKLY']),
+                make_event('once', '2025-06-03T09:00:00Z', '2025-06-03T10:00:00Z'),
+                make_event(
+                    'ended',
+                    '2019-01-07T09:00:00Z',
+                    '2019-01-07T10:00:00Z',
+                    recurrence=['RRULE:FREQ=WEEKLY;UNTIL=20200101T000000Z'],
+                ),
+            ],
+            'nextSyncToken': 'token1',
+        },
+    ]
+
+    masters = mirror.query_recurring_masters('cal')
+
+    assert [e['id'] for e in masters] == ['weekly']
+
+
+def test_expands_recurring_events_locally(events_api: FakeEventsApi, mirror: CalendarMirror) -> None:
+    events_api.responses = [
+        {
+            'timeZone': 'America/New_York',
+            'items': [
+                make_event(
+                    'standup',
+                    '2025-06-02T09:00:00-04:00',
+                    '2025-06-02T09:15:00-04:00',
+                    recurrence=['RRULE:FREQ=DAILY;BYDAY=MO,TU,WE,TH,FR', 'EXDATE:20250604T130000Z'],
+                ),
+                # Thursday's standup moved to the afternoon, Friday's cancelled
+                make_event(
+                    'standup_20250605T130000Z',
+                    '2025-06-05T15:00:00-04:00',
+                    '2025-06-05T15:15:00-04:00',
+                    recurringEventId='standup',
+                    originalStartTime={'dateTime': '2025-06-05T09:00:00-04:00'},
+                ),
+                {
+                    'id': 'standup_20250606T130000Z',
+                    'status': 'cancelled',
+                    'recurringEventId': 'standup',
+                    'originalStartTime': {'dateTime': '2025-06-06T09:00:00-04:00'},
+                },
+                make_event('lunch', '2025-06-03T12:00:00-04:00', '2025-06-03T13:00:00-04:00'),
+            ],
+            'nextSyncToken': 'token1',
+        },
+    ]
+
+    result = mirror.query_events('cal', '2025-06-02T00:00:00-04:00', '2025-06-10T00:00:00-04:00')
+
+    assert [e['id'] for e in result.events] == [
+        'standup_20250602T130000Z',
+        'standup_20250603T130000Z',
+        'lunch',
+        'standup_20250605T130000Z',
+        'standup_20250609T130000Z',
+    ]
+    assert result.events[3]['start']['dateTime'] == '2025-06-05T15:00:00-04:00'
+    assert result.events[4]['recurringEventId'] == 'standup'
+    assert 'recurrence' not in result.events[4]
+    assert events_api.requests[0]['singleEvents'] is False
+
+    events_api.responses = [{'items': [{'id': 'standup', 'status': 'cancelled'}], 'nextSyncToken': 'token2'}]
+    mirror.mark_stale('cal')
+
+    result = mirror.query_events('cal', '2025-06-02T00:00:00-04:00', '2025-06-10T00:00:00-04:00')
+    assert [e['id'] for e in result.events] == ['lunch']
+
+
+def todo(is_resolved: bool, **kwargs: Any) -> dict[str, Any]:
+    return {'extendedProperties': {'shared': {'sb_type': 'todo', 'sb_is_resolved': str(is_resolved)}}, **kwargs}
+
+
+def test_mark_stale_during_sync_is_not_lost(events_api: FakeEventsApi, mirror: CalendarMirror) -> None:
+    def changed_while_fetching() -> dict[str, Any]:
+        # A mutation lands, and marks the mirror stale, after this fetch was answered
+        mirror.mark_stale('cal')
+        return {'items': [make_event('a', '2025-06-02T09:00:00Z', '2025-06-02T10:00:00Z')], 'nextSyncToken': 'token1'}
+
+    events_api.responses = [
+        changed_while_fetching,
+        {'items': [make_event('b', '2025-06-02T11:00:00Z', '2025-06-02T12:00:00Z')], 'nextSyncToken': 'token2'},
+    ]
+
+    def ids() -> list[str]:
+        return [e['id'] for e in mirror.query_events('cal', '2025-06-02T00:00:00Z', '2025-06-03T00:00:00Z').events]
+
+    assert ids() == ['a']
+    assert ids() == ['a', 'b']
+    assert events_api.requests[1]['syncToken'] == 'token1'
+    assert ids() == ['a', 'b']
+    assert len(events_api.requests) == 2
+
+
+def test_resolution_filters_and_overdue_todos(events_api: FakeEventsApi, mirror: CalendarMirror) -> None:
+    events_api.responses = [
+        {
+            'timeZone': 'America/New_York',
+            'items': [
+                make_event('ancient', '2019-03-01', '2019-03-01', **todo(False)),
+                make_event('done', '2025-06-02', '2025-06-02', **todo(True)),
+                make_event('open', '2025-06-03', '2025-06-03', **todo(False)),
+                make_event('future', '2025-06-20', '2025-06-20', **todo(False)),
+                make_event('meeting', '2025-06-02T09:00:00-04:00', '2025-06-02T10:00:00-04:00'),
+                make_event('plants', '2025-06-01', '2025-06-01', **todo(False, recurrence=['RRULE:FREQ=WEEKLY'])),
+                make_event(
+                    'plants_20250608',
+                    '2025-06-08',
+                    '2025-06-08',
+                    recurringEventId='plants',
+                    originalStartTime={'date': '2025-06-08'},
+                    **todo(True),
+                ),
+            ],
+            'nextSyncToken': 'token1',
+        },
+    ]
+
+    def ids(**kwargs: Any) -> list[str]:
+        return [e['id'] for e in mirror.query_events('cal', '2025-06-01T00:00:00-04:00', '2025-06-10T00:00:00-04:00', **kwargs).events]
+
+    assert ids(todos=True, resolved=False) == ['plants_20250601', 'open']
+    assert ids(todos=True, resolved=True) == ['done', 'plants_20250608']
+    assert ids(resolved=False) == ['plants_20250601', 'meeting', 'open']
+
+    overdue = mirror.query_overdue_todos('cal', '2025-06-10T00:00:00-04:00')
+    assert [e['id'] for e in overdue.events] == ['ancient', 'plants_20250601', 'open']
+    assert overdue.total == 3
+
+    assert [m['id'] for m in mirror.query_recurring_masters('cal', todos=True, resolved=False)] == ['plants']
+    assert mirror.query_recurring_masters('cal', todos=True, resolved=True) == []
+
+
+def test_overdue_todos_list_each_recurring_todo_once(events_api: FakeEventsApi, mirror: CalendarMirror) -> None:
+    events_api.responses = [
+        {
+            'timeZone': 'America/New_York',
+            'items': [
+                make_event('stretch', '2024-01-01', '2024-01-01', **todo(False, recurrence=['RRULE:FREQ=DAILY'])),
+                make_event(
+                    'stretch_20240101',
+                    '2024-01-01',
+                    '2024-01-01',
+                    recurringEventId='stretch',
+                    originalStartTime={'date': '2024-01-01'},
+                    **todo(True),
+                ),
+                make_event('open', '2025-06-03', '2025-06-03', **todo(False)),
+            ],
+            'nextSyncToken': 'token1',
+        },
+    ]
+
+    overdue = mirror.query_overdue_todos('cal', '2025-06-10T00:00:00-04:00')
+    assert [e['id'] for e in overdue.events] == ['stretch_20240102', 'open']
+    assert overdue.total == 2
+
+
+def test_mirror_is_private_and_survives_deletion_by_another_process(events_api: FakeEventsApi, mirror: CalendarMirror) -> None:
+    events_api.responses = [{'items': [make_event('a', '2025-06-02', '2025-06-03')], 'nextSyncToken': 'token1'}]
+    assert [e['id'] for e in mirror.query_events('cal', '2025-06-01T00:00:00Z', '2025-06-05T00:00:00Z').events] == ['a']
+
+    assert stat.S_IMODE(os.stat(mirror.directory).st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(mirror.path).st_mode) == 0o600
+
+    # What delete_mirror does in the web process, leaving this process' caches in place
+    for suffix in ['', '-wal', '-shm']:
+        with suppress(FileNotFoundError):
+            os.remove(mirror.path + suffix)
+
+    events_api.responses = [{'items': [make_event('b', '2025-06-02', '2025-06-03')], 'nextSyncToken': 'token1'}]
+    assert [e['id'] for e in mirror.query_events('cal', '2025-06-01T00:00:00Z', '2025-06-05T00:00:00Z').events] == ['b']
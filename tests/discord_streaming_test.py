@@ -0,0 +1,99 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+
+from agents import RawResponsesStreamEvent
+from agents import RunItemStreamEvent
+
+from secretary.discord_streaming import ProgressiveReply
+from secretary.discord_streaming import split_message
+
+
+def test_split_message_prefers_newlines() -> None:
+    text = 'a' * 1500 + '\n' + 'b' * 1500
+
+    assert split_message(text) == ['a' * 1500, 'b' * 1500]
+
+
+def test_split_message_hard_splits_long_words() -> None:
+    chunks = split_message('x' * 4500)
+
+    assert [len(chunk) for chunk in chunks] == [2000, 2000, 500]
+    assert split_message('') == ['']
+
+
+class FakeChannel:
+    def __init__(self) -> None:
+        self.sent: list[Any] = []
+
+    async def send(self, content: str) -> Any:
+        message = MagicMock(content=content)
+        message.edit = AsyncMock()
+        message.delete = AsyncMock()
+        self.sent += [message]
+        return message
+
+
+def text_delta(delta: str) -> RawResponsesStreamEvent:
+    return RawResponsesStreamEvent(data=SimpleNamespace(type='response.output_text.delta', delta=delta))  # type: ignore
+
+
+def tool_called(name: str) -> RunItemStreamEvent:
+    return RunItemStreamEvent(name='tool_called', item=SimpleNamespace(raw_item=SimpleNamespace(name=name)))  # type: ignore
+
+
+def test_progressive_reply_batches_edits() -> None:
+    channel = FakeChannel()
+
+    async def run() -> None:
+        reply = ProgressiveReply(channel, edit_interval_seconds=60)
+        await reply.start()
+
+        reply.handle_event(tool_called('read_and_manage_calendars'))
+        await asyncio.sleep(0)
+        for word in ['You ', 'are ', 'free ', 'tomorrow.']:
+            reply.handle_event(text_delta(word))
+            await asyncio.sleep(0)
+
+        await reply.finish('You are free tomorrow.')
+
+    asyncio.run(run())
+
+    placeholder = channel.sent[0]
+    assert placeholder.content == '…'
+    assert [call.kwargs['content'] for call in placeholder.edit.await_args_list] == [
+        '_Working on it: read and manage calendars…_',
+        'You are free tomorrow.',
+    ]
+
+
+def test_progressive_reply_spreads_long_output_over_messages() -> None:
+    channel = FakeChannel()
+
+    async def run() -> None:
+        reply = ProgressiveReply(channel)
+        await reply.start()
+        await reply.finish('a' * 1500 + '\n' + 'b' * 1500)
+
+    asyncio.run(run())
+
+    assert len(channel.sent) == 2
+    channel.sent[0].edit.assert_awaited_once_with(content='a' * 1500)
+    assert channel.sent[1].content == 'b' * 1500
+
+
+def test_progressive_reply_discard_removes_placeholder() -> None:
+    channel = FakeChannel()
+
+    async def run() -> None:
+        reply = ProgressiveReply(channel)
+        await reply.start()
+        await reply.discard()
+
+    asyncio.run(run())
+
+    [placeholder] = channel.sent
+    placeholder.delete.assert_awaited_once()
+    placeholder.edit.assert_not_awaited()
@@ -0,0 +1,197 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+from typing import Iterator
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from secretary.data_models.todo import Todo
+from secretary.event_patch import changed_fields
+from secretary.event_patch import patch_event
+from secretary.event_patch import patch_events
+
+
+def todo_event(etag: str, is_resolved: bool = False, todo_id: str = 'todo1') -> dict[str, Any]:
+    return {
+        'id': todo_id,
+        'etag': etag,
+        'summary': '📝 File taxes',
+        'start': {'date': '2025-06-02'},
+        'end': {'date': '2025-06-02'},
+        'transparency': 'transparent',
+        'description': 'Created',
+        'extendedProperties': {'shared': {'sb_type': 'todo', 'sb_is_resolved': str(is_resolved)}},
+    }
+
+
+async def resolve(event: dict[str, Any]) -> dict[str, Any]:
+    todo = Todo.from_todo_event(event)
+    if todo.is_resolved:
+        raise ValueError('This todo is already resolved.')
+    todo.resolve()
+    return todo.to_gcal_event()
+
+
+class FakeCalendar:
+    """Records get and patch requests; the responses to execute come from a queue."""
+
+    def __init__(self, responses: list[Any]) -> None:
+        self.responses = responses
+        self.requests: list[SimpleNamespace] = []
+        self.calsvc = MagicMock()
+        self.calsvc.events.return_value.get.side_effect = lambda **kwargs: SimpleNamespace(method='get', kwargs=kwargs)
+        self.calsvc.events.return_value.patch.side_effect = (
+            lambda **kwargs: SimpleNamespace(method='patch', kwargs=kwargs, headers={})
+        )
+
+    async def execute_async(self, request: SimpleNamespace) -> Any:
+        self.requests += [request]
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+@pytest.fixture
+def mirrored() -> Iterator[AsyncMock]:
+    with patch('secretary.event_patch.get_mirrored_events', new_callable=AsyncMock) as get_mirrored_events:
+        yield get_mirrored_events
+
+
+def run_patch(calendar: FakeCalendar, update: Any) -> None:
+    with (
+        patch('secretary.event_patch.get_calendar_service', return_value=calendar.calsvc),
+        patch('secretary.event_patch.execute_async', side_effect=calendar.execute_async),
+        patch('secretary.event_patch.mark_calendar_changed', new_callable=AsyncMock),
+    ):
+        asyncio.run(patch_event('user1', 'cal', 'todo1', update))
+
+
+def conflict() -> HttpError:
+    return HttpError(httplib2.Response({'status': 412}), b'Precondition Failed')
+
+
+def test_changed_fields() -> None:
+    current = {'summary': 'a', 'start': {'date': '2025-06-02'}, 'etag': '"1"'}
+
+    assert changed_fields(current, {'summary': 'a', 'start': {'date': '2025-06-03'}, 'location': 'Home'}) == {
+        'start': {'date': '2025-06-03'},
+        'location': 'Home',
+    }
+
+
+def test_patches_changed_fields_from_mirror_in_one_round_trip(mirrored: AsyncMock) -> None:
+    mirrored.return_value = {'todo1': todo_event('"1"')}
+    calendar = FakeCalendar([{'etag': '"2"'}])
+
+    run_patch(calendar, resolve)
+
+    [request] = calendar.requests
+    assert request.method == 'patch'
+    assert request.headers == {'If-Match': '"1"'}
+    assert request.kwargs['body'] == {
+        'summary': '✅ File taxes',
+        'extendedProperties': {'shared': {'sb_type': 'todo', 'sb_is_resolved': 'True'}},
+    }
+
+
+def test_conflict_refetches_and_retries(mirrored: AsyncMock) -> None:
+    mirrored.return_value = {'todo1': todo_event('"1"')}
+    calendar = FakeCalendar([conflict(), todo_event('"2"'), {'etag': '"3"'}])
+
+    run_patch(calendar, resolve)
+
+    assert [request.method for request in calendar.requests] == ['patch', 'get', 'patch']
+    assert calendar.requests[2].headers == {'If-Match': '"2"'}
+
+
+def test_refusal_from_stale_mirror_is_rechecked(mirrored: AsyncMock) -> None:
+    mirrored.return_value = {'todo1': todo_event('"1"', is_resolved=True)}
+    calendar = FakeCalendar([todo_event('"2"'), {'etag': '"3"'}])
+
+    run_patch(calendar, resolve)
+    assert [request.method for request in calendar.requests] == ['get', 'patch']
+
+    calendar = FakeCalendar([todo_event('"2"', is_resolved=True)])
+    with pytest.raises(ValueError, match='already resolved'):
+        run_patch(calendar, resolve)
+
+
+def test_non_todo_event_is_refused_without_patching(mirrored: AsyncMock) -> None:
+    meeting = {
+        'id': 'todo1',
+        'etag': '"1"',
+        'summary': 'Offsite',
+        'start': {'dateTime': '2025-06-02T09:00:00-07:00'},
+        'end': {'dateTime': '2025-06-02T17:00:00-07:00'},
+    }
+    mirrored.return_value = {'todo1': meeting}
+    calendar = FakeCalendar([{**meeting, 'etag': '"2"'}])
+
+    with pytest.raises(ValueError, match='is not a todo'):
+        run_patch(calendar, resolve)
+
+    assert [request.method for request in calendar.requests] == ['get']
+
+
+def test_patch_events_batches_and_isolates_failures(mirrored: AsyncMock) -> None:
+    mirrored.return_value = {'todo1': todo_event('"1"'), 'done': todo_event('"1"', is_resolved=True, todo_id='done')}
+    responses = {
+        ('patch', 'todo1'): [conflict(), {'etag': '"3"'}],
+        ('get', 'todo1'): [todo_event('"2"')],
+        ('get', 'todo2'): [todo_event('"1"', todo_id='todo2')],
+        ('patch', 'todo2'): [{'etag': '"2"'}],
+        ('get', 'done'): [todo_event('"2"', is_resolved=True, todo_id='done')],
+        ('get', 'gone'): [HttpError(httplib2.Response({'status': 404}), b'Not Found')],
+    }
+    batches: list[list[tuple[str, str]]] = []
+
+    async def execute_batch_async(calsvc: Any, requests: list[SimpleNamespace]) -> list[Any]:
+        batches.append([(request.method, request.kwargs['eventId']) for request in requests])
+        return [responses[request.method, request.kwargs['eventId']].pop(0) for request in requests]
+
+    calendar = FakeCalendar([])
+    with (
+        patch('secretary.event_patch.get_calendar_service', return_value=calendar.calsvc),
+        patch('secretary.event_patch.execute_batch_async', side_effect=execute_batch_async),
+        patch('secretary.event_patch.mark_calendar_changed', new_callable=AsyncMock) as mark_calendar_changed,
+    ):
+        results = asyncio.run(patch_events('user1', 'cal', ['todo1', 'todo2', 'done', 'gone'], resolve))
+
+    assert results[:2] == [{'etag': '"3"'}, {'etag': '"2"'}]
+    assert str(results[2]) == 'This todo is already resolved.'
+    assert isinstance(results[3], HttpError)
+    assert batches == [
+        [('get', 'todo2'), ('get', 'gone')],
+        [('patch', 'todo1'), ('patch', 'todo2')],
+        [('get', 'todo1'), ('get', 'done')],
+        [('patch', 'todo1')],
+    ]
+    mark_calendar_changed.assert_awaited_once()
+
+
+def test_patch_events_refuses_repeated_ids(mirrored: AsyncMock) -> None:
+    mirrored.return_value = {'todo1': todo_event('"1"')}
+    batches: list[list[str]] = []
+
+    async def execute_batch_async(calsvc: Any, requests: list[SimpleNamespace]) -> list[Any]:
+        batches.append([request.kwargs['eventId'] for request in requests])
+        return [{'etag': '"2"'} for _ in requests]
+
+    calendar = FakeCalendar([])
+    with (
+        patch('secretary.event_patch.get_calendar_service', return_value=calendar.calsvc),
+        patch('secretary.event_patch.execute_batch_async', side_effect=execute_batch_async),
+        patch('secretary.event_patch.mark_calendar_changed', new_callable=AsyncMock),
+    ):
+        results = asyncio.run(patch_events('user1', 'cal', ['todo1', 'todo1'], resolve))
+
+    assert results[0] == {'etag': '"2"'}
+    assert str(results[1]) == 'todo1 is listed more than once; combine its changes into one item'
+    assert batches == [[], ['todo1']]
+    mirrored.assert_awaited_once_with('user1', 'cal', ['todo1'])
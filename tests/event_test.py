@@ -0,0 +1,32 @@
+from secretary.data_models.event import Event
+from secretary.data_models.todo import Todo
+
+
+EVENTS = [
+    {'id': 'a', 'summary': 'A', 'start': {'dateTime': '2025-06-02T09:00:00Z'}, 'end': {'dateTime': '2025-06-02T10:00:00Z'}},
+    {'id': 'b', 'start': {'date': '2025-06-03'}, 'end': {'date': '2025-06-04'}, 'recurrence': ['RRULE:FREQ=DAILY']},
+]
+
+TODOS = [
+    {
+        'id': 't',
+        'summary': '✅ T',
+        'start': {'date': '2025-06-03'},
+        'end': {'date': '2025-06-03'},
+        'extendedProperties': {'shared': {'sb_type': 'todo', 'sb_is_resolved': 'True'}},
+    },
+]
+
+
+def test_from_gcal_events_matches_one_at_a_time() -> None:
+    assert Event.from_gcal_events(EVENTS) == [Event.from_gcal_event(e) for e in EVENTS]
+    assert Todo.from_gcal_events(TODOS) == [Todo.from_gcal_event(t) for t in TODOS]
+    assert [e.calendar_id for e in Event.from_gcal_events(EVENTS, calendar_id='work')] == ['work', 'work']
+
+
+def test_dump_many_matches_model_dump() -> None:
+    events = Event.from_gcal_events(EVENTS)
+    todos = Todo.from_gcal_events(TODOS)
+
+    assert Event.dump_many(events) == [e.model_dump() for e in events]
+    assert Todo.dump_many(todos) == [t.model_dump() for t in todos]
@@ -0,0 +1,60 @@
+import asyncio
+import base64
+from typing import Any
+from unittest.mock import AsyncMock
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from secretary.data_models.gmail_thread import GmailThread
+from tests.tool_output_test import WordEncoding
+
+
+def thread_dict(thread_id: str, subject: str) -> dict[str, Any]:
+    return {
+        'id': thread_id,
+        'messages': [{
+            'payload': {
+                'headers': [
+                    {'name': 'Subject', 'value': subject},
+                    {'name': 'Date', 'value': 'Thu, 5 Jun 2025 09:00:00 -0700'},
+                    {'name': 'From', 'value': 'alice@example.com'},
+                    {'name': 'To', 'value': 'bob@example.com'},
+                ],
+                'mimeType': 'text/plain',
+                'body': {'data': base64.urlsafe_b64encode(f'About {subject}'.encode()).decode()},
+            },
+        }],
+    }
+
+
+def test_search_fetches_threads_in_one_batch_and_isolates_failures() -> None:
+    gmailsvc = MagicMock()
+    gmailsvc.users.return_value.threads.return_value.get.side_effect = lambda **kwargs: kwargs['id']
+    listing = {
+        'messages': [{'threadId': 't3'}, {'threadId': 't1'}, {'threadId': 't3'}, {'threadId': 'gone'}, {'threadId': 't2'}],
+        'nextPageToken': 'page2',
+    }
+    not_found = HttpError(httplib2.Response({'status': 404}), b'{"error": {"message": "Not Found"}}')
+
+    async def execute_batch_async(service: Any, requests: list[str]) -> list[Any]:
+        return [not_found if thread_id == 'gone' else thread_dict(thread_id, f'Subject {thread_id}') for thread_id in requests]
+
+    with (
+        patch('secretary.data_models.gmail_thread.get_gmail_service', return_value=gmailsvc),
+        patch('secretary.data_models.gmail_thread.execute_async', new_callable=AsyncMock, return_value=listing),
+        patch('secretary.data_models.gmail_thread.execute_batch_async', side_effect=execute_batch_async) as batch,
+    ):
+        result = asyncio.run(GmailThread.search('user1', 'from:alice', ['INBOX']))
+
+    assert batch.call_count == 1
+    assert [thread.id for thread in result.threads] == ['t3', 't1', 't2']
+    assert result.threads[0].subject == 'Subject t3'
+    assert result.threads[0].messages[0].body == 'About Subject t3'
+    assert result.errors == {'gone': 'Not Found'}
+    assert result.next_page_token == 'page2'
+
+    with patch('secretary.tool_output.get_encoding', return_value=WordEncoding()):
+        assert 'Could not load thread gone: Not Found' in str(result)
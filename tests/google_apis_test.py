@@ -0,0 +1,104 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+from unittest.mock import MagicMock
+from unittest.mock import patch
+from unittest.mock import sentinel
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from secretary.google_apis import execute_batch
+from secretary.google_apis import forget_user
+from secretary.google_apis import get_calendar_service
+from secretary.google_apis import get_thread_http
+from secretary.google_apis import UserHttpRequest
+
+
+class FakeBatch:
+    """Answers each added request with its own name, or fails the ones named 'missing'."""
+
+    def __init__(self, sizes: list[int], callback: Any) -> None:
+        self.sizes = sizes
+        self.callback = callback
+        self.requests: list[tuple[str, Any]] = []
+        self.http: Any = None
+
+    def add(self, request: Any, request_id: str) -> None:
+        self.requests += [(request_id, request)]
+
+    def execute(self, http: Any = None) -> None:
+        self.http = http
+        self.sizes += [len(self.requests)]
+        for request_id, request in reversed(self.requests):
+            if request == 'missing':
+                self.callback(request_id, None, HttpError(httplib2.Response({'status': 404}), b''))
+            else:
+                self.callback(request_id, {'id': request}, None)
+
+
+def test_execute_batch_splits_requests_and_keeps_order() -> None:
+    sizes: list[int] = []
+    service = MagicMock()
+    service.new_batch_http_request.side_effect = lambda callback: FakeBatch(sizes, callback)
+    requests = [f'r{i}' for i in range(120)]
+    requests[60] = 'missing'
+
+    results = execute_batch(service, requests)  # type: ignore[arg-type]
+
+    assert sizes == [50, 50, 20]
+    assert [r['id'] for r in results[:60]] == requests[:60]
+    assert isinstance(results[60], HttpError)
+    assert results[119] == {'id': 'r119'}
+
+
+def test_execute_batch_authorizes_parts_with_thread_http() -> None:
+    batches: list[FakeBatch] = []
+
+    def new_batch(callback: Any) -> FakeBatch:
+        batches.append(FakeBatch([], callback))
+        return batches[-1]
+
+    service = MagicMock()
+    service.new_batch_http_request.side_effect = new_batch
+    requests = [
+        UserHttpRequest('user1', sentinel.service_http, lambda resp, content: content, f'https://example.com/{i}')
+        for i in range(2)
+    ]
+
+    with patch('secretary.google_apis.get_thread_http', return_value=sentinel.thread_http) as get_http:
+        execute_batch(service, requests)
+
+    assert all(request.http is sentinel.thread_http for request in requests)
+    assert batches[0].http is sentinel.thread_http
+    get_http.assert_called_with('user1')
+
+
+def test_forget_user_drops_http_in_every_thread() -> None:
+    with (
+        patch('secretary.google_apis.get_google_apis_creds') as get_creds,
+        patch('secretary.google_apis.build_http'),
+    ):
+        get_creds.return_value.authorize.side_effect = lambda http: object()
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            first = pool.submit(get_thread_http, 'user1').result()
+            assert pool.submit(get_thread_http, 'user1').result() is first
+
+            forget_user('user1')
+
+            assert pool.submit(get_thread_http, 'user1').result() is not first
+
+
+def test_forget_user_drops_services() -> None:
+    with (
+        patch('secretary.google_apis.get_google_apis_creds'),
+        patch('secretary.google_apis.discovery.build') as build,
+    ):
+        build.side_effect = lambda *args, **kwargs: object()
+
+        first = get_calendar_service('user2')
+        assert get_calendar_service('user2') is first
+
+        forget_user('user2')
+
+        assert get_calendar_service('user2') is not first
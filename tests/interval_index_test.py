@@ -0,0 +1,41 @@
+import random
+
+from secretary.interval_index import IntervalIndex
+
+
+def random_intervals(count: int, seed: int = 7) -> list[tuple[float, float, int]]:
+    rng = random.Random(seed)
+    intervals = []
+    for i in range(count):
+        start = rng.uniform(0, 1000)
+        length = rng.choice([0.5, 1, 24, rng.uniform(0, 200)])
+        intervals += [(start, start + length, i)]
+    return intervals
+
+
+def test_overlapping_matches_linear_scan() -> None:
+    intervals = random_intervals(2000)
+    index = IntervalIndex(intervals)
+    ordered = sorted(intervals, key=lambda interval: (interval[0], interval[1]))
+
+    for start, end in [(0, 10), (100, 100.5), (450, 700), (999, 2000), (-10, 0)]:
+        expected = [item for s, e, item in ordered if s < end and e > start]
+        assert index.overlapping(start, end) == expected
+
+
+def test_within_and_next_after() -> None:
+    index = IntervalIndex([(1, 3, 'a'), (2, 10, 'b'), (4, 5, 'c'), (6, 6.5, 'd')])
+
+    assert index.within(2, 6) == ['c']
+    assert index.within(0, 10) == ['a', 'b', 'c', 'd']
+    assert index.next_after(3) == 'c'
+    assert index.next_after(7) is None
+    assert index.count_starting(2, 6) == 2
+
+
+def test_empty_index() -> None:
+    index: IntervalIndex[str] = IntervalIndex([])
+
+    assert len(index) == 0
+    assert index.overlapping(0, 100) == []
+    assert index.next_after(0) is None
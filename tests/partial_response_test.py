@@ -0,0 +1,230 @@
+"""
+Checks each partial response field mask against the parser it feeds: a full resource pruned to the
+mask, the way the Google APIs would, must parse exactly like the full resource.
+"""
+import base64
+from typing import Any
+
+from secretary.calendar_metadata import CALENDAR_LIST_FIELDS
+from secretary.calendar_mirror import SYNC_FIELDS
+from secretary.calendar_mirror import event_row
+from secretary.data_models.event import Event
+from secretary.data_models.gmail_thread import GmailThread
+from secretary.data_models.todo import Todo
+
+
+FieldTree = dict[str, Any]
+
+
+def parse_fields(fields: str) -> FieldTree:
+    """
+    Parses the partial response syntax, e.g. 'items(id,start/date),nextPageToken', into a tree.
+    A leaf of None selects the whole value.
+    """
+    tree: FieldTree = {}
+    pos = 0
+
+    def parse_list(node: FieldTree) -> None:
+        nonlocal pos
+        while pos < len(fields) and fields[pos] != ')':
+            parse_path(node)
+            if pos < len(fields) and fields[pos] == ',':
+                pos += 1
+
+    def parse_path(node: FieldTree) -> None:
+        nonlocal pos
+        end = pos
+        while end < len(fields) and fields[end] not in ',()':
+            end += 1
+        *parents, name = fields[pos:end].split('/')
+        pos = end
+
+        for parent in parents:
+            node = node.setdefault(parent, {})
+
+        if pos < len(fields) and fields[pos] == '(':
+            pos += 1
+            parse_list(node.setdefault(name, {}))
+            pos += 1
+        else:
+            node[name] = None
+
+    parse_list(tree)
+    return tree
+
+
+def prune(value: Any, tree: FieldTree | None) -> Any:
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [prune(item, tree) for item in value]
+    return {key: prune(value[key], subtree) for key, subtree in tree.items() if key in value}
+
+
+def b64(text: str) -> str:
+    return base64.urlsafe_b64encode(text.encode()).decode()
+
+
+FULL_EVENT = {
+    'kind': 'calendar#event',
+    'etag': '"3391"',
+    'id': 'evt1',
+    'status': 'confirmed',
+    'htmlLink': 'https://www.google.com/calendar/event?eid=ZXZ0MQ',
+    'created': '2025-05-01T12:00:00.000Z',
+    'updated': '2025-05-02T12:00:00.000Z',
+    'summary': 'Design review',
+    'description': 'Walk through the new sync design',
+    'location': 'Room 4',
+    'creator': {'email': 'a@example.com', 'self': True},
+    'organizer': {'email': 'a@example.com', 'self': True},
+    'start': {'dateTime': '2025-06-02T09:00:00-07:00', 'timeZone': 'America/Los_Angeles'},
+    'end': {'dateTime': '2025-06-02T10:00:00-07:00', 'timeZone': 'America/Los_Angeles'},
+    'recurrence': ['RRULE:FREQ=WEEKLY;BYDAY=MO'],
+    'iCalUID': 'evt1@google.com',
+    'sequence': 2,
+    'attendees': [
+        {'email': 'a@example.com', 'responseStatus': 'accepted', 'organizer': True},
+        {'email': 'b@example.com', 'responseStatus': 'needsAction'},
+    ],
+    'conferenceData': {
+        'entryPoints': [{'entryPointType': 'video', 'uri': 'https://meet.google.com/abc-defg-hij'}],
+        'conferenceSolution': {'name': 'Google Meet'},
+    },
+    'reminders': {'useDefault': True},
+    'eventType': 'default',
+}
+
+FULL_TODO = {
+    **FULL_EVENT,
+    'id': 'todo1',
+    'summary': '📝 File taxes',
+    'start': {'date': '2025-06-03'},
+    'end': {'date': '2025-06-03'},
+    'recurrence': None,
+    'recurringEventId': 'todo0',
+    'originalStartTime': {'date': '2025-06-02'},
+    'extendedProperties': {
+        'shared': {'sb_type': 'todo', 'sb_is_resolved': 'True'},
+        'private': {'other_app': 'x'},
+    },
+}
+
+
+def test_event_fields_cover_parser() -> None:
+    pruned = prune(FULL_EVENT, parse_fields(Event.GCAL_FIELDS))
+
+    assert Event.from_gcal_event(pruned) == Event.from_gcal_event(FULL_EVENT)
+    assert 'attendees' not in pruned
+
+
+def test_todo_fields_cover_parser() -> None:
+    pruned = prune(FULL_TODO, parse_fields(Todo.GCAL_FIELDS))
+
+    assert Todo.from_gcal_event(pruned) == Todo.from_gcal_event(FULL_TODO)
+    assert Todo.get_extended_property(pruned, 'sb_type') == 'todo'
+    assert 'private' not in pruned['extendedProperties']
+
+
+def test_mirror_sync_fields_cover_rows_and_parsers() -> None:
+    full_response = {
+        'kind': 'calendar#events',
+        'summary': 'a@example.com',
+        'timeZone': 'America/Los_Angeles',
+        'accessRole': 'owner',
+        'defaultReminders': [{'method': 'popup', 'minutes': 10}],
+        'items': [FULL_EVENT, FULL_TODO, {'id': 'gone', 'status': 'cancelled'}],
+        'nextSyncToken': 'token1',
+    }
+    pruned = prune(full_response, parse_fields(SYNC_FIELDS))
+    tz = pruned['timeZone']
+
+    assert pruned['nextSyncToken'] == 'token1'
+    assert pruned['items'][2] == {'id': 'gone', 'status': 'cancelled'}
+    for full, partial in zip(full_response['items'][:2], pruned['items'][:2]):
+        assert event_row('cal', partial, tz)[:-1] == event_row('cal', full, tz)[:-1]
+    assert Event.from_gcal_event(pruned['items'][0]) == Event.from_gcal_event(FULL_EVENT)
+    assert Todo.from_gcal_event(pruned['items'][1]) == Todo.from_gcal_event(FULL_TODO)
+
+
+def test_calendar_list_fields_keep_etag_and_names() -> None:
+    full_response = {
+        'kind': 'calendar#calendarList',
+        'etag': '"list-etag"',
+        'items': [
+            {
+                'id': 'a@example.com',
+                'summary': 'a@example.com',
+                'summaryOverride': 'Me',
+                'primary': True,
+                'colorId': '14',
+                'defaultReminders': [{'method': 'popup', 'minutes': 10}],
+                'notificationSettings': {'notifications': [{'type': 'eventCreation', 'method': 'email'}]},
+            },
+        ],
+    }
+
+    pruned = prune(full_response, parse_fields(CALENDAR_LIST_FIELDS))
+
+    assert pruned == {
+        'etag': '"list-etag"',
+        'items': [{'id': 'a@example.com', 'summary': 'a@example.com', 'summaryOverride': 'Me', 'primary': True}],
+    }
+
+
+def test_thread_fields_cover_parser() -> None:
+    message = {
+        'id': 'm1',
+        'threadId': 't1',
+        'labelIds': ['INBOX'],
+        'snippet': 'Lunch?',
+        'sizeEstimate': 90210,
+        'payload': {
+            'partId': '',
+            'mimeType': 'multipart/mixed',
+            'headers': [
+                {'name': 'Date', 'value': 'Mon, 2 Jun 2025 09:00:00 -0700'},
+                {'name': 'From', 'value': 'b@example.com'},
+                {'name': 'To', 'value': 'a@example.com'},
+                {'name': 'Subject', 'value': 'Lunch'},
+                {'name': 'Received', 'value': 'from mail.example.com'},
+            ],
+            'body': {'size': 0},
+            'parts': [
+                {
+                    'partId': '0',
+                    'mimeType': 'multipart/related',
+                    'headers': [{'name': 'Content-Type', 'value': 'multipart/related'}],
+                    'body': {'size': 0},
+                    'parts': [
+                        {
+                            'partId': '0.0',
+                            'mimeType': 'multipart/alternative',
+                            'body': {'size': 0},
+                            'parts': [
+                                {'partId': '0.0.0', 'mimeType': 'text/plain', 'body': {'size': 6, 'data': b64('Lunch?')}},
+                                {'partId': '0.0.1', 'mimeType': 'text/html', 'body': {'size': 13, 'data': b64('<p>Lunch?</p>')}},
+                            ],
+                        },
+                    ],
+                },
+                {
+                    'partId': '1',
+                    'mimeType': 'application/pdf',
+                    'filename': 'menu.pdf',
+                    'body': {'attachmentId': 'att1', 'size': 90000},
+                },
+            ],
+        },
+    }
+    full_thread = {'id': 't1', 'historyId': '1234', 'messages': [message]}
+
+    pruned = prune(full_thread, parse_fields(GmailThread.GMAIL_FIELDS))
+
+    assert GmailThread.from_thread_dict(pruned) == GmailThread.from_thread_dict(full_thread)
+    assert GmailThread.from_thread_dict(pruned).messages[0].body == 'Lunch?'
+    assert 'attachmentId' not in pruned['messages'][0]['payload']['parts'][1]['body']
+
+
+def test_parse_fields() -> None:
+    assert parse_fields('a,b/c,d(e,f/g(h)),i') == {'a': None, 'b': {'c': None}, 'd': {'e': None, 'f': {'g': {'h': None}}}, 'i': None}
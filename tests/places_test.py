@@ -0,0 +1,60 @@
+import os
+import stat
+from typing import Any
+from typing import Iterator
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+import pytest
+
+from secretary.places import PlaceCache
+from secretary.places import normalize_query
+
+
+@pytest.fixture
+def maps_client() -> Iterator[MagicMock]:
+    with patch('secretary.places.get_maps_client') as mock_func:
+        yield mock_func.return_value
+
+
+def test_normalize_query() -> None:
+    assert normalize_query('  Lincoln   Elementary School. ') == 'lincoln elementary school'
+
+
+def test_caches_resolved_places(tmp_path: Any, maps_client: MagicMock) -> None:
+    maps_client.places.return_value = {'results': [{'formatted_address': '1 Main St'}]}
+    cache = PlaceCache(path=str(tmp_path / 'places.sqlite3'), ttl_seconds=60, negative_ttl_seconds=60)
+
+    assert cache.lookup_address('Lincoln Elementary') == '1 Main St'
+    assert cache.lookup_address('lincoln  elementary') == '1 Main St'
+
+    maps_client.places.assert_called_once_with(query='Lincoln Elementary')
+
+
+def test_caches_ambiguous_places_as_negative(tmp_path: Any, maps_client: MagicMock) -> None:
+    maps_client.places.return_value = {'results': [{'formatted_address': 'a'}, {'formatted_address': 'b'}]}
+    cache = PlaceCache(path=str(tmp_path / 'places.sqlite3'), ttl_seconds=60, negative_ttl_seconds=60)
+
+    assert cache.lookup_address('Starbucks') is None
+    assert cache.lookup_address('Starbucks') is None
+    assert maps_client.places.call_count == 1
+
+
+def test_expired_entries_are_looked_up_again(tmp_path: Any, maps_client: MagicMock) -> None:
+    maps_client.places.return_value = {'results': []}
+    cache = PlaceCache(path=str(tmp_path / 'places.sqlite3'), ttl_seconds=60, negative_ttl_seconds=0)
+
+    cache.lookup_address('nowhere')
+    cache.lookup_address('nowhere')
+
+    assert maps_client.places.call_count == 2
+
+
+def test_cache_is_private(tmp_path: Any, maps_client: MagicMock) -> None:
+    maps_client.places.return_value = {'results': []}
+    cache = PlaceCache(path=str(tmp_path / 'secretary' / 'places.sqlite3'), ttl_seconds=60, negative_ttl_seconds=60)
+
+    cache.lookup_address('Starbucks')
+
+    assert stat.S_IMODE(os.stat(tmp_path / 'secretary').st_mode) == 0o700
+    assert stat.S_IMODE(os.stat(cache.path).st_mode) == 0o600
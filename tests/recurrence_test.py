@@ -0,0 +1,102 @@
+from typing import Any
+
+import arrow
+
+from secretary.recurrence import RecurringSeries
+from secretary.recurrence import event_length
+
+
+def window(start: str, end: str) -> tuple[float, float]:
+    return arrow.get(start).timestamp(), arrow.get(end).timestamp()
+
+
+def starts(series: RecurringSeries, start: str, end: str) -> list[str]:
+    return [event['start'].get('dateTime') or event['start']['date'] for _, _, event in series.instances(*window(start, end))]
+
+
+def weekly_meeting(**kwargs: Any) -> dict[str, Any]:
+    return {
+        'id': 'sync',
+        'summary': 'Weekly sync',
+        'start': {'dateTime': '2025-10-27T09:00:00-07:00', 'timeZone': 'America/Los_Angeles'},
+        'end': {'dateTime': '2025-10-27T09:30:00-07:00', 'timeZone': 'America/Los_Angeles'},
+        'recurrence': ['RRULE:FREQ=WEEKLY;BYDAY=MO'],
+        **kwargs,
+    }
+
+
+def test_weekly_series_keeps_wall_clock_time_across_dst() -> None:
+    series = RecurringSeries(weekly_meeting(), 'UTC')
+
+    assert starts(series, '2025-10-26T00:00:00Z', '2025-11-11T00:00:00Z') == [
+        '2025-10-27T09:00:00-07:00',
+        '2025-11-03T09:00:00-08:00',
+        '2025-11-10T09:00:00-08:00',
+    ]
+
+
+def test_instances_look_like_google_expansion() -> None:
+    series = RecurringSeries(weekly_meeting(), 'UTC')
+
+    [(start_at, end_at, instance)] = series.instances(*window('2025-11-03T00:00:00-08:00', '2025-11-04T00:00:00-08:00'))
+
+    assert instance == {
+        'id': 'sync_20251103T170000Z',
+        'summary': 'Weekly sync',
+        'recurringEventId': 'sync',
+        'originalStartTime': {'dateTime': '2025-11-03T09:00:00-08:00', 'timeZone': 'America/Los_Angeles'},
+        'start': {'dateTime': '2025-11-03T09:00:00-08:00', 'timeZone': 'America/Los_Angeles'},
+        'end': {'dateTime': '2025-11-03T09:30:00-08:00', 'timeZone': 'America/Los_Angeles'},
+    }
+    assert end_at - start_at == 30 * 60
+
+
+def test_exdate_until_and_exceptions() -> None:
+    series = RecurringSeries(
+        weekly_meeting(recurrence=[
+            'RRULE:FREQ=WEEKLY;BYDAY=MO;UNTIL=20251124',
+            'EXDATE;TZID=America/Los_Angeles:20251103T090000',
+        ]),
+        'UTC',
+        exception_starts=[arrow.get('2025-11-10T09:00:00-08:00').timestamp()],
+    )
+
+    assert starts(series, '2025-10-01T00:00:00Z', '2026-01-01T00:00:00Z') == [
+        '2025-10-27T09:00:00-07:00',
+        '2025-11-17T09:00:00-08:00',
+        '2025-11-24T09:00:00-08:00',
+    ]
+
+
+def test_instance_in_progress_at_window_start() -> None:
+    series = RecurringSeries(weekly_meeting(), 'UTC')
+
+    assert starts(series, '2025-10-27T09:15:00-07:00', '2025-10-27T09:20:00-07:00') == ['2025-10-27T09:00:00-07:00']
+    assert starts(series, '2025-10-27T09:30:00-07:00', '2025-10-27T10:00:00-07:00') == []
+
+
+def test_all_day_todo_series_uses_calendar_time_zone() -> None:
+    todo = {
+        'id': 'plants',
+        'summary': '📝 Water plants',
+        'start': {'date': '2025-06-02'},
+        'end': {'date': '2025-06-02'},
+        'recurrence': ['RRULE:FREQ=DAILY;INTERVAL=2;COUNT=3'],
+        'extendedProperties': {'shared': {'sb_type': 'todo'}},
+    }
+    series = RecurringSeries(todo, 'America/New_York')
+
+    instances = series.instances(*window('2025-06-01T00:00:00-04:00', '2025-06-30T00:00:00-04:00'))
+
+    assert [event['start']['date'] for _, _, event in instances] == ['2025-06-02', '2025-06-04', '2025-06-06']
+    assert instances[0][2]['id'] == 'plants_20250602'
+    assert instances[0][2]['end'] == {'date': '2025-06-02'}
+    assert instances[0][0] == arrow.get('2025-06-02T00:00:00-04:00').timestamp()
+    assert starts(series, '2025-06-04T23:00:00-04:00', '2025-06-05T01:00:00-04:00') == ['2025-06-04']
+
+
+def test_event_length_of_zero_length_events() -> None:
+    assert event_length(0, is_all_day=True) == 86400
+    assert event_length(3 * 86400, is_all_day=True) == 3 * 86400
+    assert event_length(0, is_all_day=False) == 1
+    assert event_length(1800, is_all_day=False) == 1800
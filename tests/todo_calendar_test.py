@@ -0,0 +1,23 @@
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from secretary.todo_calendar import list_primary_todos
+
+
+def test_list_primary_todos_pages_and_skips_instances() -> None:
+    calsvc = MagicMock()
+    responses = [
+        {'items': [{'id': 'a', 'summary': 'A'}, {'id': 'b_20250602', 'recurringEventId': 'b'}], 'nextPageToken': 'p2'},
+        {'items': [{'id': 'b', 'summary': 'B'}]},
+    ]
+
+    with (
+        patch('secretary.todo_calendar.get_calendar_service', return_value=calsvc),
+        patch('secretary.todo_calendar.execute', side_effect=responses),
+    ):
+        todos = list_primary_todos('user1')
+
+    assert [todo['id'] for todo in todos] == ['a', 'b']
+    list_kwargs = calsvc.events.return_value.list.call_args_list
+    assert list_kwargs[0].kwargs['sharedExtendedProperty'] == 'sb_type=todo'
+    assert list_kwargs[1].kwargs['pageToken'] == 'p2'
@@ -0,0 +1,36 @@
+from unittest.mock import MagicMock
+from unittest.mock import patch
+
+from secretary.data_models.todo import Todo
+from secretary.todo_transparency import list_opaque_todos
+
+
+def test_new_todos_dont_block_freebusy() -> None:
+    event = Todo(summary='📝 File taxes', due_date='2025-06-05').to_gcal_event()
+
+    # An opaque all-day todo makes freebusy report the whole day as busy
+    assert event['transparency'] == 'transparent'
+
+
+def test_list_opaque_todos_skips_transparent_and_cancelled() -> None:
+    calsvc = MagicMock()
+    responses = [
+        {
+            'items': [
+                {'id': 'old', 'summary': 'Old'},
+                {'id': 'new', 'summary': 'New', 'transparency': 'transparent'},
+                {'id': 'gone', 'status': 'cancelled'},
+            ],
+            'nextPageToken': 'p2',
+        },
+        {'items': [{'id': 'series_20250602', 'transparency': 'opaque'}]},
+    ]
+
+    with (
+        patch('secretary.todo_transparency.get_calendar_service', return_value=calsvc),
+        patch('secretary.todo_transparency.execute', side_effect=responses),
+    ):
+        todos = list_opaque_todos('user1', 'primary')
+
+    assert [todo['id'] for todo in todos] == ['old', 'series_20250602']
+    assert calsvc.events.return_value.list.call_args.kwargs['sharedExtendedProperty'] == 'sb_type=todo'
@@ -0,0 +1,83 @@
+from typing import Any
+from typing import Iterator
+from unittest.mock import patch
+
+import pytest
+
+from secretary.tool_output import batch_report
+from secretary.tool_output import encode_table
+from secretary.tool_output import fit_to_budget
+from secretary.tool_output import truncate_to_tokens
+
+
+class WordEncoding:
+    """Treats each whitespace-separated word as one token, so tests don't need BPE files."""
+
+    def encode(self, text: str, **kwargs: Any) -> list[str]:
+        return text.split()
+
+    def decode(self, tokens: list[str]) -> str:
+        return ' '.join(tokens)
+
+
+@pytest.fixture(autouse=True)
+def word_encoding() -> Iterator[None]:
+    with patch('secretary.tool_output.get_encoding', return_value=WordEncoding()):
+        yield
+
+
+def test_encode_table_drops_empty_columns() -> None:
+    header, lines = encode_table(
+        ['id', 'summary', 'location'],
+        [
+            {'id': '1', 'summary': 'Dentist', 'location': None},
+            {'id': '2', 'summary': 'Lunch | work\nbring notes', 'location': None},
+        ],
+    )
+
+    assert header == 'id | summary'
+    assert lines == [
+        '1 | Dentist',
+        '2 | Lunch \\| work\\nbring notes',
+    ]
+
+
+def test_fit_to_budget_keeps_everything_under_budget() -> None:
+    output = fit_to_budget('id', ['1', '2', '3'], token_budget=100, item_name='events')
+
+    assert output == 'id\n1\n2\n3'
+
+
+def test_fit_to_budget_reports_omitted_items() -> None:
+    output = fit_to_budget('id', ['1', '2', '3', '4'], token_budget=6, item_name='events')
+
+    assert output.splitlines()[:3] == ['id', '1', '2']
+    assert '[2 of 4 events omitted to stay within 6 tokens.' in output
+
+
+def test_fit_to_budget_with_no_items() -> None:
+    assert fit_to_budget('id', [], token_budget=100, item_name='events', notes=['note']) == (
+        'note\nNo events found.'
+    )
+
+
+def test_truncate_to_tokens() -> None:
+    assert truncate_to_tokens('a b c', 5) == 'a b c'
+    assert truncate_to_tokens('a b c d e', 2) == 'a b …[truncated]'
+
+
+def test_fit_to_budget_counts_items_that_were_not_passed() -> None:
+    output = fit_to_budget('id', ['1', '2'], token_budget=100, item_name='events', total=5)
+
+    assert output.splitlines() == [
+        'id',
+        '1',
+        '2',
+        '[3 of 5 events omitted to stay within 100 tokens. Narrow the query to see them.]',
+    ]
+
+
+def test_batch_report() -> None:
+    report = batch_report('Deleted', 'events', ['a', 'b'], ['', ValueError('not a todo')])
+
+    assert report == 'Deleted 1 of 2 events.\nitem | result\na | ok\nb | failed: not a todo'